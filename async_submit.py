@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Async LLM Submission for Deckorator
+Submit many generated templates concurrently over pooled HTTP connections.
+
+Uses only the standard library (asyncio streams), so it works without the
+optional 'requests' package. Concurrency is capped, requests are paced by a
+token-rate limiter, 429/5xx responses are retried with backoff, and each
+response is written to disk as soon as it arrives.
+
+Point --api-url at llm_stub_server.py to try it without an API key.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from llm_submit import (ANTHROPIC_API_URL, ANTHROPIC_MAX_TOKENS, ANTHROPIC_MODEL,
+                        ANTHROPIC_VERSION, LLMSubmissionHelper)
+from photo_pipeline import select_photos
+from photo_scanner import scan_photos
+from response_cache import ResponseCache
+
+RETRY_STATUSES = {429, 500, 502, 503, 504, 529}
+IMAGE_TOKEN_ESTIMATE = 1600  # rough per-image input token cost
+
+
+class HTTPError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+        self.body = body
+
+
+class AsyncHTTPPool:
+    """Keep-alive HTTP/1.1 connections to a single origin"""
+
+    def __init__(self, url, max_connections=8, timeout=120):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.https = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = parts.path or '/'
+        if parts.query:
+            self.path += '?' + parts.query
+        self.timeout = timeout
+        self._ssl = ssl.create_default_context() if self.https else None
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self.connections_opened = 0
+
+    async def _connect(self):
+        self.connections_opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+
+    async def request(self, method, headers, body=b''):
+        """Send one request and return (status, headers, body)"""
+        async with self._slots:
+            if self._idle:
+                connection = self._idle.pop()
+                try:
+                    response = await self._send(connection, method, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server closed an idle keep-alive connection; use a fresh one
+                    connection = await self._connect()
+                    response = await self._send(connection, method, headers, body)
+            else:
+                connection = await self._connect()
+                response = await self._send(connection, method, headers, body)
+            if response[1].get('connection', '').lower() == 'close':
+                connection[1].close()
+            else:
+                self._idle.append(connection)
+            return response
+
+    async def _send(self, connection, method, headers, body):
+        reader, writer = connection
+        try:
+            return await asyncio.wait_for(
+                self._exchange(reader, writer, method, headers, body), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _exchange(self, reader, writer, method, headers, body):
+        lines = [f"{method} {self.path} HTTP/1.1", f"Host: {self.host}",
+                 f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        # body is bytes or a re-iterable of byte blocks with a len()
+        for block in ([body] if isinstance(body, bytes) else body):
+            writer.write(block)
+            await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            response_body = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            response_body = await reader.readexactly(int(response_headers['content-length']))
+        else:
+            response_body = await reader.read()
+            response_headers['connection'] = 'close'
+        return status, response_headers, response_body
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+class TokenRateLimiter:
+    """Token bucket that paces requests to a tokens-per-minute budget"""
+
+    def __init__(self, tokens_per_minute):
+        self.capacity = tokens_per_minute
+        self.tokens = tokens_per_minute
+        self.rate = tokens_per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens):
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class AsyncSubmitter:
+    """Submit many templates to the Anthropic Messages API concurrently"""
+
+    def __init__(self, api_key, output_dir='llm_responses', api_url=ANTHROPIC_API_URL,
+                 model=ANTHROPIC_MODEL, max_tokens=ANTHROPIC_MAX_TOKENS, concurrency=8,
+                 tokens_per_minute=80000, max_retries=5, backoff_base=1.0, timeout=120,
+                 cache=None):
+        self.api_key = api_key
+        self.output_dir = Path(output_dir)
+        self.api_url = api_url
+        self.model = model
+        self.max_tokens = max_tokens
+        self.concurrency = concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.helper = LLMSubmissionHelper()
+        self.cache = cache
+
+    def estimate_tokens(self, template_content, photos):
+        return len(template_content) // 4 + min(len(photos), 5) * IMAGE_TOKEN_ESTIMATE + self.max_tokens
+
+    async def _post(self, pool, body):
+        headers = {
+            'Content-Type': 'application/json',
+            'X-API-Key': self.api_key,
+            'anthropic-version': ANTHROPIC_VERSION,
+        }
+        for attempt in range(self.max_retries + 1):
+            try:
+                status, headers_in, response_body = await pool.request('POST', headers, body)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_base * 2 ** attempt
+            else:
+                if status == 200:
+                    return json.loads(response_body)['content'][0]['text']
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise HTTPError(status, response_body)
+                retry_after = headers_in.get('retry-after', '')
+                delay = float(retry_after) if retry_after.replace('.', '', 1).isdigit() \
+                    else self.backoff_base * 2 ** attempt
+            # Jitter only lengthens the wait, so a retry never beats Retry-After
+            await asyncio.sleep(delay * random.uniform(1.0, 1.25) if delay else 0)
+
+    async def _submit_one(self, pool, limiter, name, template_content, photos):
+        start = time.perf_counter()
+        result = {'name': name}
+        try:
+            if photos:
+                loop = asyncio.get_running_loop()
+                photos = await loop.run_in_executor(None, select_photos, photos, 5)
+            cache_key = None
+            text = None
+            if self.cache is not None:
+                cache_key = self.cache.key(template_content, [photo.source for photo in photos],
+                                           self.model, self.max_tokens)
+                text = self.cache.get(cache_key)
+            result['cached'] = text is not None
+            if text is None:
+                body = self.helper.build_anthropic_body(
+                    template_content, photos, model=self.model, max_tokens=self.max_tokens)
+                await limiter.acquire(self.estimate_tokens(template_content, photos))
+                text = await self._post(pool, body)
+                if cache_key:
+                    self.cache.put(cache_key, text)
+            path = self.output_dir / f"{name}.txt"
+            path.write_text(text, encoding='utf-8')
+            result.update(status='ok', path=str(path))
+        except Exception as e:
+            result.update(status='error', error=str(e))
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    async def submit_all(self, jobs, on_result=None):
+        """Submit (name, template_content, photos) jobs; returns one result per job.
+
+        on_result, if given, is called with each result as soon as it finishes.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        pool = AsyncHTTPPool(self.api_url, max_connections=self.concurrency, timeout=self.timeout)
+        limiter = TokenRateLimiter(self.tokens_per_minute)
+        jobs = iter(jobs)
+        results = []
+
+        async def worker():
+            for name, template_content, photos in jobs:
+                result = await self._submit_one(pool, limiter, name, template_content, photos)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            pool.close()
+        return results
+
+
+def template_jobs(paths, photo_dir=None):
+    """Yield (name, template_content, photos) for each template file.
+
+    With photo_dir, a template's photos are those in photo_dir/<template
+    name>/ if that folder exists, else the photos directly in photo_dir;
+    the best five are picked as each template is submitted.
+    """
+    shared = None
+    for path in paths:
+        path = Path(path)
+        photos = []
+        if photo_dir is not None:
+            own = Path(photo_dir) / path.stem
+            if own.is_dir():
+                photos = scan_photos(own)
+            else:
+                if shared is None:
+                    shared = scan_photos(photo_dir, max_depth=0)
+                photos = shared
+        yield path.stem, path.read_text(encoding='utf-8'), photos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit many deck templates to Claude concurrently")
+    parser.add_argument('templates', nargs='+', help="Template XML files to submit")
+    parser.add_argument('-o', '--output-dir', default='llm_responses',
+                        help="Directory for responses (default: llm_responses)")
+    parser.add_argument('-c', '--concurrency', type=int, default=8,
+                        help="Requests in flight at once (default: 8)")
+    parser.add_argument('--tokens-per-minute', type=int, default=80000,
+                        help="Token budget used to pace requests (default: 80000)")
+    parser.add_argument('--max-retries', type=int, default=5,
+                        help="Retries on 429/5xx or connection errors (default: 5)")
+    parser.add_argument('--api-url', default=ANTHROPIC_API_URL,
+                        help="Messages endpoint (use llm_stub_server.py for testing)")
+    parser.add_argument('--photos', metavar='DIR',
+                        help="Site photos: DIR/<template name>/ per template, else photos in DIR")
+    parser.add_argument('--model', default=ANTHROPIC_MODEL)
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always call the API, even for previously submitted templates")
+    args = parser.parse_args()
+
+    api_key = os.getenv('ANTHROPIC_API_KEY')
+    if not api_key and args.api_url == ANTHROPIC_API_URL:
+        print("❌ Set ANTHROPIC_API_KEY to submit to the Anthropic API.")
+        sys.exit(1)
+
+    submitter = AsyncSubmitter(api_key or 'stub', args.output_dir, api_url=args.api_url,
+                               model=args.model, concurrency=args.concurrency,
+                               tokens_per_minute=args.tokens_per_minute,
+                               max_retries=args.max_retries,
+                               cache=None if args.no_cache else ResponseCache())
+
+    def report(result):
+        if result['status'] == 'ok':
+            source = "cached" if result['cached'] else f"{result['seconds']:.1f}s"
+            print(f"✅ {result['name']} ({source}) -> {result['path']}")
+        else:
+            print(f"❌ {result['name']}: {result['error']}")
+
+    start = time.perf_counter()
+    results = asyncio.run(submitter.submit_all(template_jobs(args.templates, args.photos),
+                                                   on_result=report))
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    print(f"\n📁 {len(results) - failed} responses saved to {args.output_dir}, "
+          f"{failed} failed in {time.perf_counter() - start:.1f}s")
+    if submitter.cache is not None:
+        stats = submitter.cache.stats()
+        print(f"⚡ Cache: {stats['hits']} hits, {stats['misses']} misses")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
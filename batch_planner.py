@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Batch Planner for Deckorator
+Generate construction specification templates for a whole portfolio of job
+sites in one run, without interactive prompts.
+
+Input is a JSONL file (one project object per line) or a CSV file whose
+header uses the same field names as ConstructionDeckPlanner.user_responses.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from itertools import islice
+
+from deck_planner import ConstructionDeckPlanner
+from instrumentation import enable as enable_metrics, profile_capture
+from project_record import MalformedRecord
+from template_catalog import ChecksumWriter, TemplateCatalog
+from xml_writer import check_well_formed
+
+# One planner per worker process, so the supplier database is parsed once
+# per process instead of once per project.
+_worker_planner = None
+_worker_output_dir = None
+_worker_validate = False
+_worker_takeoff = False
+_worker_profile = None
+
+
+def read_project_records(path):
+    """Yield project records from a JSONL or CSV file one at a time.
+
+    A JSONL line that isn't a JSON object is yielded as a MalformedRecord,
+    so it fails on its own instead of aborting the whole file.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            for row in csv.DictReader(f):
+                # Blank CSV cells mean "not provided", same as a missing JSON key
+                yield {key: value for key, value in row.items() if value != ''}
+        else:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield MalformedRecord(f"line {number}: invalid JSON ({e})")
+                    continue
+                if not isinstance(record, dict):
+                    yield MalformedRecord(f"line {number}: expected a JSON object, "
+                                          f"got {type(record).__name__}")
+                    continue
+                yield record
+
+
+def template_filename(project_id):
+    """Filesystem-safe template name for a project.
+
+    An ID that had to be changed gets a short hash of the original, so
+    "a/b" and "a_b" don't write the same file.
+    """
+    project_id = str(project_id)
+    safe_id = re.sub(r'[^A-Za-z0-9_.-]+', '_', project_id)
+    if safe_id != project_id:
+        safe_id += '_' + hashlib.sha1(project_id.encode('utf-8')).hexdigest()[:8]
+    return f"construction_specs_request_{safe_id}.xml"
+
+
+def budget_filename(project_id):
+    """Material takeoff CSV name for a project"""
+    return template_filename(project_id).replace('construction_specs_request_', 'budget_')[:-4] + '.csv'
+
+
+def profile_basename(project_id):
+    """Profile output name (without extension) for a project"""
+    return template_filename(project_id).replace('construction_specs_request_', 'profile_')[:-4]
+
+
+def _init_worker(output_dir, validate=False, takeoff=False, metrics=None, profile=None):
+    global _worker_planner, _worker_output_dir, _worker_validate, _worker_takeoff, _worker_profile
+    if metrics:
+        enable_metrics(metrics)
+    _worker_planner = ConstructionDeckPlanner()
+    _worker_output_dir = output_dir
+    _worker_validate = validate
+    _worker_takeoff = takeoff
+    _worker_profile = profile
+
+
+def _render_project(item):
+    """Generate and write one template; returns a small manifest entry"""
+    index, record = item
+    project_id = record.get('project_id') or f"{index + 1:06d}"
+    if _worker_profile is not None and str(project_id) == _worker_profile:
+        with profile_capture(os.path.join(_worker_output_dir, profile_basename(project_id))):
+            return _write_project(index, record, project_id)
+    return _write_project(index, record, project_id)
+
+
+def _write_project(index, record, project_id):
+    try:
+        _worker_planner.load_project_record(record)
+        filename = os.path.join(_worker_output_dir, template_filename(project_id))
+        with open(filename, 'w', encoding='utf-8') as f:
+            writer = ChecksumWriter(f)
+            _worker_planner.write_construction_xml(writer)
+        if _worker_validate:
+            with open(filename, 'rb') as f:
+                error = check_well_formed(f)
+            if error:
+                return {'index': index, 'project_id': project_id, 'status': 'error',
+                        'path': filename, 'error': f"malformed XML: {error}"}
+        if _worker_takeoff:
+            from material_takeoff import write_budget_csv
+
+            budget = os.path.join(_worker_output_dir, budget_filename(project_id))
+            with open(budget, 'w', encoding='utf-8', newline='') as f:
+                write_budget_csv(_worker_planner.material_takeoff(), f)
+        return {'index': index, 'project_id': project_id, 'status': 'ok', 'path': filename,
+                'zip_code': _worker_planner.user_responses.get('zip_code'),
+                'version': _worker_planner.template_version, 'checksum': writer.hexdigest()}
+    except Exception as e:
+        return {'index': index, 'project_id': project_id, 'status': 'error', 'error': str(e)}
+
+
+def run_batch(input_path, output_dir, workers=1, chunksize=64, validate=False,
+              manifest_name='batch_manifest.jsonl', catalog=None, takeoff=False, metrics=None,
+              profile=None):
+    """Generate templates for every record in input_path.
+
+    Records are read lazily and handed to the worker pool in bounded windows,
+    so memory stays flat regardless of input size. Each worker writes its own
+    template files; only a small manifest entry travels back to the parent,
+    which appends it to the manifest as soon as it arrives. With validate,
+    every written file is re-parsed to confirm it is well-formed XML. With a
+    TemplateCatalog, successful templates are recorded in it in bulk. With
+    takeoff, each project's material list is also written as a budget CSV.
+    With metrics, every process records stage timings to that file (JSON
+    lines when there are several workers). With profile, the project with
+    that ID is profiled with cProfile and tracemalloc into the output
+    directory.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    records = enumerate(read_project_records(input_path))
+    summary = {'ok': 0, 'error': 0}
+    pending = []
+    start = time.perf_counter()
+
+    with open(os.path.join(output_dir, manifest_name), 'w', encoding='utf-8') as manifest:
+        def record_result(entry):
+            summary[entry['status']] += 1
+            manifest.write(json.dumps(entry) + '\n')
+            if catalog is not None and entry['status'] == 'ok':
+                pending.append(entry)
+                if len(pending) >= 1000:
+                    catalog.record_many(pending)
+                    pending.clear()
+
+        if workers <= 1:
+            _init_worker(output_dir, validate, takeoff, metrics, profile)
+            for item in records:
+                record_result(_render_project(item))
+        else:
+            from multiprocessing import Pool
+
+            # Pool.imap drains its input eagerly, so feed it one window at a time
+            window = workers * chunksize * 4
+            with Pool(workers, initializer=_init_worker, initargs=(output_dir, validate, takeoff, metrics, profile)) as pool:
+                while True:
+                    batch = list(islice(records, window))
+                    if not batch:
+                        break
+                    for entry in pool.imap(_render_project, batch, chunksize):
+                        record_result(entry)
+
+        if pending:
+            catalog.record_many(pending)
+
+    summary['seconds'] = time.perf_counter() - start
+    summary['manifest'] = os.path.join(output_dir, manifest_name)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate construction specification templates for many projects without prompts")
+    parser.add_argument('input', help="Project records (.jsonl or .csv)")
+    parser.add_argument('-o', '--output-dir', default='batch_templates',
+                        help="Directory for generated templates (default: batch_templates)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument('--chunksize', type=int, default=64,
+                        help="Records handed to a worker at a time (default: 64)")
+    parser.add_argument('--validate', action='store_true',
+                        help="Check that every written template is well-formed XML")
+    parser.add_argument('--takeoff', action='store_true',
+                        help="Also write each project's material takeoff as a budget CSV")
+    parser.add_argument('--no-catalog', action='store_true',
+                        help="Don't record the generated templates in the template catalog")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Record stage timings to FILE (JSON lines; .prom for Prometheus text "
+                             "with one worker)")
+    parser.add_argument('--profile', metavar='PROJECT_ID',
+                        help="Profile one slow project with cProfile and tracemalloc")
+    args = parser.parse_args()
+    if args.metrics and args.metrics.endswith('.prom') and args.workers > 1:
+        parser.error("--metrics with several workers needs a JSON lines file, not .prom")
+
+    print(f"🏗️  Generating templates from {args.input} with {args.workers} worker(s)...")
+    summary = run_batch(args.input, args.output_dir, args.workers, args.chunksize, args.validate,
+                        catalog=None if args.no_catalog else TemplateCatalog(),
+                        takeoff=args.takeoff, metrics=args.metrics, profile=args.profile)
+
+    total = summary['ok'] + summary['error']
+    rate = total / summary['seconds'] * 60 if summary['seconds'] else 0
+    print(f"✅ {summary['ok']} templates generated, {summary['error']} failed "
+          f"in {summary['seconds']:.1f}s ({rate:,.0f} per minute)")
+    print(f"📁 Manifest: {summary['manifest']}")
+    if summary['error']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
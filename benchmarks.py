@@ -0,0 +1,765 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for Deckorator
+Measure the hot paths used in bulk template generation.
+
+Run all benchmarks:      python3 benchmarks.py
+Run a single benchmark:  python3 benchmarks.py templates
+Save results as JSON:    python3 benchmarks.py stages --json results.json
+Check for regressions:   python3 benchmarks.py stages --baseline baseline.json --threshold 0.25
+
+With --baseline, every timing, rate and retained-memory metric is compared
+with the stored run, and the exit status is 1 if any got worse by more than
+the threshold (a fraction: 0.25 = 25%). Tail latencies (p95) and
+tracemalloc peaks vary too much from run to run to gate on; they are
+reported but never fail the check.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+SAMPLE_PROJECT = {
+    'project_id': 'bench-001',
+    'exact_length': 16,
+    'exact_width': 12,
+    'deck_height_inches': 36,
+    'attachment_method': 'ledger',
+    'ledger_height': '34',
+    'house_construction': 'wood frame',
+    'slope_direction': 'east',
+    'slope_amount_inches': 6,
+    'soil_type': 'clay',
+    'drainage_issues': 'water pooling',
+    'foundation_distance': '2',
+    'intended_use': 'dining',
+    'joist_material': '2x10 PT',
+    'decking_material': 'composite',
+    'zip_code': '22032',
+    'start_date': '2026-04-15',
+    'has_excavator': 'yes',
+    'concrete_subcontract': 'no',
+}
+
+
+def rate(func, iterations):
+    """Calls per second of func over the given number of iterations"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def bench_templates(iterations=20000):
+    """Compiled template rendering vs. interpolating the template per call"""
+    from deck_planner import ConstructionDeckPlanner
+    from template_engine import TEMPLATE_DIR, load_template
+
+    planner = ConstructionDeckPlanner()
+    planner.load_project_record(SAMPLE_PROJECT)
+    values = planner.template_values()
+    template = load_template('construction_spec')
+    source = (TEMPLATE_DIR / 'construction_spec.xml').read_text(encoding='utf-8')[:-1]
+
+    return {
+        'per_call_format (renders/sec)': rate(lambda: source.format_map(values), iterations),
+        'compiled_render (renders/sec)': rate(lambda: template.render(values), iterations),
+        'generate_construction_xml (templates/sec)': rate(planner.generate_construction_xml, iterations),
+    }
+
+
+def bench_supplier_lookup(zip_count=40000, iterations=200000):
+    """Exact/prefix/default supplier lookups against a synthetic ZIP database"""
+    import json
+    import random
+    import tempfile
+    from supplier_index import SupplierIndex
+
+    rng = random.Random(42)
+    zips = rng.sample(range(1000, 99999), zip_count)
+    database = {f"{zip_code:05d}": {'area': f"Area {zip_code}", 'suppliers': ['Local lumber yard']}
+                for zip_code in zips}
+    database['default'] = {'area': 'Your local area', 'suppliers': ['Home Depot']}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/suppliers_database.json"
+        with open(path, 'w') as f:
+            json.dump(database, f)
+        start = time.perf_counter()
+        index = SupplierIndex(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        queries = [f"{rng.randrange(1000, 99999):05d}" for _ in range(1000)]
+        position = iter(range(iterations))
+        lookups_per_sec = rate(lambda: index.lookup(queries[next(position) % 1000]), iterations)
+        stats = index.stats()
+
+    return {
+        'index load (ms)': load_ms,
+        'lookups/sec': lookups_per_sec,
+        'avg lookup (us)': stats['avg_lookup_us'],
+        'prefix fallbacks': stats['matches']['prefix'],
+    }
+
+
+def synthetic_projects(count, seed=42):
+    """Random but plausible project records, from 8x8 platforms to 40x30 decks"""
+    import random
+
+    rng = random.Random(seed)
+    projects = []
+    for number in range(count):
+        project = dict(SAMPLE_PROJECT)
+        project.update(
+            project_id=f"synthetic-{number:06d}",
+            exact_length=round(rng.uniform(8, 40), 1),
+            exact_width=round(rng.uniform(8, 30), 1),
+            deck_height_inches=rng.randint(12, 120),
+            attachment_method=rng.choice(['ledger', 'freestanding']),
+            joist_material=rng.choice(['2x8 PT', '2x10 PT', '2x12 PT']),
+            decking_material=rng.choice(['5/4x6 PT', 'composite', '2x6 PT']),
+            soil_type=rng.choice(['clay', 'sand', 'loam', 'rocky']),
+        )
+        project['total_area'] = project['exact_length'] * project['exact_width']
+        projects.append(project)
+    return projects
+
+
+# Synthetic deck sizes for per-stage benchmarks: (length, width, height) ranges
+# in feet, feet and inches. A multi-level deck is an upper deck on the house
+# plus a freestanding lower deck, generated as two project records.
+DECK_SIZES = {
+    'small': ((10, 10), (12, 12), (18, 30)),
+    'medium': ((14, 20), (12, 16), (24, 48)),
+    'large': ((24, 40), (16, 30), (48, 96)),
+    'multilevel': ((24, 40), (16, 30), (96, 144)),
+}
+MULTILEVEL_LOWER = ((12, 20), (10, 16), (12, 30))
+
+
+def sized_projects(size, count, seed=42):
+    """Synthetic project records of one DECK_SIZES class"""
+    import random
+
+    rng = random.Random(seed)
+
+    def deck(number, suffix, ranges, attachment):
+        (min_length, max_length), (min_width, max_width), (min_height, max_height) = ranges
+        project = dict(SAMPLE_PROJECT)
+        project.update(
+            project_id=f"{size}-{number:05d}{suffix}",
+            exact_length=round(rng.uniform(min_length, max_length), 1),
+            exact_width=round(rng.uniform(min_width, max_width), 1),
+            deck_height_inches=rng.randint(min_height, max_height),
+            attachment_method=attachment,
+            joist_material=rng.choice(['2x8 PT', '2x10 PT', '2x12 PT']),
+            decking_material=rng.choice(['5/4x6 PT', 'composite', '2x6 PT']),
+            soil_type=rng.choice(['clay', 'sand', 'loam', 'rocky']),
+        )
+        return project
+
+    projects = []
+    for number in range(count):
+        if size == 'multilevel':
+            projects.append(deck(number, '-upper', DECK_SIZES[size], 'ledger'))
+            projects.append(deck(number, '-lower', MULTILEVEL_LOWER, 'freestanding'))
+        else:
+            projects.append(deck(number, '', DECK_SIZES[size],
+                                 rng.choice(['ledger', 'freestanding'])))
+    return projects
+
+
+def bench_stages(count=200, saves=40, repeat=3):
+    """Per-stage and end-to-end cost of one template, by deck size.
+
+    Each stage is timed call by call over `repeat` passes through the
+    projects, keeping each project's best pass so a burst of scheduler
+    noise only spoils one of them (median and p95 in microseconds),
+    then run again under tracemalloc for its peak memory and the memory
+    blocks each call leaves allocated once garbage is collected. save_template writes into a
+    temporary directory and runs once for the first `saves` projects only.
+    """
+    import shutil
+    import tempfile
+    import tracemalloc
+    from deck_planner import ConstructionDeckPlanner
+    from llm_submit import LLMSubmissionHelper
+
+    planner = ConstructionDeckPlanner()
+    helper = LLMSubmissionHelper()
+    photos = ['site_east.jpg', 'ledger_wall.jpg', 'slope.jpg']
+
+    def uncached_structure():
+        planner._structure_cache = None
+        return planner.calculate_structure()
+
+    def footer_layout():
+        planner._structure_cache = None
+        return planner.calculate_footer_layout()
+
+    def uncached_takeoff():
+        planner._cut_list_cache = None
+        return planner.material_takeoff()
+
+    def end_to_end(project):
+        planner.load_project_record(project)
+        xml = planner.generate_construction_xml()
+        return helper.format_for_manual_submission(xml, photos)
+
+    # stage name -> (function of the project, after the planner has loaded it)
+    stages = {
+        'load_project_record': planner.load_project_record,
+        'calculate_structure': lambda project: uncached_structure(),
+        'calculate_footer_layout': lambda project: footer_layout(),
+        'material_takeoff': lambda project: uncached_takeoff(),
+        'generate_construction_xml': lambda project: planner.generate_construction_xml(),
+        'format_for_manual_submission': lambda project: helper.format_for_manual_submission(
+            project['_xml'], photos),
+        'save_template': lambda project: planner.save_template(project['_xml']),
+        'end_to_end': end_to_end,
+    }
+
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='deckorator-bench-')
+    previous_dir = os.getcwd()
+    try:
+        os.chdir(workdir)  # save_template writes templates and caches to the working directory
+        for size in DECK_SIZES:
+            projects = sized_projects(size, count)
+            for project in projects:
+                planner.load_project_record(project)
+                project['_xml'] = planner.generate_construction_xml()
+            for name, stage in stages.items():
+                sample = projects[:saves] if name == 'save_template' else projects
+                timings = [float('inf')] * len(sample)
+                for _ in range(1 if name == 'save_template' else repeat):
+                    for index, project in enumerate(sample):
+                        planner.load_project_record(project)
+                        start = time.perf_counter()
+                        stage(project)
+                        timings[index] = min(timings[index], time.perf_counter() - start)
+                timings.sort()
+
+                tracemalloc.start()
+                blocks = 0
+                for project in sample[:20]:
+                    planner.load_project_record(project)
+                    gc.collect()
+                    before = sys.getallocatedblocks()
+                    stage(project)
+                    gc.collect()
+                    # Never negative: freeing earlier garbage isn't this stage's doing
+                    blocks += max(sys.getallocatedblocks() - before, 0)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                results[f'{size}: {name} (us)'] = timings[len(timings) // 2] * 1e6
+                results[f'{size}: {name} p95 (us)'] = timings[int(len(timings) * 0.95)] * 1e6
+                results[f'{size}: {name} peak (KiB)'] = peak / 1024
+                results[f'{size}: {name} retained blocks'] = blocks / len(sample[:20])
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_structural(count=200000, scalar_sample=5000):
+    """Vectorized structural calculations vs. one calculate_structure() per project"""
+    import structural_calcs
+
+    projects = synthetic_projects(count)
+
+    start = time.perf_counter()
+    for project in projects[:scalar_sample]:
+        structural_calcs.calculate_structure(
+            project['exact_length'], project['exact_width'], project['joist_material'],
+            project['decking_material'], project['attachment_method'],
+            project['intended_use'], project['soil_type'])
+    scalar_rate = scalar_sample / (time.perf_counter() - start)
+
+    inputs = structural_calcs.batch_inputs(projects)
+    start = time.perf_counter()
+    structural_calcs.calculate_batch(**inputs)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'calculate_structure (projects/sec)': scalar_rate,
+        'calculate_batch (projects/sec)': count / batch_seconds,
+        f'calculate_batch {count:,} projects (ms)': batch_seconds * 1000,
+    }
+
+
+def bench_photo_scan(count=5000):
+    """Single-pass photo scan (cold and with manifest) vs. one glob per extension"""
+    import os
+    import tempfile
+    from pathlib import Path
+    from photo_scanner import PhotoScanner
+
+    with tempfile.TemporaryDirectory() as directory:
+        for number in range(count):
+            folder = os.path.join(directory, f"visit_{number % 20:02d}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"IMG_{number:05d}.JPG"), 'wb') as f:
+                f.write(number.to_bytes(4, 'little') * 1024)
+        manifest = os.path.join(directory, '.manifest.json')
+
+        start = time.perf_counter()
+        for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
+            list(Path(directory).glob(f'**/*{ext}'))
+            list(Path(directory).glob(f'**/*{ext.upper()}'))
+        glob_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        PhotoScanner(directory, manifest_path=manifest).scan()
+        lazy_ms = (time.perf_counter() - start) * 1000
+        os.remove(manifest)
+
+        start = time.perf_counter()
+        PhotoScanner(directory, manifest_path=manifest, hash_files=True).scan()
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        PhotoScanner(directory, manifest_path=manifest).scan()
+        warm_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        f'10 globs over {count:,} photos (ms)': glob_ms,
+        'scan, first run with hashing (ms)': cold_ms,
+        'scan, first run, hashing on demand (ms)': lazy_ms,
+        'scan, unchanged manifest (ms)': warm_ms,
+    }
+
+
+def bench_project_records(count=100000):
+    """Memory of slotted ProjectRecords vs. user_responses dicts for many projects"""
+    import json
+    import tracemalloc
+    from deck_planner import ConstructionDeckPlanner
+    from project_record import ProjectRecord
+
+    # Parse from JSON text, as ingestion does, so strings aren't shared by accident
+    lines = [json.dumps(project) for project in synthetic_projects(count)]
+    planner = ConstructionDeckPlanner()
+
+    def measure(build):
+        tracemalloc.start()
+        start = time.perf_counter()
+        items = [build(line) for line in lines]
+        seconds = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del items
+        return size, seconds
+
+    dict_bytes, _ = measure(lambda line: dict(planner.load_project_record(json.loads(line))))
+    record_bytes, record_seconds = measure(ProjectRecord.from_json)
+
+    return {
+        f'user_responses dicts, {count:,} projects (MB)': dict_bytes / 1e6,
+        f'ProjectRecords, {count:,} projects (MB)': record_bytes / 1e6,
+        'bytes per project (dict)': dict_bytes / count,
+        'bytes per project (record)': record_bytes / count,
+        'record ingestion (projects/sec)': count / record_seconds,
+    }
+
+
+def bench_project_store(count=200000):
+    """Memory-mapped column filter vs. scanning ProjectRecords in a list"""
+    import tempfile
+    from project_record import ProjectRecord
+    from project_store import ProjectStore
+
+    projects = synthetic_projects(count)
+    for number, project in enumerate(projects):
+        project['zip_code'] = f"{22000 + number % 100}"
+    records = [ProjectRecord.from_dict(project) for project in projects]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ProjectStore(directory) as store:
+            start = time.perf_counter()
+            store.append(records)
+            append_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            matches = store.select(zip_code='22032', deck_height_inches__gt=30)
+            select_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        expected = [record for record in records
+                    if record.zip_code == '22032' and record.deck_height_inches > 30]
+        scan_ms = (time.perf_counter() - start) * 1000
+        assert len(matches) == len(expected)
+
+    return {
+        'append (projects/sec)': count / append_seconds,
+        f'record list scan, {count:,} projects (ms)': scan_ms,
+        f'columnar select, {count:,} projects (ms)': select_ms,
+    }
+
+
+def bench_cut_list(sizes=(100, 500, 2000), decks=200, time_limit=0.5):
+    """Cut-list packing: heuristic vs. time-bounded improvement, and a pooled batch"""
+    import random
+    import structural_calcs
+    from cut_list import deck_pieces, optimize_cuts, optimize_many
+
+    results = {}
+    rng = random.Random(42)
+    for count in sizes:
+        # Mixed framing and decking cuts: blocking, stair treads, joists, rims
+        pieces = [round(rng.choice([rng.uniform(1.5, 4), rng.uniform(4, 9), rng.uniform(9, 15.9)]), 2)
+                  for _ in range(count)]
+        start = time.perf_counter()
+        heuristic = optimize_cuts(pieces, '2x10', time_limit=0)
+        heuristic_ms = (time.perf_counter() - start) * 1000
+        improved = optimize_cuts(pieces, '2x10', time_limit=time_limit)
+        results[f'{count:,} pieces: heuristic (ms)'] = heuristic_ms
+        results[f'{count:,} pieces: heuristic waste (%)'] = 100 * heuristic.waste_ft / heuristic.stock_ft
+        results[f'{count:,} pieces: improved waste (%)'] = 100 * improved.waste_ft / improved.stock_ft
+        results[f'{count:,} pieces: improved cost over bound (%)'] = \
+            100 * (improved.cost / improved.lower_bound_cost - 1)
+
+    jobs = []
+    for project in synthetic_projects(decks):
+        structure = structural_calcs.calculate_structure(
+            project['exact_length'], project['exact_width'], project['joist_material'],
+            project['decking_material'], project['attachment_method'])
+        jobs.append((project['project_id'], deck_pieces(
+            project['exact_length'], project['exact_width'], project['deck_height_inches'],
+            structure, project['attachment_method'], project['decking_material'])))
+    for workers in (1, None):
+        start = time.perf_counter()
+        for _ in optimize_many(jobs, workers=workers, time_limit=0.02):
+            pass
+        label = 'serial' if workers == 1 else 'process pool'
+        results[f'{decks} decks, {label} (decks/sec)'] = decks / (time.perf_counter() - start)
+    return results
+
+
+def bench_price_book(bids=5000):
+    """Weekly re-quote: re-price every open bid's takeoff after a sheet update"""
+    import random
+    from material_takeoff import takeoff_for_responses
+    from price_book import OpenBids, PriceBook
+
+    book = PriceBook()
+    open_bids = OpenBids()
+    start = time.perf_counter()
+    for project in synthetic_projects(bids):
+        open_bids.add_project(project['project_id'], project['zip_code'],
+                              takeoff_for_responses(project))
+    load_seconds = time.perf_counter() - start
+
+    rng = random.Random(42)
+    for description in open_bids.descriptions:
+        for supplier in ('Home Depot', 'Lowes', '84 Lumber'):
+            book.add(supplier, description, rng.uniform(2, 200), '')
+            for prefix in ('220', '221', '201'):
+                book.add(supplier, description, rng.uniform(2, 200), prefix + '01')
+
+    start = time.perf_counter()
+    report = open_bids.reprice(book)
+    reprice_seconds = time.perf_counter() - start
+    return {
+        f'{bids:,} bids: load takeoffs (s)': load_seconds,
+        f'{len(open_bids):,} lines: re-price (ms)': reprice_seconds * 1000,
+        'projects changed': report.summary()['projects_changed'],
+    }
+
+
+def bench_service(count=1000, batch=500):
+    """Planner service round trips over a keep-alive local HTTP connection"""
+    import http.client
+    import json
+    import threading
+    from planner_service import serve
+
+    servers = []
+    ready = threading.Event()
+
+    def on_ready(server):
+        servers.append(server)
+        ready.set()
+
+    thread = threading.Thread(target=serve, kwargs={'port': 0, 'ready': on_ready}, daemon=True)
+    thread.start()
+    ready.wait()
+    connection = http.client.HTTPConnection(*servers[0].server_address[:2])
+
+    def post(body):
+        connection.request('POST', '/templates', json.dumps(body).encode('utf-8'),
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+    projects = synthetic_projects(count)
+    results = {}
+    for label in ('rendered', 'cached'):
+        start = time.perf_counter()
+        for project in projects:
+            post(project)
+        results[f'single template, {label} (ms/request)'] = (time.perf_counter() - start) * 1000 / count
+    batch_projects = synthetic_projects(batch, seed=7)
+    start = time.perf_counter()
+    post({'projects': batch_projects})
+    results[f'{batch} templates in one request (templates/sec)'] = batch / (time.perf_counter() - start)
+
+    connection.close()
+    servers[0].shutdown()
+    thread.join()
+    return results
+
+
+def bench_schedule(decks=1000, season=(15, 200), crews=(1, 4)):
+    """Critical-path scheduling of one deck, and of a season of decks sharing crews"""
+    import random
+    from datetime import date, timedelta
+    from construction_schedule import schedule, schedule_season
+
+    start = date(2026, 4, 1)
+    began = time.perf_counter()
+    for _ in range(decks):
+        schedule(start, True, True, True).to_xml()
+    results = {'single deck schedule (decks/sec)': decks / (time.perf_counter() - began)}
+
+    rng = random.Random(42)
+    for jobs, crew_count in zip(season, crews):
+        projects = synthetic_projects(jobs)
+        for project in projects:
+            project.update(start_date=str(start + timedelta(days=rng.randint(0, 120))),
+                           has_excavator=rng.random() < 0.5,
+                           concrete_subcontract=rng.random() < 0.5,
+                           permit_required=project['deck_height_inches'] > 30)
+        began = time.perf_counter()
+        schedule_season(projects, start, crews=crew_count)
+        results[f'{jobs} jobs, {crew_count} crew(s): season schedule (ms)'] = (time.perf_counter() - began) * 1000
+    return results
+
+
+def bench_crew_scheduler(jobs=500, slips=50, fleet=(40, 6, 6, 8)):
+    """Plan concurrent jobs over shared crews and equipment, then re-plan single slips"""
+    import random
+    from datetime import date, timedelta
+    from crew_scheduler import ProjectScheduler
+
+    start = date(2026, 4, 1)
+    rng = random.Random(42)
+    projects = synthetic_projects(jobs)
+    for project in projects:
+        project.update(start_date=str(start + timedelta(days=rng.randint(0, 150))),
+                       has_excavator=rng.random() < 0.4,
+                       concrete_subcontract=rng.random() < 0.6,
+                       priority=rng.choice((0, 0, 0, 1)))
+
+    began = time.perf_counter()
+    scheduler = ProjectScheduler(start, *fleet)
+    scheduler.add_projects(projects)
+    scheduler.plan()
+    plan_seconds = time.perf_counter() - began
+
+    slipped = rng.sample([project['project_id'] for project in projects], slips)
+    began = time.perf_counter()
+    for project_id in slipped:
+        scheduler.slip(project_id, rng.randint(1, 5))
+    slip_seconds = time.perf_counter() - began
+    rows = scheduler.summary()
+    return {
+        f'{jobs} jobs: plan (ms)': plan_seconds * 1000,
+        'one job slips: re-plan (ms)': slip_seconds * 1000 / slips,
+        'mean start delay (working days)': sum(row['delay_days'] for row in rows) / len(rows),
+    }
+
+
+def bench_climate(lookups=200000):
+    """Build the per-ZIP climate table, then day-of-year lookups per project"""
+    import random
+    from datetime import date, timedelta
+    from climate import ClimateTable
+
+    start = time.perf_counter()
+    table = ClimateTable.load()
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(42)
+    queries = [(f"{rng.randint(20000, 24999):05d}", date(2026, 1, 1) + timedelta(days=rng.randint(0, 364)))
+               for _ in range(lookups)]
+    start = time.perf_counter()
+    for zip_code, day in queries:
+        profile = table.lookup(zip_code)
+        profile.rain_chance(day)
+        profile.is_frost_free(day)
+    lookup_seconds = time.perf_counter() - start
+    return {
+        'build climate table (ms)': build_seconds * 1000,
+        'ZIP + day lookups (lookups/sec)': lookups / lookup_seconds,
+    }
+
+
+def bench_grading(points=10000, repeat=20):
+    """Grade a 16x12 deck site from slope answers and from a dense spot-elevation survey"""
+    import random
+    from grading import grade_site
+
+    rng = random.Random(42)
+    survey = []
+    for _ in range(points):
+        x, y = rng.uniform(-2, 18), rng.uniform(-4, 14)
+        survey.append((x, y, 0.25 * x - 0.6 * y + rng.gauss(0, 0.5)))
+
+    def best_of(**kwargs):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            grade_site(16, 12, foundation_distance=4, **kwargs)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    return {
+        'grade from slope answers (ms)': best_of(slope_direction='east', slope_amount_inches=6) * 1000,
+        f'grade from {points:,}-point survey (ms)': best_of(spot_elevations=survey) * 1000,
+    }
+
+
+def bench_compliance(count=20000):
+    """Compile the jurisdiction rule sets, then check a batch of projects against them"""
+    from compliance import RuleBook, check_project, project_facts
+    from project_record import ProjectRecord
+    from structural_calcs import calculate_structure
+
+    start = time.perf_counter()
+    rulebook = RuleBook.load()
+    compile_seconds = time.perf_counter() - start
+
+    checks = []
+    for project in synthetic_projects(count):
+        record = ProjectRecord.from_dict(project)
+        checks.append((record, calculate_structure(
+            record.exact_length, record.exact_width, record.joist_material, record.decking_material,
+            record.attachment_method, record.intended_use, record.soil_type)))
+    rules = rulebook.lookup(SAMPLE_PROJECT['zip_code'])
+    start = time.perf_counter()
+    for record, structure in checks:
+        rules.evaluate(project_facts(record, structure))
+    evaluate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record, structure in checks:
+        check_project(record, structure)
+    check_seconds = time.perf_counter() - start
+    return {
+        'compile rule sets (ms)': compile_seconds * 1000,
+        'evaluate rules (projects/sec)': count / evaluate_seconds,
+        'check_project (projects/sec)': count / check_seconds,
+    }
+
+
+BENCHMARKS = {
+    'templates': bench_templates,
+    'suppliers': bench_supplier_lookup,
+    'structural': bench_structural,
+    'photos': bench_photo_scan,
+    'records': bench_project_records,
+    'store': bench_project_store,
+    'cutlist': bench_cut_list,
+    'pricebook': bench_price_book,
+    'service': bench_service,
+    'schedule': bench_schedule,
+    'crews': bench_crew_scheduler,
+    'climate': bench_climate,
+    'grading': bench_grading,
+    'compliance': bench_compliance,
+    'stages': bench_stages,
+}
+
+
+LOWER_IS_BETTER = ('(ms)', '(us)', '(s)', '(MB)', '(KiB)', 'bytes per')
+HIGHER_IS_BETTER = ('/sec)',)
+NOT_GATED = (' p95 ', ' peak ')   # tail latency and tracemalloc peaks are too noisy to gate on
+RETAINED_BLOCKS = 'retained blocks'
+MIN_RETAINED_BLOCKS = 50          # baseline floor, so a few stray blocks over 0 don't fail
+
+
+def regression(metric, value, baseline):
+    """Fractional change of metric for the worse since baseline (0 if it improved)"""
+    if any(marker in metric for marker in NOT_GATED):
+        return 0.0
+    if metric.endswith(RETAINED_BLOCKS):
+        return max((value - baseline) / max(baseline, MIN_RETAINED_BLOCKS), 0.0)
+    if not baseline:
+        return 0.0
+    if any(marker in metric for marker in HIGHER_IS_BETTER):
+        return max(baseline / value - 1, 0.0) if value else float('inf')
+    if any(marker in metric for marker in LOWER_IS_BETTER):
+        return max(value / baseline - 1, 0.0)
+    return 0.0  # counts and percentages describe results, not speed
+
+
+def compare(results, baseline, threshold):
+    """[(benchmark, metric, baseline value, value, change)] that regressed beyond threshold"""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = baseline.get(name, {}).get(metric)
+            if previous is None:
+                continue
+            change = regression(metric, value, previous)
+            if change > threshold:
+                regressions.append((name, metric, previous, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Deckorator hot paths")
+    parser.add_argument('names', nargs='*', metavar='benchmark',
+                        help=f"Benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--json', metavar='FILE', help="Save results as JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="Compare with results saved by --json")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown before failing, as a fraction (default: 0.25)")
+    args = parser.parse_args()
+
+    names = args.names or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+
+    results = {}
+    for name in names:
+        print(f"\n⏱️  {name}")
+        print("-" * 50)
+        results[name] = {metric: float(value) for metric, value in BENCHMARKS[name]().items()}
+        for metric, value in results[name].items():
+            print(f"  {metric:<45} {value:>12,.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'cpus': os.cpu_count(),
+                'results': results,
+            }, f, indent=2)
+        print(f"\n📁 Results saved to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} metric(s) regressed more than {args.threshold:.0%}:")
+            for name, metric, previous, value, change in regressions:
+                print(f"  {name}: {metric}: {previous:,.1f} -> {value:,.1f} (+{change:.0%})")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Climate Model for Deckorator
+Day-of-year working-weather table per ZIP code, so the planner can size
+footers for the local frost line and plan around rain and frozen ground
+instead of asking the AI for "weather considerations" on every project.
+
+Each area's figures come from the climate section of location_config.json
+(and any location_config_<zip>.json next to it), with the gaps filled from
+seasonal_planning_guide.md. They are expanded once into tables indexed by
+day of year:
+
+    rain_probability   chance of measurable rain, by month (wettest and
+                       driest months and hurricane season adjusted),
+                       interpolated between mid-month values
+    ground_frost_in    seasonal frost penetration, zero outside the frost
+                       season and reaching the design frost depth mid-way
+    frost_free         outside the frost season, with two days' margin, so
+                       footings can be dug and poured (guide: concrete needs
+                       no frost expected for 48 hours; ground may be frozen)
+    weather_day        the days expected to be lost to heavy rain and
+                       winter weather, spread evenly so the schedule keeps
+                       the right number of backup days
+
+After that a lookup is a dict access for the ZIP and a list index for the
+day. Unknown ZIPs use the closest configured ZIP with the same 3-digit
+prefix. ZIPs with no configured area nearby (and blank ZIPs) get an
+'unknown' profile: no frost season or weather days, and footers sized to a
+conservative frost depth that the template flags for local verification.
+"""
+
+import json
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from structural_calcs import DEFAULT_FROST_DEPTH_IN
+
+BASE_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = BASE_DIR / 'location_config.json'
+GUIDE_PATH = BASE_DIR / 'seasonal_planning_guide.md'
+
+MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december')
+MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)   # leap year: Feb 29 has a slot
+MONTH_START = tuple(sum(MONTH_DAYS[:month]) for month in range(12))
+DAYS = sum(MONTH_DAYS)
+
+DEFAULT_ANNUAL_PRECIPITATION_IN = 40
+# Frost depth assumed where the climate isn't known: IRC Table R301.2 leaves
+# it to the local building department, and 60 inches covers the deepest
+# design frost lines in the contiguous US outside the far north
+UNKNOWN_FROST_DEPTH_IN = 60
+UNKNOWN_FROST_DEPTH_NOTE = "Frost depth not known for this ZIP, verify locally"
+
+# Rain days: annual precipitation / typical rain per wet day gives the
+# average chance of rain, scaled up in the wettest months and down in the
+# driest, plus extra risk in hurricane season
+RAIN_PER_WET_DAY_IN = 0.37
+WET_MONTH_FACTOR = 1.25
+DRY_MONTH_FACTOR = 0.75
+HURRICANE_EXTRA = 0.04
+# Guide: "Light rain OK, heavy rain stop work"
+HEAVY_RAIN_SHARE = 0.4
+# Guide: winter has "limited working days due to weather"; share of days
+# lost when frost is deepest
+WINTER_LOSS = 0.5
+FROST_MARGIN_DAYS = 2
+
+# "Early/Mid/Late/Mid to late October" -> day of the month
+_PART_OF_MONTH = (('mid to late', 20), ('early to mid', 10), ('early', 7), ('mid', 15),
+                  ('late', 25))
+_BOLD_FIELD = re.compile(r'\*\*(.+?):\*\*\s*(.+)')
+_GUIDE_ZIP = re.compile(r'^# .*\((\d{5})\)')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def day_of_year(day):
+    """0-365 table index for a date (Feb 29 has its own slot every year)"""
+    return MONTH_START[day.month - 1] + day.day - 1
+
+
+def _month_days(text):
+    """Month indexes (0 = January) named in text; 'August-October' is a range"""
+    text = text.lower()
+    named = [index for index, month in enumerate(MONTHS) if month in text]
+    if re.search(r'\w\s*-\s*\w', text) and len(named) == 2:
+        first, last = sorted(named, key=lambda month: text.index(MONTHS[month]))
+        named = [(first + step) % 12 for step in range((last - first) % 12 + 1)]
+    return named
+
+
+def _months(value):
+    if isinstance(value, (list, tuple)):
+        value = ' '.join(value)
+    return _month_days(value or '')
+
+
+def _month_day(text):
+    """Table index for 'Mid to late October', or None"""
+    text = (text or '').lower()
+    months = [index for index, month in enumerate(MONTHS) if month in text]
+    if not months:
+        return None
+    day = next((day for part, day in _PART_OF_MONTH if part in text), 15)
+    return MONTH_START[months[0]] + day - 1
+
+
+def _largest_number(text, default):
+    numbers = [float(number) for number in _NUMBER.findall(str(text or ''))]
+    return max(numbers) if numbers else default
+
+
+def read_guide(path=GUIDE_PATH):
+    """(ZIP code the guide describes, {field: text}) from the seasonal planning guide"""
+    fields = {}
+    zip_code = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = _GUIDE_ZIP.match(line)
+            if match:
+                zip_code = match.group(1)
+            match = _BOLD_FIELD.search(line)
+            if match:
+                fields.setdefault(match.group(1).strip().lower(), match.group(2).strip())
+    return zip_code, fields
+
+
+def read_location_configs(config_path=CONFIG_PATH):
+    """(ZIP code, config) for location_config.json and every location_config_<zip>.json beside it"""
+    config_path = Path(config_path)
+    paths = [config_path] + sorted(config_path.parent.glob(f"{config_path.stem}_*.json"))
+    for path in paths:
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            yield str(config.get('current_location', {}).get('zip_code', '')), config
+
+
+class ClimateProfile:
+    """Working-weather tables for one area, indexed by day_of_year()"""
+
+    __slots__ = ('zip_code', 'climate_zone', 'frost_depth_in', 'first_frost', 'last_frost', 'known',
+                 'rain_probability', 'ground_frost_in', 'frost_free', 'weather_day')
+
+    def __init__(self, zip_code, climate_zone='', frost_depth_in=DEFAULT_FROST_DEPTH_IN,
+                 annual_precipitation_in=DEFAULT_ANNUAL_PRECIPITATION_IN, wettest_months=(),
+                 driest_months=(), hurricane_months=(), first_frost=None, last_frost=None,
+                 known=True):
+        self.zip_code = zip_code
+        self.known = known
+        self.climate_zone = climate_zone
+        self.frost_depth_in = frost_depth_in
+        self.first_frost = first_frost
+        self.last_frost = last_frost
+
+        base = min(annual_precipitation_in / (RAIN_PER_WET_DAY_IN * 365), 0.9)
+        monthly = []
+        for month in range(12):
+            chance = base
+            if month in wettest_months:
+                chance *= WET_MONTH_FACTOR
+            elif month in driest_months:
+                chance *= DRY_MONTH_FACTOR
+            if month in hurricane_months:
+                chance += HURRICANE_EXTRA
+            monthly.append(min(chance, 0.95))
+        # Mid-month (position, chance) points, wrapping round the year
+        middles = [MONTH_START[month] + MONTH_DAYS[month] / 2 for month in range(12)]
+        points = ([(middles[11] - DAYS, monthly[11])] + list(zip(middles, monthly))
+                  + [(middles[0] + DAYS, monthly[0])])
+
+        rain, frost, thawed, lost = [], [], [], []
+        expected_loss = 0.0
+        segment = 0
+        for index in range(DAYS):
+            while points[segment + 1][0] <= index:
+                segment += 1
+            (x0, y0), (x1, y1) = points[segment], points[segment + 1]
+            chance = y0 + (y1 - y0) * (index - x0) / (x1 - x0)
+            rain.append(round(chance, 4))
+
+            depth = 0.0
+            if first_frost is not None and last_frost is not None:
+                season = (last_frost - first_frost) % DAYS
+                into = (index - first_frost) % DAYS
+                if into < season:
+                    depth = frost_depth_in * math.sin(math.pi * into / season)
+                margin_before = (first_frost - index) % DAYS
+                margin_after = (index - last_frost) % DAYS
+                thawed.append(into >= season and margin_before > FROST_MARGIN_DAYS
+                                and margin_after > FROST_MARGIN_DAYS)
+            else:
+                thawed.append(True)
+            frost.append(round(depth, 1))
+
+            loss = chance * HEAVY_RAIN_SHARE
+            if frost_depth_in:
+                loss += WINTER_LOSS * depth / frost_depth_in
+            before = expected_loss
+            expected_loss += min(loss, 1.0)
+            lost.append(math.floor(expected_loss) > math.floor(before))
+
+        self.rain_probability = tuple(rain)
+        self.ground_frost_in = tuple(frost)
+        self.frost_free = bytes(thawed)
+        self.weather_day = bytes(lost)
+
+    @classmethod
+    def unknown(cls):
+        """Profile for areas with no climate data: conservative frost depth, flagged unknown"""
+        return cls('', climate_zone='unknown', frost_depth_in=UNKNOWN_FROST_DEPTH_IN, known=False)
+
+    @classmethod
+    def from_config(cls, climate, zip_code, guide=None):
+        """Profile from a location_config climate section, gaps filled from the guide's fields"""
+        guide = guide or {}
+        patterns = climate.get('weather_patterns', {})
+
+        def pick(config_value, guide_key):
+            return config_value if config_value else guide.get(guide_key, '')
+
+        return cls(
+            zip_code,
+            climate_zone=climate.get('climate_zone', ''),
+            frost_depth_in=_largest_number(climate.get('frost_line_depth'), DEFAULT_FROST_DEPTH_IN),
+            annual_precipitation_in=_largest_number(climate.get('average_annual_precipitation'),
+                                                    DEFAULT_ANNUAL_PRECIPITATION_IN),
+            wettest_months=_months(pick(patterns.get('wettest_months'), 'wettest months')),
+            driest_months=_months(pick(patterns.get('driest_months'), 'driest months')),
+            hurricane_months=_months(pick(patterns.get('hurricane_season_impact'),
+                                          'hurricane season impact')),
+            first_frost=_month_day(pick(climate.get('average_first_frost'), 'average first frost')),
+            last_frost=_month_day(pick(climate.get('average_last_frost'), 'average last frost')),
+        )
+
+    # Lookups by date
+
+    def rain_chance(self, day):
+        return self.rain_probability[day_of_year(day)]
+
+    def ground_frost(self, day):
+        return self.ground_frost_in[day_of_year(day)]
+
+    def is_frost_free(self, day):
+        return bool(self.frost_free[day_of_year(day)])
+
+    def is_weather_day(self, day):
+        return bool(self.weather_day[day_of_year(day)])
+
+
+class ClimateTable:
+    """ClimateProfile per configured ZIP, with prefix fallback and an unknown profile"""
+
+    def __init__(self, profiles):
+        self.profiles = dict(profiles)
+        self.unknown = ClimateProfile.unknown()
+        # 3-digit prefix -> sorted numeric ZIPs, for closest-ZIP fallback
+        self._by_prefix = {}
+        for zip_code in self.profiles:
+            if len(zip_code) == 5 and zip_code.isdigit():
+                self._by_prefix.setdefault(zip_code[:3], []).append(int(zip_code))
+        for zips in self._by_prefix.values():
+            zips.sort()
+        self._cache = {}
+
+    @classmethod
+    def load(cls, config_path=CONFIG_PATH, guide_path=GUIDE_PATH):
+        """Profiles for location_config.json and every location_config_<zip>.json beside it"""
+        guide_zip, guide = read_guide(guide_path) if Path(guide_path).exists() else (None, {})
+        profiles = {}
+        for zip_code, config in read_location_configs(config_path):
+            profiles[zip_code] = ClimateProfile.from_config(config.get('climate_considerations', {}),
+                                                            zip_code, guide)
+        if guide_zip and guide_zip not in profiles:
+            profiles[guide_zip] = ClimateProfile.from_config({}, guide_zip, guide)
+        return cls(profiles)
+
+    def lookup(self, zip_code):
+        """Profile for a ZIP code: exact, then closest with the same 3-digit prefix, else unknown"""
+        zip_code = str(zip_code or '').strip()[:5]
+        profile = self._cache.get(zip_code)
+        if profile is None:
+            profile = self.profiles.get(zip_code)
+            zips = self._by_prefix.get(zip_code[:3]) if profile is None and zip_code.isdigit() else None
+            if zips:
+                target = int(zip_code)
+                profile = self.profiles[f"{min(zips, key=lambda z: abs(z - target)):05d}"]
+            profile = self._cache[zip_code] = profile or self.unknown
+        return profile
+
+
+@lru_cache(maxsize=1)
+def get_climate_table():
+    """The shared ClimateTable (built once per process)"""
+    return ClimateTable.load()
+
+
+def climate_for(zip_code):
+    """ClimateProfile for a project's ZIP code"""
+    return get_climate_table().lookup(zip_code)
+
+
+def design_frost_depth(zip_code):
+    """Frost line depth (inches) footers must reach at a ZIP code (conservative if unknown)"""
+    return climate_for(zip_code).frost_depth_in
+
+
+def frost_depth_basis(zip_code):
+    """Where design_frost_depth() comes from, for the template"""
+    profile = climate_for(zip_code)
+    if not profile.known:
+        return (f"{UNKNOWN_FROST_DEPTH_NOTE}: footers sized to a conservative "
+                f"{profile.frost_depth_in:g} in")
+    return f"{profile.frost_depth_in:g} in frost line, climate data for {profile.zip_code}"
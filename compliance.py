@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Code Compliance for Deckorator
+Check every project against its jurisdiction's deck rules locally, instead
+of asking the AI to "verify compliance" on each template.
+
+Rules come from compliance_rules.json: a default set (IRC and DCA 6) plus
+per-jurisdiction parameter overrides and extra rules. Each area configured
+in location_config.json (and location_config_<zip>.json) gets its own rule
+set, with the permit threshold, permit office, code reference and
+inspections from its building_codes_and_permits section. Rule sets are
+compiled once per process: parameters
+are substituted, regexes compiled and each condition turned into a
+(fact, operator function, value) tuple, so checking a project is a pass
+over small tuples.
+
+A project uses the rule set of the configured area climate.py picks for
+its ZIP code (exact, then closest with the same 3-digit prefix). Other ZIPs
+are checked against the generic IRC defaults, reported as an unknown
+jurisdiction to verify with the local building department.
+
+Usage:
+    python3 compliance.py projects.jsonl --output compliance.csv
+"""
+
+import argparse
+import csv
+import json
+import operator
+import os
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from climate import CONFIG_PATH, climate_for, read_location_configs
+from xml_writer import xml_text
+
+RULES_PATH = Path(__file__).resolve().parent / 'compliance_rules.json'
+
+VIOLATION = 'violation'
+REQUIREMENT = 'requirement'
+UNKNOWN_AUTHORITY = "Unknown jurisdiction, verify with the local building department"
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+    'matches': lambda value, pattern: pattern.search(str(value)) is not None,
+    '!matches': lambda value, pattern: pattern.search(str(value)) is None,
+}
+
+# permit_required_threshold words, e.g. "deck_over_30_inches_high_or_attached_to_house"
+_THRESHOLD_TERMS = (
+    (re.compile(r'(?:deck_)?over_(\d+(?:\.\d+)?)_inches_high'), 'deck_height_inches',
+     "deck over {0:g} inches high"),
+    (re.compile(r'(?:deck_)?over_(\d+(?:\.\d+)?)_square_feet'), 'total_area', "deck over {0:g} square feet"),
+    (re.compile(r'(?:deck_)?attached_to_house'), 'attached', "attached to the house"),
+)
+
+
+def parse_threshold(text):
+    """[(fact, limit, description)] for a permit_required_threshold string; any one requires a permit"""
+    terms = []
+    for part in str(text or '').lower().split('_or_'):
+        for pattern, fact, description in _THRESHOLD_TERMS:
+            match = pattern.fullmatch(part.strip())
+            if match:
+                limit = float(match.group(1)) if match.groups() else None
+                terms.append((fact, limit, description.format(limit) if limit is not None else description))
+                break
+        else:
+            raise ValueError(f"unknown permit threshold term {part!r} in {text!r}")
+    return terms
+
+
+class Finding:
+    """One rule a project breaks (violation) or has to meet (requirement)"""
+
+    __slots__ = ('rule', 'kind', 'code', 'message')
+
+    def __init__(self, rule, kind, code, message):
+        self.rule = rule
+        self.kind = kind
+        self.code = code
+        self.message = message
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"Finding({self.rule!r}, {self.kind!r})"
+
+
+def _compile_conditions(conditions, parameters, rule_id):
+    """(fact, operator function, value, value is a fact name) per [fact, op, value] condition"""
+    compiled = []
+    for fact, name, value in conditions:
+        if name not in OPERATORS:
+            raise ValueError(f"rule '{rule_id}': unknown operator {name!r}")
+        from_fact = False
+        if isinstance(value, str) and value.startswith('$'):
+            if value[1:] in parameters:
+                value = parameters[value[1:]]
+            else:
+                value, from_fact = value[1:], True
+        if name.endswith('matches'):
+            value = re.compile(value, re.IGNORECASE)
+        compiled.append((fact, OPERATORS[name], value, from_fact))
+    return tuple(compiled)
+
+
+def _holds(conditions, facts):
+    """True/False, or None if a fact the conditions need is unknown"""
+    for fact, test, value, from_fact in conditions:
+        actual = facts.get(fact)
+        if from_fact:
+            value = facts.get(value)
+        if actual is None or value is None:
+            return None
+        if not test(actual, value):
+            return False
+    return True
+
+
+class RuleSet:
+    """Compiled permit threshold and deck rules for one jurisdiction"""
+
+    def __init__(self, jurisdiction, rules, parameters, permit_threshold, code_reference='',
+                 permit_office=None, permit_timeline='', inspections=(), known=True):
+        self.jurisdiction = jurisdiction
+        self.known = known
+        self.parameters = dict(parameters)
+        self.permit_threshold = permit_threshold
+        self.permit_terms = tuple(parse_threshold(permit_threshold))
+        self.code_reference = code_reference
+        self.permit_office = permit_office or {}
+        self.permit_timeline = permit_timeline
+        self.inspections = tuple(inspections)
+        # (id, kind, code, when, require, message) with parameters substituted
+        self.rules = tuple(
+            (rule['id'], rule.get('kind', VIOLATION), rule.get('code', ''),
+             _compile_conditions(rule.get('when', ()), self.parameters, rule['id']),
+             _compile_conditions(rule.get('require', ()), self.parameters, rule['id']),
+             rule['message'])
+            for rule in rules)
+
+    @property
+    def authority(self):
+        """Who the project answers to: the jurisdiction, or a prompt to find out"""
+        return self.jurisdiction if self.known else UNKNOWN_AUTHORITY
+
+    def permit_reasons(self, facts):
+        """Threshold terms the project meets (empty: no permit needed)"""
+        reasons = []
+        for fact, limit, description in self.permit_terms:
+            value = facts.get(fact)
+            if value is not None and (value > limit if limit is not None else value):
+                reasons.append(description)
+        return reasons
+
+    def permit_required(self, facts):
+        return bool(self.permit_reasons(facts))
+
+    def evaluate(self, facts):
+        """[Finding] for the rules that apply to a project's facts"""
+        findings = []
+        for rule_id, kind, code, when, require, message in self.rules:
+            if when and not _holds(when, facts):
+                continue
+            if kind == VIOLATION:
+                if not require or _holds(require, facts) is not False:
+                    continue
+            elif require and _holds(require, facts) is None:
+                continue
+            findings.append(Finding(rule_id, kind, code, message.format_map({**self.parameters, **facts})))
+        return findings
+
+
+class ComplianceReport:
+    """A project's permit decision and findings under one RuleSet"""
+
+    __slots__ = ('rules', 'permit_reasons', 'findings')
+
+    def __init__(self, rules, permit_reasons, findings):
+        self.rules = rules
+        self.permit_reasons = permit_reasons
+        self.findings = findings
+
+    @property
+    def permit_required(self):
+        return bool(self.permit_reasons)
+
+    @property
+    def violations(self):
+        return [finding for finding in self.findings if finding.kind == VIOLATION]
+
+    def to_xml(self, indent='      '):
+        """<compliance_review> contents for the construction template"""
+        rules = self.rules
+        lines = [f"<authority>{xml_text(rules.authority)}</authority>"]
+        if not rules.known:
+            lines.append(f"<rules_applied>{xml_text(rules.jurisdiction)}</rules_applied>")
+        office = rules.permit_office
+        if office.get('name'):
+            contact = ', '.join(office[key] for key in ('name', 'phone', 'website') if office.get(key))
+            lines.append(f"<permit_office>{xml_text(contact)}</permit_office>")
+        lines.append(f"<permit_basis>{xml_text('; '.join(self.permit_reasons) or 'below permit thresholds')}"
+                     f"</permit_basis>")
+        if self.permit_required:
+            if rules.permit_timeline:
+                lines.append(f"<permit_timeline>{xml_text(rules.permit_timeline)}</permit_timeline>")
+            if rules.inspections:
+                lines.append(f"<inspections>{xml_text(', '.join(rules.inspections))}</inspections>")
+        violations = len(self.violations)
+        lines.append(f"<status>{f'{violations} violation(s)' if violations else 'no violations found'}</status>")
+        for finding in self.findings:
+            lines.append(f'<{finding.kind} rule="{finding.rule}" code="{xml_text(finding.code)}">'
+                         f'{xml_text(finding.message)}</{finding.kind}>')
+        return ''.join(f"\n{indent}{line}" for line in lines)
+
+
+class RuleBook:
+    """RuleSet per configured ZIP code, plus the generic rules for everywhere else"""
+
+    def __init__(self, rule_sets, default):
+        self.rule_sets = dict(rule_sets)
+        self.default = default
+
+    @classmethod
+    def load(cls, rules_path=RULES_PATH, config_path=CONFIG_PATH):
+        with open(rules_path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        base = document['default']
+        jurisdictions = document.get('jurisdictions', {})
+
+        def compile_for(permits, known=True):
+            name = permits.get('jurisdiction') or base['jurisdiction']
+            local = jurisdictions.get(name, {})
+            parameters = dict(base.get('parameters', {}))
+            parameters.update(local.get('parameters', {}))
+            return RuleSet(
+                name, list(base.get('rules', ())) + list(local.get('rules', ())), parameters,
+                permits.get('permit_required_threshold') or base['permit_required_threshold'],
+                code_reference=(permits.get('building_codes', {}).get('deck_specific_requirements')
+                                or local.get('code_reference') or base.get('code_reference', '')),
+                permit_office=permits.get('permit_office'),
+                permit_timeline=permits.get('typical_permit_timeline') or base.get('typical_permit_timeline', ''),
+                inspections=permits.get('inspection_requirements') or base.get('inspection_requirements', ()),
+                known=known)
+
+        rule_sets = {zip_code: compile_for(config.get('building_codes_and_permits', {}))
+                     for zip_code, config in read_location_configs(config_path)}
+        return cls(rule_sets, compile_for({}, known=False))
+
+    def lookup(self, zip_code):
+        """RuleSet for the configured area climate.py matches a ZIP code to, else the generic one"""
+        return self.rule_sets.get(climate_for(zip_code).zip_code, self.default)
+
+
+@lru_cache(maxsize=1)
+def get_rulebook():
+    """The shared RuleBook (compiled once per process)"""
+    return RuleBook.load()
+
+
+def rules_for(zip_code):
+    """RuleSet for a project's ZIP code"""
+    return get_rulebook().lookup(zip_code)
+
+
+def project_facts(record, structure=None):
+    """Facts rules can test, from a ProjectRecord and optionally its StructuralResult"""
+    facts = {
+        'deck_height_inches': record.deck_height_inches,
+        'total_area': record.total_area,
+        'attached': record.is_ledger,
+        'attachment_method': record.attachment_method,
+        'house_construction': record.house_construction or None,
+        'ledger_height_inches': record.ledger_height,
+        'intended_use': record.intended_use,
+    }
+    if structure is not None:
+        facts.update(
+            footer_depth_inches=structure.footer_depth_in,
+            joist_span_feet=structure.joist_span_ft,
+            requires_engineering=structure.requires_engineering,
+        )
+    return facts
+
+
+def permit_required(record):
+    """Whether a ProjectRecord's jurisdiction requires a permit for it"""
+    return rules_for(record.zip_code).permit_required(project_facts(record))
+
+
+def check_project(record, structure=None):
+    """ComplianceReport for a ProjectRecord (structure-dependent rules need the StructuralResult)"""
+    rules = rules_for(record.zip_code)
+    facts = project_facts(record, structure)
+    return ComplianceReport(rules, rules.permit_reasons(facts), rules.evaluate(facts))
+
+
+def check_record(record):
+    """(ProjectRecord, ComplianceReport) for a project record (a dict or ProjectRecord).
+
+    Raises ValueError for records ProjectRecord rejects.
+    """
+    from climate import design_frost_depth
+    from project_record import ProjectRecord
+    from structural_calcs import calculate_structure
+
+    if not isinstance(record, ProjectRecord):
+        record = ProjectRecord.from_dict(record)
+    structure = calculate_structure(
+        record.exact_length, record.exact_width, record.joist_material, record.decking_material,
+        record.attachment_method, record.intended_use, record.soil_type,
+        design_frost_depth(record.zip_code))
+    return record, check_project(record, structure)
+
+
+def check_projects(records):
+    """Yield (ProjectRecord, ComplianceReport) for each project record in a batch"""
+    for record in records:
+        yield check_record(record)
+
+
+REPORT_FIELDS = ['project_id', 'jurisdiction', 'permit_required', 'kind', 'rule', 'code', 'message']
+
+
+def main():
+    from batch_planner import read_project_records
+
+    parser = argparse.ArgumentParser(description="Check deck projects against local code rules")
+    parser.add_argument('input', help="Project records (.jsonl or .csv)")
+    parser.add_argument('-o', '--output', default='compliance.csv',
+                        help="One row per finding (default: compliance.csv)")
+    parser.add_argument('--violations-only', action='store_true',
+                        help="Leave requirements out of the report")
+    args = parser.parse_args()
+
+    projects = failed = flagged = 0
+    temporary = f"{args.output}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        for record in read_project_records(args.input):
+            try:
+                record, report = check_record(record)
+            except ValueError as e:
+                failed += 1
+                print(f"⚠️  Skipping project {record.get('project_id', '?')}: {e}")
+                continue
+            projects += 1
+            flagged += bool(report.violations)
+            for finding in report.findings:
+                if args.violations_only and finding.kind != VIOLATION:
+                    continue
+                writer.writerow(dict(finding.to_dict(), project_id=record.project_id or projects,
+                                     jurisdiction=report.rules.authority,
+                                     permit_required=report.permit_required))
+    os.replace(temporary, args.output)
+    print(f"📋 {projects} projects checked, {flagged} with violations")
+    print(f"📁 Report saved to {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,628 @@
+"""
+Construction Schedule for Deckorator
+Critical-path schedule of the build, computed from the phases in
+construction_phase_checklist.md instead of asking the AI for a Gantt chart.
+
+Each "Day N" section of the checklist becomes a one-day task, and a phase
+without day sections becomes one task spanning its days. Tasks follow the
+checklist order, except that the stairs can go in alongside the railing
+once the decking is down. Inspections the checklist calls for become
+one-day holds when a permit is needed, and the pre-construction phase
+(permits, materials ordered two weeks ahead) fills the working days before
+the first levelled construction task. It never starts before today, so a
+start date in the past or inside that lead time moves construction back
+until the permits can be in hand.
+
+schedule() runs the critical-path method for earliest and latest starts,
+then levels resources with a serial schedule: tasks are taken in order of
+least slack, and each starts on the first working day on which its
+predecessors are done and every resource it needs has capacity (the
+builder's crew, the excavator inside its rental window or else a power
+auger, the concrete subcontractor on the days it comes out). Slack and the critical path
+are from the unlevelled pass. schedule_season() levels a whole season of
+jobs against the same crews and equipment.
+"""
+
+import heapq
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+from xml_writer import xml_text
+
+CHECKLIST_PATH = Path(__file__).resolve().parent / 'construction_phase_checklist.md'
+
+WORKING_WEEKDAYS = (0, 1, 2, 3, 4)   # Monday to Friday
+WORKING_DAYS_PER_WEEK = 5
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%B %d, %Y', '%b %d, %Y', '%B %d %Y')
+
+CREW = 'crew'
+EXCAVATOR = 'excavator'
+AUGER = 'auger'
+CONCRETE_CREW = 'concrete_crew'
+
+# Checklist task title keyword -> equipment or subcontractor it needs
+# besides the builder's crew. Footings are dug with the rented excavator,
+# or with a power auger when there is none.
+TASK_RESOURCES = (
+    ('Footings', EXCAVATOR),
+    ('Footings', AUGER),
+    ('Concrete', CONCRETE_CREW),
+)
+# Tasks that can't be done in frozen ground (digging and pouring footings)
+FROST_FREE_TASKS = ('Footings', 'Concrete')
+# How far ahead a job looks for a crew that can stay with it
+LOOKAHEAD_DAYS = 20
+# Phases that can start as soon as an earlier phase (not the previous one) ends
+PHASE_PREDECESSOR = {
+    'Stair Construction': 'Decking Installation',
+}
+
+_PHASE = re.compile(r'^## .*?Phase (\d+): (.+?) \(Days? (\d+)(?:-(\d+))?\)')
+_PRE_CONSTRUCTION = re.compile(r'^## .*?Pre-Construction Phase \((?:(\d+)-)?(\d+) weeks? before\)')
+_DAY = re.compile(r'^### Day (\d+): (.+?)\s*$')
+_INSPECTION = re.compile(r'Call for (\w+) inspection')
+
+
+def parse_start_date(text):
+    """The date in a start_date answer, or None if it isn't a recognizable date"""
+    text = str(text or '').strip()
+    for pattern in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, pattern).date()
+        except ValueError:
+            continue
+    return None
+
+
+def requested_start(text):
+    """The date in a start_date answer, or None if it's blank.
+
+    Raises ValueError for an answer that isn't a recognizable date.
+    """
+    start = parse_start_date(text)
+    if start is None and str(text or '').strip():
+        raise ValueError(f"'start_date' must be a date (YYYY-MM-DD), got {str(text).strip()!r}")
+    return start
+
+
+@lru_cache(maxsize=4)
+def load_phases(path=CHECKLIST_PATH):
+    """(pre-construction weeks, [phase dicts]) parsed from the phase checklist.
+
+    Each phase has its name, first and last day, [(day, title)] day
+    sections and the inspections it calls for.
+    """
+    pre_construction_weeks = 0
+    phases = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = _PRE_CONSTRUCTION.match(line)
+            if match:
+                pre_construction_weeks = int(match.group(2))
+                continue
+            match = _PHASE.match(line)
+            if match:
+                first = int(match.group(3))
+                phases.append({'name': match.group(2), 'first_day': first,
+                               'last_day': int(match.group(4) or first),
+                               'days': [], 'inspections': []})
+                continue
+            if line.startswith('## '):
+                phases.append(None)  # a section that isn't a phase ends the current phase
+                continue
+            if not phases or phases[-1] is None:
+                continue
+            match = _DAY.match(line)
+            if match:
+                phases[-1]['days'].append((int(match.group(1)), match.group(2)))
+            match = _INSPECTION.search(line)
+            if match:
+                phases[-1]['inspections'].append(match.group(1).lower())
+    return pre_construction_weeks, tuple(phase for phase in phases if phase is not None)
+
+
+class Task:
+    """One schedulable piece of work, in working days"""
+
+    __slots__ = ('job', 'name', 'phase', 'duration', 'resources', 'predecessors',
+                 'earliest_start', 'latest_start', 'start', 'units', 'priority', 'frost_free')
+
+    def __init__(self, job, name, phase, duration, resources=(), predecessors=(), priority=0):
+        self.job = job
+        self.name = name
+        self.phase = phase
+        self.duration = duration
+        self.resources = tuple(resources)
+        self.predecessors = list(predecessors)
+        self.earliest_start = 0
+        self.latest_start = 0
+        self.start = None
+        self.units = {}  # resource name -> unit booked
+        self.priority = priority  # lower is levelled first
+        self.frost_free = any(keyword in name for keyword in FROST_FREE_TASKS)
+
+    @property
+    def finish(self):
+        """First working day after the task (exclusive)"""
+        return self.start + self.duration
+
+    @property
+    def slack(self):
+        return self.latest_start - self.earliest_start
+
+    @property
+    def critical(self):
+        return self.slack == 0
+
+
+class Resource:
+    """Crews or pieces of equipment of one kind, each booked by the day.
+
+    available(day) says whether any of them can be booked on a working-day
+    index, e.g. inside a rental window or on the days a subcontractor
+    comes out. A unit is held by the job it is working on until that job's
+    last task needing it is booked, and other jobs only take a held unit
+    when no other is free.
+    """
+
+    __slots__ = ('name', 'capacity', 'available', 'booked', 'held')
+
+    def __init__(self, name, capacity=1, available=None):
+        self.name = name
+        self.capacity = capacity
+        self.available = available
+        self.booked = [set() for _ in range(capacity)]  # working days booked, per unit
+        self.held = [None] * capacity                    # job holding each unit
+
+    def free_unit(self, day, duration, prefer=None, job=None, run=0):
+        """A unit free for the whole task (prefer if it is), or None.
+
+        Otherwise a unit no other job holds, best one that stays free for
+        run days so the rest of the job can follow on the same unit.
+        """
+        days = range(day, day + duration)
+        if self.available is not None and not all(self.available(index) for index in days):
+            return None
+        if prefer is not None and self.booked[prefer].isdisjoint(days):
+            return prefer
+        best = fallback = None
+        for unit, booked in enumerate(self.booked):
+            if not booked.isdisjoint(days):
+                continue
+            if self.held[unit] is not None and self.held[unit] != job:
+                if fallback is None:
+                    fallback = unit
+                continue
+            free = duration
+            while free < run and day + free not in booked:
+                free += 1
+            if free >= run:
+                return unit
+            if best is None or free > best[0]:
+                best = (free, unit)
+        return fallback if best is None else best[1]
+
+    def book(self, day, duration, unit):
+        self.booked[unit].update(range(day, day + duration))
+
+    def release(self, day, duration, unit):
+        self.booked[unit].difference_update(range(day, day + duration))
+
+    def let_go(self, job):
+        """Stop holding units for a job"""
+        for unit, holder in enumerate(self.held):
+            if holder == job:
+                self.held[unit] = None
+
+
+class WorkCalendar:
+    """Maps working-day indexes (0 = first working day on or after start) to dates.
+
+    With a ClimateProfile (see climate.py), the weekdays expected to be
+    lost to weather are backup days rather than working days, and footings
+    are only dug and poured outside the frost season.
+    """
+
+    def __init__(self, start, working_weekdays=WORKING_WEEKDAYS, holidays=(), climate=None):
+        self.working_weekdays = frozenset(working_weekdays)
+        self.holidays = frozenset(holidays)
+        self.climate = climate
+        while not self.is_working(start):
+            start += timedelta(days=1)
+        self.start = start
+        self._forward = [start]
+        self._backward = [start]
+
+    def is_working(self, day):
+        return (day.weekday() in self.working_weekdays and day not in self.holidays
+                and not (self.climate is not None and self.climate.is_weather_day(day)))
+
+    def frost_free(self, index):
+        return self.climate is None or self.climate.is_frost_free(self.date(index))
+
+    def backup_days(self, first, last):
+        """Weekdays between two dates held back for weather"""
+        if self.climate is None:
+            return 0
+        days = 0
+        day = first
+        while day <= last:
+            if (day.weekday() in self.working_weekdays and day not in self.holidays
+                    and self.climate.is_weather_day(day)):
+                days += 1
+            day += timedelta(days=1)
+        return days
+
+    def date(self, index):
+        dates, step = (self._forward, 1) if index >= 0 else (self._backward, -1)
+        while len(dates) <= abs(index):
+            day = dates[-1] + timedelta(days=step)
+            while not self.is_working(day):
+                day += timedelta(days=step)
+            dates.append(day)
+        return dates[abs(index)]
+
+    def index(self, day):
+        """Working-day index of a date (the next working day if it isn't one)"""
+        index = 0
+        step = 1 if day >= self.start else -1
+        while (self.date(index) < day) if step == 1 else (self.date(index - 1) >= day):
+            index += step
+        return index
+
+
+def build_tasks(job=None, has_excavator=False, concrete_subcontract=False, permit_required=False,
+                checklist=CHECKLIST_PATH):
+    """Tasks and dependencies for one deck, in checklist order"""
+    pre_construction_weeks, phases = load_phases(checklist)
+    extra = {EXCAVATOR: has_excavator, AUGER: not has_excavator,
+             CONCRETE_CREW: concrete_subcontract}
+    tasks = []
+    phase_ends = {}
+    open_ends = []  # phase ends nothing depends on yet
+    for phase in phases:
+        sections = phase['days'] or [(phase['first_day'], phase['name'])]
+        after = PHASE_PREDECESSOR.get(phase['name'])
+        predecessors = [phase_ends[after]] if after in phase_ends else open_ends
+        open_ends = [end for end in open_ends if end not in predecessors]
+        for index, (day, title) in enumerate(sections):
+            if phase['days']:
+                following = sections[index + 1][0] if index + 1 < len(sections) else phase['last_day'] + 1
+                duration = following - day
+            else:
+                duration = phase['last_day'] - phase['first_day'] + 1
+            resources = [CREW] + [resource for keyword, resource in TASK_RESOURCES
+                                  if keyword in title and extra[resource]]
+            task = Task(job, title, phase['name'], duration, resources, predecessors)
+            tasks.append(task)
+            predecessors = [task]
+        if permit_required and phase is not phases[-1]:
+            # The final inspection is part of the last day's work
+            for inspection in phase['inspections']:
+                task = Task(job, f"{inspection.title()} inspection", phase['name'], 1, (),
+                            predecessors)
+                tasks.append(task)
+                predecessors = [task]
+        phase_ends[phase['name']] = predecessors[0]
+        open_ends.append(predecessors[0])
+
+    if pre_construction_weeks and tasks:
+        # Permits, ordering and site prep happen in the weeks before day 0
+        days = pre_construction_weeks * WORKING_DAYS_PER_WEEK
+        pre = Task(job, 'Permits, material orders and site preparation', 'Pre-Construction', days)
+        pre.earliest_start = pre.latest_start = pre.start = -days
+        tasks.insert(0, pre)
+    return tasks
+
+
+def critical_path(tasks, release=0):
+    """Earliest and latest starts for tasks listed predecessors-first"""
+    for task in tasks:
+        if task.phase == 'Pre-Construction':
+            continue
+        task.earliest_start = max((p.earliest_start + p.duration for p in task.predecessors),
+                                  default=release)
+    finish = max(task.earliest_start + task.duration for task in tasks)
+    latest_finish = {}
+    for task in reversed(tasks):
+        if task.phase == 'Pre-Construction':
+            continue
+        task.latest_start = latest_finish.get(id(task), finish) - task.duration
+        for predecessor in task.predecessors:
+            latest_finish[id(predecessor)] = min(latest_finish.get(id(predecessor), finish),
+                                                 task.latest_start)
+    return finish
+
+
+def level_resources(tasks, resources, calendar=None):
+    """Start days for tasks so no resource is overbooked.
+
+    Eligible tasks (all predecessors placed) are taken by priority, then
+    least slack, and started on the first day that fits; precedence is
+    kept because a task only becomes eligible once its predecessors have
+    start days. A job keeps the same crew and equipment unit from task to
+    task when it is free. Tasks that already have a start are left alone,
+    so a schedule can be re-levelled piece by piece. With a calendar,
+    footing work is kept to its frost-free days.
+    """
+    waiting = {id(task): sum(1 for p in task.predecessors if p.start is None) for task in tasks}
+    successors = {}
+    for task in tasks:
+        for predecessor in task.predecessors:
+            successors.setdefault(id(predecessor), []).append(task)
+    remaining = {}  # (job, resource name) -> tasks still to place
+    for task in tasks:
+        if task.start is None:
+            for name in task.resources:
+                remaining[(task.job, name)] = remaining.get((task.job, name), 0) + 1
+    job_end = {}  # job -> latest finish, for how long a unit should stay free
+    for task in tasks:
+        job_end[task.job] = max(job_end.get(task.job, 0), task.latest_start + task.duration)
+    ready = [(task.priority, task.latest_start, task.earliest_start, order, task)
+             for order, task in enumerate(tasks) if task.start is None and waiting[id(task)] == 0]
+    heapq.heapify(ready)
+    order = len(tasks)
+    while ready:
+        task = heapq.heappop(ready)[-1]
+        day = max((p.finish for p in task.predecessors), default=task.earliest_start)
+        day = max(day, task.earliest_start)
+        prefer = {}
+        for predecessor in reversed(task.predecessors):
+            prefer.update(predecessor.units or _inherited_units(predecessor))
+        run = min(job_end[task.job] - task.latest_start, LOOKAHEAD_DAYS)
+        while True:
+            if task.frost_free and calendar is not None and not all(
+                    calendar.frost_free(index) for index in range(day, day + task.duration)):
+                day += 1
+                continue
+            units = {}
+            for name in task.resources:
+                unit = resources[name].free_unit(day, task.duration, prefer.get(name), task.job,
+                                                 run if remaining[(task.job, name)] > 1 else 0)
+                if unit is None:
+                    break
+                units[name] = unit
+            else:
+                break
+            day += 1
+        for name, unit in units.items():
+            resource = resources[name]
+            resource.book(day, task.duration, unit)
+            remaining[(task.job, name)] -= 1
+            if remaining[(task.job, name)]:
+                resource.held[unit] = task.job
+            else:
+                resource.let_go(task.job)
+        task.start = day
+        task.units = units
+        for successor in successors.get(id(task), ()):
+            waiting[id(successor)] -= 1
+            if waiting[id(successor)] == 0:
+                order += 1
+                heapq.heappush(ready, (successor.priority, successor.latest_start,
+                                       successor.earliest_start, order, successor))
+    return tasks
+
+
+def pre_construction_release(tasks, calendar, today=None):
+    """First working day a job's construction can start if its pre-construction begins today"""
+    lead = sum(task.duration for task in tasks if task.phase == 'Pre-Construction')
+    return calendar.index(today or date.today()) + lead
+
+
+def place_pre_construction(tasks, calendar, today=None):
+    """Put each job's pre-construction right before its first levelled construction task.
+
+    Jobs released no earlier than pre_construction_release() always leave
+    room for it; otherwise it is still kept from starting before today
+    (default: the real date).
+    """
+    earliest = calendar.index(today or date.today())
+    first = {}
+    for task in tasks:
+        if task.phase != 'Pre-Construction' and task.start is not None:
+            first[task.job] = min(first.get(task.job, task.start), task.start)
+    for task in tasks:
+        if task.phase == 'Pre-Construction' and task.job in first:
+            start = max(first[task.job] - task.duration, earliest)
+            task.earliest_start = task.latest_start = task.start = start
+    return tasks
+
+
+def _inherited_units(task):
+    # Inspection holds book nothing; look through them to the work before
+    for predecessor in task.predecessors:
+        if predecessor.units:
+            return predecessor.units
+    return {}
+
+
+def unschedule(tasks, resources):
+    """Release the bookings of placed tasks so they can be levelled again"""
+    for task in tasks:
+        if task.start is None:
+            continue
+        for name, unit in task.units.items():
+            resources[name].release(task.start, task.duration, unit)
+            resources[name].let_go(task.job)
+        task.start = None
+        task.units = {}
+
+
+def date_window(calendar, first=None, last=None):
+    """available() predicate for a resource booked between two dates"""
+    low = calendar.index(first) if first else None
+    high = calendar.index(last + timedelta(days=1)) - 1 if last else None
+    return lambda day: (low is None or day >= low) and (high is None or day <= high)
+
+
+def weekday_availability(calendar, weekdays):
+    """available() predicate for a subcontractor who only works some weekdays"""
+    weekdays = frozenset(weekdays)
+    return lambda day: calendar.date(day).weekday() in weekdays
+
+
+class Schedule:
+    """Levelled tasks of one or more jobs, with dates from a WorkCalendar"""
+
+    def __init__(self, tasks, calendar):
+        self.tasks = tasks
+        self.calendar = calendar
+
+    def jobs(self):
+        """{job: [tasks]} in scheduled order"""
+        result = {}
+        for task in sorted(self.tasks, key=lambda t: (t.start, t.finish)):
+            result.setdefault(task.job, []).append(task)
+        return result
+
+    def start_date(self, task):
+        return self.calendar.date(task.start)
+
+    def finish_date(self, task=None):
+        """Last working day of a task, or of the construction work in the schedule"""
+        if task is None:
+            return max(self.finish_date(t) for t in self.tasks if t.phase != 'Pre-Construction')
+        return self.calendar.date(task.finish - 1)
+
+    def working_days(self):
+        construction = [task for task in self.tasks if task.phase != 'Pre-Construction']
+        return max(t.finish for t in construction) - min(t.start for t in construction)
+
+    def resource_dates(self, resource):
+        """(first, last) dates a resource is booked, or None"""
+        booked = [task for task in self.tasks if resource in task.resources]
+        if not booked:
+            return None
+        return (self.calendar.date(min(t.start for t in booked)),
+                self.calendar.date(max(t.finish for t in booked) - 1))
+
+    def to_xml(self, indent='      '):
+        """<computed_schedule> contents for the construction template"""
+        construction = sorted((task for task in self.tasks if task.phase != 'Pre-Construction'),
+                              key=lambda t: (t.start, t.finish))
+        lines = [
+            f"<estimated_start>{self.start_date(construction[0])}</estimated_start>",
+            f"<estimated_completion>{self.finish_date()}</estimated_completion>",
+            f"<working_days>{self.working_days()}</working_days>",
+            f"<critical_path>{xml_text('; '.join(t.name for t in construction if t.critical))}</critical_path>",
+        ]
+        climate = self.calendar.climate
+        if climate is not None and not climate.known:
+            from climate import UNKNOWN_FROST_DEPTH_NOTE
+            first, last = self.start_date(construction[0]), self.finish_date()
+            lines += [
+                "<climate_zone>unknown</climate_zone>",
+                f'<design_frost_depth_inches verified="no">{climate.frost_depth_in:g}</design_frost_depth_inches>',
+                f"<climate_note>{UNKNOWN_FROST_DEPTH_NOTE}; frost season and rain days not "
+                f"planned for</climate_note>",
+                f"<weather_backup_days>{self.calendar.backup_days(first, last)}</weather_backup_days>",
+            ]
+        elif climate is not None:
+            first, last = self.start_date(construction[0]), self.finish_date()
+            span = (last - first).days + 1
+            rain = sum(climate.rain_chance(first + timedelta(days=offset)) for offset in range(span)) / span
+            lines += [
+                f"<climate_zone>{xml_text(climate.climate_zone)}</climate_zone>",
+                f"<design_frost_depth_inches>{climate.frost_depth_in:g}</design_frost_depth_inches>",
+                f"<ground_frost_on_start_date_inches>{climate.ground_frost(self.calendar.start):g}"
+                f"</ground_frost_on_start_date_inches>",
+                f"<rain_day_probability>{rain:.0%}</rain_day_probability>",
+                f"<weather_backup_days>{self.calendar.backup_days(first, last)}</weather_backup_days>",
+            ]
+        for resource, label in ((EXCAVATOR, 'excavator_rental'), (AUGER, 'auger_rental'),
+                                (CONCRETE_CREW, 'concrete_subcontractor')):
+            window = self.resource_dates(resource)
+            if window:
+                lines.append(f"<{label}>{window[0]} to {window[1]}</{label}>")
+        for task in sorted(self.tasks, key=lambda t: (t.start, t.finish)):
+            lines.append(
+                f'<task phase="{xml_text(task.phase)}" start="{self.start_date(task)}" '
+                f'finish="{self.finish_date(task)}" days="{task.duration}" slack="{task.slack}" '
+                f'critical="{"yes" if task.critical else "no"}">{xml_text(task.name)}</task>')
+        return ''.join(f"\n{indent}{line}" for line in lines)
+
+
+def fleet(calendar, crews=1, excavators=1, augers=1, concrete_crews=1,
+          excavator_window=None, concrete_weekdays=None):
+    """{resource name: Resource} for the crews and equipment shared by a schedule"""
+    return {
+        CREW: Resource(CREW, crews),
+        EXCAVATOR: Resource(EXCAVATOR, excavators, date_window(calendar, *excavator_window)
+                            if excavator_window else None),
+        AUGER: Resource(AUGER, augers),
+        CONCRETE_CREW: Resource(CONCRETE_CREW, concrete_crews,
+                                weekday_availability(calendar, concrete_weekdays)
+                                if concrete_weekdays else None),
+    }
+
+
+def schedule(start, has_excavator=False, concrete_subcontract=False, permit_required=False,
+             excavator_window=None, concrete_weekdays=None, calendar=None, today=None):
+    """Levelled Schedule for one deck starting on a date.
+
+    excavator_window is a (first date, last date) rental, and
+    concrete_weekdays the weekdays (0 = Monday) the concrete sub works.
+    Construction waits until pre-construction, started today, is done.
+    """
+    calendar = calendar or WorkCalendar(start)
+    tasks = build_tasks(None, has_excavator, concrete_subcontract, permit_required)
+    critical_path(tasks, max(pre_construction_release(tasks, calendar, today), 0))
+    level_resources(tasks, fleet(calendar, excavator_window=excavator_window,
+                                concrete_weekdays=concrete_weekdays), calendar)
+    place_pre_construction(tasks, calendar, today)
+    return Schedule(tasks, calendar)
+
+
+def schedule_season(jobs, start, crews=1, excavator_window=None, concrete_weekdays=None,
+                    calendar=None, today=None):
+    """Levelled Schedule for many decks sharing the crews, excavator and concrete sub.
+
+    jobs are project records (project_id, start_date, has_excavator,
+    concrete_subcontract, permit_required); no job starts before its own
+    start date, the season start, or the end of a pre-construction phase
+    started today. Raises ValueError for a start_date that isn't a date.
+    """
+    calendar = calendar or WorkCalendar(start)
+    tasks = []
+    for number, job in enumerate(jobs):
+        job_start = requested_start(job.get('start_date'))
+        release = max(calendar.index(job_start), 0) if job_start else 0
+        job_tasks = build_tasks(job.get('project_id') or number, bool(job.get('has_excavator')),
+                                bool(job.get('concrete_subcontract')),
+                                bool(job.get('permit_required')))
+        release = max(release, pre_construction_release(job_tasks, calendar, today))
+        critical_path(job_tasks, release)
+        for task in job_tasks:
+            task.priority = (release, number)
+        tasks.extend(job_tasks)
+    level_resources(tasks, fleet(calendar, crews, excavator_window=excavator_window,
+                                concrete_weekdays=concrete_weekdays), calendar)
+    place_pre_construction(tasks, calendar, today)
+    return Schedule(tasks, calendar)
+
+
+def timeline_xml(start_date, has_excavator, concrete_subcontract, permit_required, zip_code='',
+                 today=None):
+    """<computed_schedule> contents for a project's answers.
+
+    Working days follow the climate at the project's ZIP code. A blank
+    start date schedules from today; one that isn't a date raises
+    ValueError.
+    """
+    today = today or date.today()
+    start = requested_start(start_date) or today
+    return _timeline_xml(start, bool(has_excavator), bool(concrete_subcontract),
+                         bool(permit_required), zip_code, today)
+
+
+@lru_cache(maxsize=1024)
+def _timeline_xml(start, has_excavator, concrete_subcontract, permit_required, zip_code, today):
+    # Keyed on today as well: pre-construction is clamped to it
+    from climate import climate_for
+
+    calendar = WorkCalendar(start, climate=climate_for(zip_code))
+    return schedule(start, has_excavator, concrete_subcontract, permit_required,
+                    calendar=calendar, today=today).to_xml()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Crew Scheduler for Deckorator
+Schedule many decks at once against the crews, excavators, augers and
+concrete subcontractors they share.
+
+Every project's checklist tasks (see construction_schedule.py) go into one
+priority queue and are levelled together: each task is placed on the first
+working day on or after its project's start date on which its predecessors
+are done and a unit of every resource it needs is free, keeping a project
+on the same crew and equipment where possible. Projects are placed whole,
+one after another, by their record's 'priority' (lower first) and start
+date; later projects fill the days the earlier ones leave free.
+
+When a job slips, slip() re-levels only that job's unstarted tasks, plus
+the later-placed jobs that had its crews or equipment booked in the days
+it now needs; every other booking is kept, so a re-plan costs about as
+much as scheduling a handful of decks.
+
+Usage:
+    python3 crew_scheduler.py projects.jsonl --start 2026-04-01 --crews 4 --excavators 2
+    python3 crew_scheduler.py projects.jsonl --slip job-017=3 --output crew_schedule.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+from datetime import date
+
+from compliance import permit_required as project_permit_required
+from construction_schedule import (
+    AUGER, CONCRETE_CREW, CREW, EXCAVATOR, Schedule, WorkCalendar, build_tasks, critical_path,
+    fleet, level_resources, parse_start_date, place_pre_construction, pre_construction_release,
+    requested_start, unschedule,
+)
+from project_record import ProjectRecord
+
+PRE_CONSTRUCTION = 'Pre-Construction'
+
+SUMMARY_FIELDS = ['project_id', 'priority', 'requested_start', 'start', 'finish', 'working_days',
+                  'delay_days', 'crews', 'excavator', 'auger', 'concrete_crew', 'concrete_pour']
+
+
+class ProjectScheduler:
+    """Levelled schedule of many projects over one shared fleet"""
+
+    def __init__(self, start, crews=1, excavators=1, augers=1, concrete_crews=1,
+                 excavator_window=None, concrete_weekdays=None, calendar=None, zip_code=None,
+                 today=None):
+        """zip_code, if given, plans working days around that area's weather.
+
+        today (default: the real date) is the earliest day pre-construction can start.
+        """
+        if calendar is None:
+            climate = None
+            if zip_code:
+                from climate import climate_for
+                climate = climate_for(zip_code)
+            calendar = WorkCalendar(start, climate=climate)
+        self.calendar = calendar
+        self.today = today
+        self.resources = fleet(self.calendar, crews, excavators, augers, concrete_crews,
+                               excavator_window, concrete_weekdays)
+        self.jobs = {}       # project_id -> [tasks] in checklist order
+        self.releases = {}   # project_id -> requested first working day
+        self.priorities = {}
+
+    def add_project(self, record, permit_required=None):
+        """Add one project record (a dict or ProjectRecord); returns its project_id"""
+        raw = record if isinstance(record, dict) else {}
+        project = record if isinstance(record, ProjectRecord) else ProjectRecord.from_dict(record)
+        project_id = project.project_id or f"project-{len(self.jobs) + 1}"
+        if project_id in self.jobs:
+            raise ValueError(f"project '{project_id}' is already scheduled")
+        if permit_required is None:
+            permit_required = project_permit_required(project)
+        priority = int(raw.get('priority') or 0)
+
+        start = requested_start(project.start_date)
+        release = max(self.calendar.index(start), 0) if start else 0
+        tasks = build_tasks(project_id, project.has_excavator, project.concrete_subcontract,
+                            permit_required)
+        # Construction can't start before permits and orders begun today are done
+        critical_path(tasks, max(release, pre_construction_release(tasks, self.calendar, self.today)))
+        for task in tasks:
+            # Whole jobs in turn, so each runs start to finish on its crew
+            # instead of every job creeping along at once
+            task.priority = (priority, release, len(self.jobs))
+        self.jobs[project_id] = tasks
+        self.releases[project_id] = release
+        self.priorities[project_id] = priority
+        return project_id
+
+    def add_projects(self, records):
+        return [self.add_project(record) for record in records]
+
+    def plan(self):
+        """Level every task not placed yet; returns the Schedule"""
+        tasks = [task for tasks in self.jobs.values() for task in tasks]
+        level_resources(tasks, self.resources, self.calendar)
+        place_pre_construction(tasks, self.calendar, self.today)
+        return self.schedule()
+
+    def replan(self):
+        """Re-level every project from scratch, e.g. after adding a high-priority job"""
+        for tasks in self.jobs.values():
+            unschedule([task for task in tasks if task.phase != PRE_CONSTRUCTION], self.resources)
+        return self.plan()
+
+    def slip(self, project_id, days, as_of=None):
+        """Delay a job's unstarted tasks by some working days and re-level around it.
+
+        Tasks that start before as_of (a date; default: the job's first
+        construction day) have already happened and stay put. Jobs placed
+        after this one that had crews or equipment it needs booked in its
+        new window give way from that point and are re-levelled behind it;
+        all other bookings are kept. Returns [(task, old start date, new
+        start date)] for every task that moved.
+        """
+        tasks = self.jobs[project_id]
+        work = [task for task in tasks if task.phase != PRE_CONSTRUCTION]
+        first = self.calendar.index(as_of) if as_of else min(task.start for task in work)
+        remaining = [task for task in work if task.start >= first]
+        if not remaining:
+            return []
+        start = min(task.start for task in remaining)
+        release = start + days
+        window = range(release, release + max(task.finish for task in remaining) - start)
+        needed = {name for task in remaining for name in task.resources}
+        moving = list(remaining)
+        for other, other_tasks in self.jobs.items():
+            if other == project_id or other_tasks[0].priority < tasks[0].priority:
+                continue
+            clashes = [task.start for task in other_tasks
+                       if task.start in window and needed.intersection(task.resources)]
+            if clashes:
+                moving.extend(task for task in other_tasks if task.phase != PRE_CONSTRUCTION
+                              and task.start >= min(clashes))
+
+        before = {id(task): task.start for task in moving}
+        unschedule(moving, self.resources)
+        for task in remaining:
+            task.earliest_start = max(task.earliest_start, release)
+            task.latest_start += days
+        level_resources(moving, self.resources, self.calendar)
+        # Paperwork not started yet follows its job's new first day
+        today = self.calendar.index(self.today or date.today())
+        place_pre_construction([task for job in {task.job for task in moving}
+                                for task in self.jobs[job]
+                                if task.phase != PRE_CONSTRUCTION or task.start >= today],
+                               self.calendar, self.today)
+        return [(task, self.calendar.date(before[id(task)]), self.calendar.date(task.start))
+                for task in moving if task.start != before[id(task)]]
+
+    def schedule(self, project_ids=None):
+        """Schedule of every project (or some of them)"""
+        ids = self.jobs if project_ids is None else project_ids
+        return Schedule([task for project_id in ids for task in self.jobs[project_id]],
+                        self.calendar)
+
+    def summary(self):
+        """One row per project: dates, delay and the units assigned to it"""
+        rows = []
+        for project_id, tasks in self.jobs.items():
+            work = [task for task in tasks if task.phase != PRE_CONSTRUCTION]
+            if any(task.start is None for task in work):
+                continue
+            first = min(task.start for task in work)
+            last = max(task.finish for task in work)
+            units = {name: sorted({task.units[name] + 1 for task in work if name in task.units})
+                     for name in (CREW, EXCAVATOR, AUGER, CONCRETE_CREW)}
+            pours = [task for task in work if CONCRETE_CREW in task.units]
+            rows.append({
+                'project_id': project_id,
+                'priority': self.priorities[project_id],
+                'requested_start': self.calendar.date(self.releases[project_id]),
+                'start': self.calendar.date(first),
+                'finish': self.calendar.date(last - 1),
+                'working_days': last - first,
+                'delay_days': first - self.releases[project_id],
+                'crews': ' '.join(map(str, units[CREW])),
+                'excavator': ' '.join(map(str, units[EXCAVATOR])),
+                'auger': ' '.join(map(str, units[AUGER])),
+                'concrete_crew': ' '.join(map(str, units[CONCRETE_CREW])),
+                'concrete_pour': self.calendar.date(pours[0].start) if pours else '',
+            })
+        return rows
+
+    def write_csv(self, path):
+        """Write summary() to a CSV file (atomically)"""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.summary())
+        os.replace(temporary, path)
+
+
+def main():
+    from batch_planner import read_project_records
+
+    parser = argparse.ArgumentParser(description="Schedule many decks over shared crews and equipment")
+    parser.add_argument('input', help="Project records (.jsonl or .csv)")
+    parser.add_argument('--start', help="First day of the season, YYYY-MM-DD (default: today)")
+    parser.add_argument('--crews', type=int, default=1, help="Framing crews (default: 1)")
+    parser.add_argument('--excavators', type=int, default=1, help="Rented excavators (default: 1)")
+    parser.add_argument('--augers', type=int, default=1, help="Power augers (default: 1)")
+    parser.add_argument('--concrete-crews', type=int, default=1,
+                        help="Concrete subcontractor crews (default: 1)")
+    parser.add_argument('--zip', dest='zip_code',
+                        help="Plan around the weather at this ZIP code (see climate.py)")
+    parser.add_argument('--slip', action='append', default=[], metavar='PROJECT_ID=DAYS',
+                        help="Delay a project by working days after planning (repeatable)")
+    parser.add_argument('-o', '--output', default='crew_schedule.csv',
+                        help="Per-project schedule CSV (default: crew_schedule.csv)")
+    args = parser.parse_args()
+
+    start = parse_start_date(args.start) if args.start else date.today()
+    if start is None:
+        parser.error(f"--start must be a date, got {args.start!r}")
+    slips = []
+    for item in args.slip:
+        project_id, _, days = item.rpartition('=')
+        if not project_id or not days.lstrip('-').isdigit():
+            parser.error(f"--slip takes PROJECT_ID=DAYS, got {item!r}")
+        slips.append((project_id, int(days)))
+
+    scheduler = ProjectScheduler(start, args.crews, args.excavators, args.augers, args.concrete_crews,
+                                 zip_code=args.zip_code)
+    failed = 0
+    for record in read_project_records(args.input):
+        try:
+            scheduler.add_project(record)
+        except ValueError as e:
+            failed += 1
+            print(f"⚠️  Skipping project {record.get('project_id', '?')}: {e}")
+    schedule = scheduler.plan()
+    print(f"📅 {len(scheduler.jobs)} projects scheduled, last finish {schedule.finish_date()}")
+
+    for project_id, days in slips:
+        if project_id not in scheduler.jobs:
+            print(f"❌ Unknown project '{project_id}'")
+            sys.exit(1)
+        moved = scheduler.slip(project_id, days)
+        print(f"🔁 {project_id} slipped {days} day(s): {len(moved)} task(s) moved")
+
+    scheduler.write_csv(args.output)
+    print(f"📁 Schedule saved to {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Cut List Optimizer for Deckorator
+Pack the lumber pieces a deck needs into purchasable stock lengths.
+
+This is one-dimensional bin packing: each piece (joist, rim, ledger, beam
+ply, post, deck board segment) is cut from an 8, 10, 12 or 16 ft board
+with a saw kerf between cuts, and the goal is the cheapest set of boards.
+A best-fit-decreasing heuristic packs the pieces in milliseconds, then an
+optional improvement pass repacks the worst-filled few boards exactly,
+by branch and bound, until a time limit runs out. Lengths are handled in
+whole sixteenths of an inch so fits are exact.
+
+optimize_many() spreads the decks of a large batch over a process pool.
+material_takeoff orders lumber from these plans, so a project's budget CSV
+and its cut list always agree.
+
+Usage:
+    python3 cut_list.py projects.jsonl --output-dir cut_lists --workers 4
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, insort
+
+from material_takeoff import (DECK_BOARD_COVERAGE_IN, DEFAULT_JOIST_SPACING_IN, LUMBER_COST_PER_FT,
+                             STOCK_LENGTHS_FT, decking_cost_per_ft)
+from structural_calcs import JOIST_SIZES
+
+UNITS_PER_FT = 12 * 16
+KERF_UNITS = 2                 # 1/8 in saw kerf per cut
+DEFAULT_TIME_LIMIT = 0.25      # seconds of improvement per lumber size
+EXACT_REPACK_PIECES = 14       # largest group the exact pass will repack
+MAX_BOARD_FT = STOCK_LENGTHS_FT[-1]
+SPECIAL_ORDER_FT = (18, 20, 24)
+
+
+def to_units(feet):
+    return int(round(feet * UNITS_PER_FT))
+
+
+class CutPlan:
+    """Boards to buy for one lumber size and the pieces cut from each"""
+
+    __slots__ = ('size', 'boards', 'cost', 'piece_ft', 'lower_bound_cost', 'improved', 'spliced')
+
+    def __init__(self, size, boards, cost, piece_ft, lower_bound_cost, improved=False, spliced=0):
+        self.size = size
+        self.boards = boards          # [(stock_ft, [piece_ft, ...]), ...]
+        self.cost = cost
+        self.piece_ft = piece_ft
+        self.lower_bound_cost = lower_bound_cost
+        self.improved = improved
+        self.spliced = spliced        # pieces longer than any stock board, cut in parts
+
+    @property
+    def stock_ft(self):
+        return sum(stock for stock, _ in self.boards)
+
+    @property
+    def waste_ft(self):
+        return self.stock_ft - self.piece_ft
+
+    def board_counts(self):
+        """{stock length: boards to buy}"""
+        counts = {}
+        for stock, _ in self.boards:
+            counts[stock] = counts.get(stock, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def to_dict(self):
+        return {
+            'size': self.size,
+            'boards': self.board_counts(),
+            'cost': round(self.cost, 2),
+            'waste_ft': round(self.waste_ft, 2),
+            'waste_percent': round(100 * self.waste_ft / self.stock_ft, 1) if self.boards else 0.0,
+            'spliced': self.spliced,
+            'cut_list': [{'stock_ft': stock, 'pieces_ft': [round(piece, 3) for piece in pieces]}
+                         for stock, pieces in self.boards],
+        }
+
+
+class _Packer:
+    """Cost model for one lumber size: which stock holds a given used length"""
+
+    def __init__(self, stock_costs):
+        self.stocks = sorted((to_units(stock), cost, stock) for stock, cost in stock_costs.items())
+        self.capacities = [capacity for capacity, _, _ in self.stocks]
+        self.max_capacity = self.capacities[-1]
+        self.min_cost_per_unit = min(cost / capacity for capacity, cost, _ in self.stocks)
+
+    def needed(self, pieces):
+        """Length of board used by pieces, including a kerf between cuts"""
+        return sum(pieces) + KERF_UNITS * (len(pieces) - 1)
+
+    def cheapest(self, used):
+        """(cost, stock_ft) of the cheapest stock length holding used units"""
+        index = bisect_left(self.capacities, used)
+        return min((cost, stock) for _, cost, stock in self.stocks[index:])
+
+    def cost(self, bins):
+        return sum(self.cheapest(self.needed(pieces))[0] for pieces in bins)
+
+    def best_fit_decreasing(self, pieces):
+        """Each piece goes in the open board it fills most tightly"""
+        bins = []
+        free = []  # sorted (remaining units, bin index)
+        for piece in sorted(pieces, reverse=True):
+            position = bisect_left(free, (piece, -1))
+            if position < len(free):
+                remaining, index = free.pop(position)
+                remaining -= piece + KERF_UNITS
+                bins[index].append(piece)
+            else:
+                index = len(bins)
+                bins.append([piece])
+                remaining = self.max_capacity - piece - KERF_UNITS
+            if remaining > 0:
+                insort(free, (remaining, index))
+        return bins
+
+    def exact(self, pieces, deadline):
+        """Cheapest packing of a few pieces by branch and bound, or None on timeout"""
+        pieces = sorted(pieces, reverse=True)
+        best = [None, math.inf]
+        suffix = [0] * (len(pieces) + 1)
+        for index in range(len(pieces) - 1, -1, -1):
+            suffix[index] = suffix[index + 1] + pieces[index]
+        nodes = [0]
+
+        def search(index, bins, used):
+            nodes[0] += 1
+            if nodes[0] & 1023 == 0 and time.perf_counter() > deadline:
+                raise TimeoutError
+            cost = sum(self.cheapest(load)[0] for load in used)
+            if index == len(pieces):
+                if cost < best[1]:
+                    best[0], best[1] = [list(b) for b in bins], cost
+                return
+            if cost + suffix[index] * self.min_cost_per_unit * 0.999 >= best[1]:
+                return
+            piece = pieces[index]
+            seen = set()
+            for position, load in enumerate(used):
+                extra = load + KERF_UNITS + piece
+                if extra <= self.max_capacity and load not in seen:
+                    seen.add(load)  # boards with equal loads are interchangeable
+                    bins[position].append(piece)
+                    used[position] = extra
+                    search(index + 1, bins, used)
+                    used[position] = load
+                    bins[position].pop()
+            bins.append([piece])
+            used.append(piece)
+            search(index + 1, bins, used)
+            used.pop()
+            bins.pop()
+
+        try:
+            search(0, [], [])
+        except TimeoutError:
+            return None
+        return best[0]
+
+    def improve(self, bins, deadline, rng):
+        """Repack the worst-filled boards with a few others while time remains"""
+        improved = False
+        stale = 0
+        while len(bins) > 1 and stale < 4 * len(bins) and time.perf_counter() < deadline:
+            waste = sorted(range(len(bins)),
+                           key=lambda i: self.cheapest(self.needed(bins[i]))[1] * UNITS_PER_FT
+                           - self.needed(bins[i]), reverse=True)
+            # Anchor on the most wasteful boards in turn; partners come from the
+            # more wasteful half, where repacking is most likely to pay off
+            anchor = waste[stale % len(waste)]
+            group = {anchor}
+            candidates = [i for i in waste[:max(len(waste) // 2, 2)] if i != anchor]
+            rng.shuffle(candidates)
+            for index in candidates:
+                if sum(len(bins[i]) for i in group) + len(bins[index]) > EXACT_REPACK_PIECES:
+                    continue
+                group.add(index)
+                if len(group) == 3:
+                    break
+            if len(group) < 2:
+                break
+            current = [bins[i] for i in group]
+            repacked = self.exact([piece for b in current for piece in b], deadline)
+            if repacked is not None and self.cost(repacked) < self.cost(current) - 1e-9:
+                bins = [b for i, b in enumerate(bins) if i not in group] + repacked
+                improved = True
+                stale = 0
+            else:
+                stale += 1
+        return bins, improved
+
+
+def optimize_cuts(pieces_ft, size='', stock_costs=None, time_limit=DEFAULT_TIME_LIMIT, seed=0):
+    """CutPlan for pieces of one lumber size.
+
+    stock_costs maps stock length (ft) to board price; by default it is
+    the size's cost per foot times the length, and special-order 18-24 ft
+    boards are added only when a piece (a long joist) needs one. A piece
+    longer than every stock board is cut into equal parts that each fit
+    and counted in the plan's spliced, so the joint can be detailed rather
+    than the whole deck failing. time_limit bounds the exact improvement
+    pass (0 keeps the heuristic result).
+    """
+    pieces = [to_units(piece) for piece in pieces_ft]
+    if stock_costs is None:
+        per_ft = LUMBER_COST_PER_FT.get(size, LUMBER_COST_PER_FT['2x10'])
+        longest = max(pieces, default=0)
+        special = longest > to_units(MAX_BOARD_FT)
+        spliced = longest > to_units(SPECIAL_ORDER_FT[-1])
+        stock_costs = {stock: per_ft * stock for stock in STOCK_LENGTHS_FT + SPECIAL_ORDER_FT
+                       if stock in STOCK_LENGTHS_FT or spliced or (special and to_units(stock) >= longest)}
+    packer = _Packer(stock_costs)
+    too_long = [piece for piece in pieces if piece > packer.max_capacity]
+    if too_long:
+        pieces = [piece for piece in pieces if piece <= packer.max_capacity]
+        for piece in too_long:
+            parts = -(-piece // packer.max_capacity)
+            pieces.extend(piece // parts + (1 if part < piece % parts else 0) for part in range(parts))
+
+    bins = packer.best_fit_decreasing(pieces)
+    improved = False
+    if time_limit:
+        bins, improved = packer.improve(bins, time.perf_counter() + time_limit, random.Random(seed))
+
+    boards = []
+    for pieces_in_board in sorted(bins, key=lambda b: -packer.needed(b)):
+        _, stock = packer.cheapest(packer.needed(pieces_in_board))
+        boards.append((stock, [piece / UNITS_PER_FT for piece in sorted(pieces_in_board, reverse=True)]))
+    total_units = sum(pieces)
+    return CutPlan(size, boards, packer.cost(bins), total_units / UNITS_PER_FT,
+                   total_units * packer.min_cost_per_unit, improved, len(too_long))
+
+
+def split_run(run_ft, support_spacing_in=16, max_piece_ft=MAX_BOARD_FT):
+    """Split a run longer than the longest board into pieces that end on supports"""
+    if run_ft <= max_piece_ft:
+        return [run_ft]
+    step_ft = support_spacing_in / 12
+    longest = math.floor(max_piece_ft / step_ft) * step_ft
+    pieces = []
+    while run_ft > max_piece_ft:
+        pieces.append(longest)
+        run_ft -= longest
+    pieces.append(run_ft)
+    return pieces
+
+
+def deck_pieces(length, width, deck_height_inches, structure, attachment_method='ledger',
+                decking_material=''):
+    """{lumber size: [piece lengths in ft]} for a deck's framing and decking"""
+    attached = 'ledger' in (attachment_method or '').lower()
+    joist_size = structure.joist_size or JOIST_SIZES[-1]
+    spacing = structure.joist_spacing_in or DEFAULT_JOIST_SPACING_IN
+    joists_per_span = math.ceil(length * 12 / spacing) + 1
+    plies, beam_lumber = structure.beam_size.split('-')
+
+    pieces = {}
+    pieces.setdefault(joist_size, []).extend(
+        [structure.joist_span_ft] * (joists_per_span * structure.joist_span_count))
+    long_members = (1 if attached else 2) + (1 if attached else 0)  # rims and ledger
+    for _ in range(long_members):
+        pieces[joist_size].extend(split_run(length, spacing))
+    for _ in range(structure.beam_rows * int(plies)):
+        pieces.setdefault(beam_lumber, []).extend(split_run(length, structure.post_spacing_ft * 12))
+    pieces['6x6'] = [max(deck_height_inches / 12, 1)] * structure.footer_count
+
+    decking = f"decking ({decking_material})" if decking_material else 'decking'
+    courses = math.ceil(width * 12 / DECK_BOARD_COVERAGE_IN)
+    pieces[decking] = split_run(length, spacing) * courses
+    return pieces
+
+
+def _decking_stock_costs(size):
+    per_ft = decking_cost_per_ft(size)
+    return {stock: per_ft * stock for stock in STOCK_LENGTHS_FT}
+
+
+def optimize_deck(pieces_by_size, time_limit=DEFAULT_TIME_LIMIT):
+    """{lumber size: CutPlan} for the output of deck_pieces()"""
+    plans = {}
+    for size, pieces in pieces_by_size.items():
+        stock_costs = _decking_stock_costs(size) if size.startswith('decking') else None
+        plans[size] = optimize_cuts(pieces, size, stock_costs, time_limit)
+    return plans
+
+
+def _optimize_job(job):
+    key, pieces_by_size, time_limit = job
+    return key, {size: plan.to_dict()
+                 for size, plan in optimize_deck(pieces_by_size, time_limit).items()}
+
+
+def optimize_many(jobs, workers=None, time_limit=DEFAULT_TIME_LIMIT, chunksize=4):
+    """Yield (key, {size: plan dict}) for (key, pieces_by_size) jobs on a process pool"""
+    from multiprocessing import Pool
+
+    tasks = ((key, pieces_by_size, time_limit) for key, pieces_by_size in jobs)
+    if workers == 1:
+        yield from map(_optimize_job, tasks)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_optimize_job, tasks, chunksize)
+
+
+def _write_atomic(path, write):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8', newline='') as f:
+        write(f)
+    os.replace(temporary, path)
+
+
+def main():
+    from batch_planner import budget_filename, read_project_records
+    from climate import design_frost_depth
+    from material_takeoff import material_takeoff, takeoff_total, write_budget_csv
+    from project_record import ProjectRecord
+    from structural_calcs import calculate_structure
+
+    parser = argparse.ArgumentParser(description="Optimized cut lists and lumber orders for deck projects")
+    parser.add_argument('input', help="Project records (.jsonl or .csv)")
+    parser.add_argument('--output-dir', default='cut_lists',
+                        help="Where cut_list_<id>.json and budget_<id>.csv go (default: cut_lists)")
+    parser.add_argument('--time-limit', type=float, default=DEFAULT_TIME_LIMIT,
+                        help=f"Seconds per lumber size to improve each packing (default: {DEFAULT_TIME_LIMIT})")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    projects = {}
+    failed = 0
+    for number, raw in enumerate(read_project_records(args.input), 1):
+        try:
+            record = ProjectRecord.from_dict(raw)
+        except ValueError as e:
+            failed += 1
+            print(f"⚠️  Skipping project {raw.get('project_id', '?')}: {e}")
+            continue
+        structure = calculate_structure(
+            record.exact_length, record.exact_width, record.joist_material, record.decking_material,
+            record.attachment_method, record.intended_use, record.soil_type,
+            design_frost_depth(record.zip_code))
+        projects[record.project_id or f"project-{number}"] = (record, structure)
+
+    jobs = ((project_id, deck_pieces(record.exact_length, record.exact_width, record.deck_height_inches,
+                                     structure, record.attachment_method, record.decking_material))
+            for project_id, (record, structure) in projects.items())
+    total = 0.0
+    for project_id, plans in optimize_many(jobs, args.workers, args.time_limit):
+        record, structure = projects[project_id]
+        rows = material_takeoff(record.exact_length, record.exact_width, record.deck_height_inches,
+                                record.joist_material, record.decking_material, record.attachment_method,
+                                record.intended_use, record.soil_type, structure, cut_plans=plans)
+        total += takeoff_total(rows)
+        name = budget_filename(project_id)
+        _write_atomic(os.path.join(args.output_dir, name), lambda f: write_budget_csv(rows, f))
+        _write_atomic(os.path.join(args.output_dir, 'cut_list_' + name[len('budget_'):-4] + '.json'),
+                      lambda f: json.dump({'project_id': project_id, 'plans': plans}, f, indent=2))
+
+    print(f"🪚 {len(projects)} cut lists written to {args.output_dir}, ${total:,.2f} estimated")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
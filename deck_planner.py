@@ -7,34 +7,35 @@ Generates XML templates that produce actual construction specifications, not jus
 import json
 import os
 import sys
-import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
 
+from instrumentation import enable as enable_metrics, instrument, profile_capture
+from project_record import ProjectRecord, format_measurement, parse_measurement
+from session_store import SessionStore, TEMPLATE_FIELDS, parse_answer, parse_template_responses
+from supplier_index import get_supplier_index
+from template_catalog import TemplateCatalog, checksum
+from template_engine import load_template
+from xml_writer import Markup, xml_text
+
+# Answers that can be changed when resuming from a previous template
+TEMPLATE_ANSWER_KEYS = frozenset(key for key, _ in TEMPLATE_FIELDS.values())
+
 class ConstructionDeckPlanner:
     def __init__(self):
         self.user_responses = {}
         self.suppliers_db = {}
         self.existing_template = None
         self.template_version = "3.0"  # Construction-focused version
+        self._structure_cache = None  # (inputs, StructuralResult) of the last calculation
+        self._grading_cache = None    # (inputs, GradingResult) of the last grading
+        self._cut_list_cache = None   # (inputs, {size: CutPlan}) of the last cut list
         self.load_suppliers_database()
         
     def load_suppliers_database(self):
-        """Load supplier database or create default"""
-        try:
-            with open('suppliers_database.json', 'r') as f:
-                self.suppliers_db = json.load(f)
-        except FileNotFoundError:
-            self.suppliers_db = {
-                "22032": {
-                    "area": "Burke/Fairfax, Virginia",
-                    "suppliers": ["Home Depot Burke", "Lowe's Burke", "Superior Building Supply"]
-                },
-                "default": {
-                    "area": "Your local area",
-                    "suppliers": ["Home Depot", "Lowe's", "Local lumber yards"]
-                }
-            }
+        """Attach the shared supplier index (parsed once per process)"""
+        self.supplier_index = get_supplier_index('suppliers_database.json')
+        self.suppliers_db = self.supplier_index.database
     
     def welcome_message(self):
         """Display welcome and instructions"""
@@ -79,12 +80,14 @@ class ConstructionDeckPlanner:
         self.user_responses['deck_height_inches'] = height
         
         # House attachment details for ledger calculations
-        attachment = input("How does deck attach to house? (ledger/freestanding): ").lower()
+        attachment = input("How does deck attach to house? (ledger/freestanding, default ledger): ").lower()
+        attachment = attachment.strip() or 'ledger'
         self.user_responses['attachment_method'] = attachment
         
         if 'ledger' in attachment:
             # Get ledger attachment details
-            self.user_responses['ledger_height'] = input("Height of ledger attachment point from ground (inches): ")
+            self.user_responses['ledger_height'] = self.ask_measurement(
+                "Height of ledger attachment point from ground (inches): ", 'ledger_height')
             self.user_responses['house_construction'] = input("House construction (wood frame/brick/concrete): ")
     
     def collect_soil_and_drainage(self):
@@ -117,11 +120,21 @@ class ConstructionDeckPlanner:
         self.user_responses['drainage_issues'] = drainage_issues
         
         # Proximity to foundation for drainage requirements
-        foundation_distance = input("Distance from house foundation (feet): ")
-        self.user_responses['foundation_distance'] = foundation_distance
+        self.user_responses['foundation_distance'] = self.ask_measurement(
+            "Distance from house foundation (feet): ", 'foundation_distance')
+
+    def ask_measurement(self, prompt, key):
+        """Prompt until the answer is blank or has a number, kept as a batch record keeps it ("about 5 feet" -> "5")"""
+        while True:
+            try:
+                return format_measurement(parse_measurement(input(prompt), key))
+            except ValueError:
+                print("❌ Please enter a number (e.g., 5), or leave it blank if unknown")
     
     def collect_construction_parameters(self):
         """Collect parameters for construction calculations"""
+        from construction_schedule import requested_start
+
         print("\n🔨 CONSTRUCTION PARAMETERS")
         print("-" * 30)
         
@@ -140,7 +153,13 @@ class ConstructionDeckPlanner:
         self.user_responses['zip_code'] = input("Zip code (for local codes): ")
         
         # Timeline constraints for Gantt chart
-        start_date = input("Planned start date (YYYY-MM-DD): ")
+        while True:
+            start_date = input("Planned start date (YYYY-MM-DD, blank for today): ")
+            try:
+                requested_start(start_date)
+                break
+            except ValueError as e:
+                print(f"⚠️  {e}")
         self.user_responses['start_date'] = start_date
         
         # Equipment available
@@ -161,182 +180,221 @@ class ConstructionDeckPlanner:
         else:
             self.user_responses['photo_album_url'] = ""
             self.user_responses['photo_album_description'] = "Individual photos will be uploaded"
-    
+
+    def load_project_record(self, record):
+        """Populate user_responses from a project record instead of prompting.
+
+        The record is parsed and validated by ProjectRecord, which applies
+        the same derivations as the collect_* prompts (total area, slope
+        percentage, yes/no flags, measurements reduced to their number,
+        'ledger' for a blank attachment method) so batch and interactive
+        runs produce identical templates. Raises ValueError for missing or
+        non-numeric measurements.
+        """
+        if not isinstance(record, ProjectRecord):
+            record = ProjectRecord.from_dict(record)
+        self.user_responses = record.to_responses()
+        return self.user_responses
+
+    def project_record(self):
+        """The current answers as a compact, validated ProjectRecord"""
+        return ProjectRecord.from_dict(self.user_responses)
+
+    def resume_from_template(self, path):
+        """Load user_responses from a previously generated template"""
+        responses = parse_template_responses(path)
+        entry = TemplateCatalog().entry(path)
+        if entry and entry['project_id']:
+            responses['project_id'] = entry['project_id']
+        self.user_responses = responses
+        self.existing_template = str(path)
+        return responses
+
+    def update_responses(self, changes):
+        """Apply changed answers and refresh the fields derived from them.
+
+        Returns the set of keys whose values actually changed.
+        """
+        responses = self.user_responses
+        changed = {key for key, value in changes.items() if responses.get(key) != value}
+        responses.update(changes)
+        if changed & {'exact_length', 'exact_width'}:
+            responses['total_area'] = responses['exact_length'] * responses['exact_width']
+        if changed & {'exact_length', 'slope_direction', 'slope_amount_inches'}:
+            if responses.get('slope_direction', 'level').lower() == 'level':
+                responses.pop('slope_amount_inches', None)
+                responses.pop('slope_percentage', None)
+            else:
+                slope_inches = responses.get('slope_amount_inches', 0)
+                responses['slope_percentage'] = (slope_inches / (responses['exact_length'] * 12)) * 100
+        return changed
+
+    def template_values(self):
+        """Slot values for the construction specification template"""
+        from climate import frost_depth_basis
+
+        responses = self.user_responses
+        local_suppliers = self.supplier_index.lookup(responses['zip_code'])
+        structure = self.calculate_structure()
+        compliance = self.check_compliance(structure)
+        permit_required = compliance.permit_required
+
+        values = dict(responses)
+        values.update(
+            template_version=self.template_version,
+            generated_date=datetime.now().strftime('%Y-%m-%d'),
+            slope_amount_inches=responses.get('slope_amount_inches', 0),
+            slope_percentage=responses.get('slope_percentage', 0),
+            ledger_height=responses.get('ledger_height', 'N/A'),
+            house_construction=responses.get('house_construction', 'N/A'),
+            # Calculate derived values
+            joist_spacing=self.calculate_joist_spacing(structure),
+            footer_layout=self.calculate_footer_layout(structure),
+            joist_span_feet=structure.joist_span_ft,
+            beam_size=structure.beam_size,
+            post_spacing_feet=structure.post_spacing_ft,
+            footer_count=structure.footer_count,
+            footer_diameter_inches=structure.footer_diameter_in,
+            footer_depth_inches=structure.footer_depth_in,
+            frost_depth_basis=frost_depth_basis(responses.get('zip_code')),
+            concrete_cubic_feet=structure.concrete_cuft_total,
+            concrete_bags=structure.concrete_bags,
+            code_authority=compliance.rules.jurisdiction,
+            code_reference=compliance.rules.code_reference,
+            permit_required=permit_required,
+            compliance_review=Markup(compliance.to_xml()),
+            subcontracted_work="Concrete pours" if responses['concrete_subcontract'] else "None",
+            grading_analysis=self.grading_xml(),
+            construction_schedule=self.construction_schedule_xml(permit_required),
+            suppliers_for_pricing=local_suppliers.get('suppliers', ['Local suppliers']),
+            material_takeoff=self.material_takeoff_xml(structure),
+        )
+        return values
+
     def generate_construction_xml(self):
         """Generate XML focused on construction specifications"""
-        local_suppliers = self.suppliers_db.get(self.user_responses['zip_code'], self.suppliers_db['default'])
-        
-        # Calculate derived values
-        joist_spacing = self.calculate_joist_spacing()
-        footer_layout = self.calculate_footer_layout()
-        
-        xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<construction_specification_request>
-  <project_overview>
-    <description>Generate actual construction specifications and working drawings</description>
-    <template_version>{self.template_version}</template_version>
-    <generated_date>{datetime.now().strftime('%Y-%m-%d')}</generated_date>
-    <focus>Construction documentation, not input summary</focus>
-  </project_overview>
-
-  <site_specifications>
-    <dimensions>
-      <length_feet>{self.user_responses['exact_length']}</length_feet>
-      <width_feet>{self.user_responses['exact_width']}</width_feet>
-      <total_square_feet>{self.user_responses['total_area']}</total_square_feet>
-      <height_above_ground_inches>{self.user_responses['deck_height_inches']}</height_above_ground_inches>
-    </dimensions>
-    
-    <site_conditions>
-      <slope_direction>{self.user_responses['slope_direction']}</slope_direction>
-      <slope_amount_inches>{self.user_responses.get('slope_amount_inches', 0)}</slope_amount_inches>
-      <slope_percentage>{self.user_responses.get('slope_percentage', 0):.2f}%</slope_percentage>
-      <soil_type>{self.user_responses['soil_type']}</soil_type>
-      <drainage_issues>{self.user_responses['drainage_issues']}</drainage_issues>
-      <distance_from_foundation_feet>{self.user_responses['foundation_distance']}</distance_from_foundation_feet>
-    </site_conditions>
-
-    <attachment_details>
-      <method>{self.user_responses['attachment_method']}</method>
-      <ledger_height_inches>{self.user_responses.get('ledger_height', 'N/A')}</ledger_height_inches>
-      <house_construction>{self.user_responses.get('house_construction', 'N/A')}</house_construction>
-    </attachment_details>
-  </site_specifications>
-
-  <structural_requirements>
-    <intended_load>{self.user_responses['intended_use']}</intended_load>
-    <joist_material>{self.user_responses['joist_material']}</joist_material>
-    <decking_material>{self.user_responses['decking_material']}</decking_material>
-    <calculated_joist_spacing>{joist_spacing}</calculated_joist_spacing>
-    <footer_layout>{footer_layout}</footer_layout>
-  </structural_requirements>
-
-  <photo_resources>
-    <album_url>{self.user_responses['photo_album_url']}</album_url>
-    <album_description>{self.user_responses['photo_album_description']}</album_description>
-  </photo_resources>
-
-  <local_compliance>
-    <jurisdiction>Building department for {self.user_responses['zip_code']}</jurisdiction>
-    <code_reference>https://www.fairfaxcounty.gov/landdevelopment/sites/landdevelopment/files/assets/documents/pdf/publications/deck-details.pdf</code_reference>
-    <permit_required>{self.user_responses['deck_height_inches'] > 30}</permit_required>
-  </local_compliance>
-
-  <construction_timeline>
-    <start_date>{self.user_responses['start_date']}</start_date>
-    <equipment_rental_needed>{self.user_responses['has_excavator']}</equipment_rental_needed>
-    <subcontracted_work>{"Concrete pours" if self.user_responses['concrete_subcontract'] else "None"}</subcontracted_work>
-  </construction_timeline>
-
-  <required_deliverables>
-    <!-- CRITICAL: These are SPECIFICATIONS, not input summaries -->
-    <grading_analysis>
-      <requirement>Analyze photos and site conditions to specify exact grading requirements</requirement>
-      <deliverable>Specific grading plan with cut/fill requirements, drainage solutions, and slope corrections needed for proper water runoff</deliverable>
-      <focus>Address drainage from east side of house and overall site water management</focus>
-    </grading_analysis>
-    
-    <foundation_plan>
-      <requirement>Calculate exact footer specifications based on dimensions, soil, and loads</requirement>
-      <deliverable>
-        - Exact number of footers required
-        - Precise hole locations with measurements from reference points  
-        - Hole depths based on frost line and soil conditions
-        - Footer spacing calculations per IRC and local codes
-        - Concrete specifications and quantities per hole
-      </deliverable>
-      <calculations_needed>Use actual dimensions: {self.user_responses['exact_length']}' x {self.user_responses['exact_width']}'</calculations_needed>
-    </foundation_plan>
-    
-    <framing_specifications>
-      <requirement>Design framing system that complies with local building codes</requirement>
-      <deliverable>
-        - Detailed framing sketch with measurements
-        - Joist spacing calculations for {self.user_responses['joist_material']} and {self.user_responses['decking_material']}
-        - Beam sizing and span calculations
-        - Connection details and hardware specifications
-        - Code compliance verification against Fairfax County requirements
-      </deliverable>
-      <reference_codes>Use linked PDF: deck-details.pdf for compliance verification</reference_codes>
-    </framing_specifications>
-    
-    <material_specifications>
-      <requirement>Generate competitive bidding material list with exact quantities</requirement>
-      <deliverable>
-        - Itemized list with quantities, sizes, and specifications
-        - Format suitable for sending to multiple suppliers
-        - Include lumber, hardware, concrete, and finishing materials  
-        - Separate sections for: Structural, Decking, Railings, Hardware
-        - 10% waste factor included in calculations
-      </deliverable>
-      <suppliers_for_pricing>{local_suppliers.get('suppliers', ['Local suppliers'])}</suppliers_for_pricing>
-    </material_specifications>
-    
-    <project_timeline>
-      <requirement>Create realistic timeline with resource optimization</requirement>
-      <deliverable>
-        - Phase-by-phase timeline starting from {self.user_responses['start_date']}
-        - Gantt chart format showing task dependencies
-        - Equipment rental scheduling (excavator timing)
-        - Subcontractor coordination (concrete pours)
-        - Weather considerations and backup dates
-        - Resource utilization optimization
-      </deliverable>
-      <constraints>Excavator rental available, concrete subcontracted</constraints>
-    </project_timeline>
-  </required_deliverables>
-
-  <ai_instructions>
-    <primary_directive>GENERATE CONSTRUCTION SPECIFICATIONS, NOT INPUT SUMMARIES</primary_directive>
-    <analysis_requirements>
-      <photos>Analyze provided photos to determine actual site conditions, existing grades, drainage patterns</photos>
-      <calculations>Perform engineering calculations based on provided dimensions and conditions</calculations>
-      <code_compliance>Reference Fairfax County deck details PDF for specific compliance requirements</code_compliance>
-      <practical_construction>Focus on buildable specifications that a contractor could execute</practical_construction>
-    </analysis_requirements>
-    <output_format>
-      <structure>Organize as: 1) Grading Plan, 2) Foundation Specifications, 3) Framing Plans, 4) Material Lists, 5) Construction Timeline</structure>
-      <detail_level>Specific measurements, quantities, and step-by-step procedures</detail_level>
-      <professional_quality>Construction-ready documentation suitable for permits and building</professional_quality>
-    </output_format>
-  </ai_instructions>
-
-  <submission_notes>
-    <critical>This template is designed to generate ACTUAL CONSTRUCTION SPECIFICATIONS</critical>
-    <photos>Upload photos showing: current site conditions, ground slope, house attachment point, drainage patterns</photos>
-    <expectations>You should receive: detailed construction plans, not a summary of what you told the AI</expectations>
-  </submission_notes>
-</construction_specification_request>'''
-        
-        return xml_content
+        return load_template('construction_spec').render(self.template_values())
+
+    def write_construction_xml(self, stream):
+        """Stream the construction specification XML to a text file or socket"""
+        load_template('construction_spec').render_to(stream, self.template_values())
     
-    def calculate_joist_spacing(self):
-        """Calculate appropriate joist spacing based on materials and span"""
-        # This is a simplified calculation - the AI will do the detailed work
-        material = self.user_responses.get('joist_material', '').lower()
-        span = self.user_responses['exact_width']  # Assuming joists span the width
-        
-        if '2x8' in material and span <= 12:
-            return "16 inches on center"
-        elif '2x10' in material and span <= 16:
-            return "16 inches on center"
-        elif '2x12' in material:
-            return "16 inches on center"
-        else:
+    def calculate_structure(self):
+        """Numeric joist, beam and footer layout for the current answers.
+
+        The result is reused until one of its inputs changes.
+        """
+        from climate import design_frost_depth
+        from structural_calcs import calculate_structure
+
+        responses = self.user_responses
+        inputs = (responses['exact_length'], responses['exact_width'],
+                  responses.get('joist_material', ''), responses.get('decking_material', ''),
+                  responses.get('attachment_method', ''), responses.get('intended_use', ''),
+                  responses.get('soil_type', ''), design_frost_depth(responses.get('zip_code')))
+        if self._structure_cache is None or self._structure_cache[0] != inputs:
+            self._structure_cache = (inputs, calculate_structure(*inputs))
+        return self._structure_cache[1]
+
+    def calculate_grading(self, spot_elevations=None):
+        """Cut/fill, runoff and foundation setback figures for the site (needs NumPy).
+
+        Like calculate_structure(), reused until the site answers change.
+        """
+        from grading import grading_for_responses
+
+        responses = self.user_responses
+        inputs = (responses['exact_length'], responses['exact_width'],
+                  responses.get('slope_direction', 'level'), responses.get('slope_amount_inches', 0),
+                  responses.get('foundation_distance'))
+        if spot_elevations is not None or self._grading_cache is None or self._grading_cache[0] != inputs:
+            result = grading_for_responses(responses, spot_elevations)
+            if spot_elevations is not None:
+                return result
+            self._grading_cache = (inputs, result)
+        return self._grading_cache[1]
+
+    def grading_xml(self):
+        """Computed grading as elements for the template"""
+        try:
+            return Markup(self.calculate_grading().to_xml())
+        except RuntimeError as e:
+            return Markup(f"\n      <note>{xml_text(str(e))}</note>")
+
+    def material_takeoff(self, structure=None, cut_time_limit=0):
+        """Bid-ready material rows in the budget_tracking_template.csv schema.
+
+        Lumber is ordered from calculate_cut_list(), so the order matches
+        the cutting plan.
+        """
+        from material_takeoff import takeoff_for_responses
+
+        structure = structure or self.calculate_structure()
+        return takeoff_for_responses(self.user_responses, structure,
+                                     self.calculate_cut_list(structure, cut_time_limit))
+
+    def material_takeoff_xml(self, structure=None):
+        """Takeoff quantities as <item> elements for the template"""
+        # Categories and quantities are generated, so only descriptions need escaping
+        return Markup(''.join(
+            f'\n        <item category="{row["Subcategory"]}" quantity="{row["Quantity"]}">'
+            f'{xml_text(row["Item_Description"])}</item>'
+            for row in self.material_takeoff(structure)))
+
+    def construction_schedule_xml(self, permit_required=None):
+        """Levelled, weather-aware phase schedule as elements for the template"""
+        from compliance import permit_required as project_permit_required
+        from construction_schedule import timeline_xml
+
+        responses = self.user_responses
+        if permit_required is None:
+            permit_required = project_permit_required(self.project_record())
+        return Markup(timeline_xml(str(responses.get('start_date', '')),
+                                   bool(responses.get('has_excavator')),
+                                   bool(responses.get('concrete_subcontract')), permit_required,
+                                   str(responses.get('zip_code', ''))))
+
+    def check_compliance(self, structure=None):
+        """ComplianceReport of the answers against the local code rules"""
+        from compliance import check_project
+
+        return check_project(self.project_record(), structure or self.calculate_structure())
+
+    def calculate_cut_list(self, structure=None, time_limit=0):
+        """{lumber size: CutPlan} packing the deck's pieces into stock lengths.
+
+        time_limit is seconds per lumber size spent improving the quick
+        best-fit packing (cut_list.DEFAULT_TIME_LIMIT for a final order).
+        Like calculate_structure(), reused until the structure or answers change.
+        """
+        structure = structure or self.calculate_structure()
+        responses = self.user_responses
+        inputs = (structure, responses['exact_length'], responses['exact_width'],
+                  responses['deck_height_inches'], responses.get('attachment_method', ''),
+                  responses.get('decking_material', ''), time_limit)
+        if self._cut_list_cache is None or self._cut_list_cache[0] != inputs:
+            from cut_list import deck_pieces, optimize_deck
+
+            pieces = deck_pieces(*inputs[1:4], structure,
+                                 attachment_method=inputs[4], decking_material=inputs[5])
+            self._cut_list_cache = (inputs, optimize_deck(pieces, time_limit))
+        return self._cut_list_cache[1]
+
+    def calculate_joist_spacing(self, structure=None):
+        """Describe joist spacing based on materials and span"""
+        structure = structure or self.calculate_structure()
+        if structure.requires_engineering:
             return "Requires engineering calculation based on span and load"
+        return f"{structure.joist_spacing_in} inches on center"
     
-    def calculate_footer_layout(self):
-        """Provide basic footer layout info for AI to expand"""
-        length = self.user_responses['exact_length']
-        width = self.user_responses['exact_width']
-        
-        # Basic layout - AI will provide exact specifications
-        if length <= 12 and width <= 12:
-            return "4-footer minimum layout, corner and mid-span positions"
-        elif length <= 16 and width <= 16:
-            return "6-footer layout with intermediate supports"
-        else:
-            return "8+ footer layout requiring engineering calculations"
+    def calculate_footer_layout(self, structure=None):
+        """Describe the footer layout for the AI to expand"""
+        structure = structure or self.calculate_structure()
+        layout = (f"{structure.footer_count}-footer layout: {structure.beam_rows} beam row(s) of "
+                  f"{structure.posts_per_row} posts at {structure.post_spacing_ft:.1f} ft on center")
+        if structure.requires_engineering:
+            layout += ", requiring engineering calculations"
+        return layout
     
     def save_template(self, xml_content):
         """Save the generated template to file"""
@@ -346,6 +404,13 @@ class ConstructionDeckPlanner:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(xml_content)
         
+        TemplateCatalog().record(
+            filename, checksum(xml_content),
+            project_id=self.user_responses.get('project_id'),
+            zip_code=self.user_responses.get('zip_code'),
+            version=self.template_version)
+        SessionStore().save(self.user_responses.get('project_id', 'default'), self.user_responses)
+        
         return filename
     
     def display_next_steps(self, filename):
@@ -375,8 +440,28 @@ class ConstructionDeckPlanner:
         print("4. 🏗️ Build your deck with professional documentation!")
         print("=" * 55)
     
-    def run(self):
-        """Main program flow"""
+    def revise_responses(self):
+        """Show the resumed answers and prompt for the ones to change"""
+        print("\n📝 CURRENT ANSWERS")
+        print("-" * 20)
+        for key, value in self.user_responses.items():
+            print(f"  {key}: {value}")
+        
+        changes = {}
+        while True:
+            key = input("\nField to change (Enter when done): ").strip()
+            if not key:
+                return changes
+            if key not in TEMPLATE_ANSWER_KEYS:
+                print(f"❌ Unknown field. Choose from: {', '.join(sorted(TEMPLATE_ANSWER_KEYS))}")
+                continue
+            try:
+                changes[key] = parse_answer(key, input(f"New {key}: "))
+            except ValueError as e:
+                print(f"❌ {e}")
+    
+    def run(self, resume=None, changes=None):
+        """Main program flow; with resume, start from a previous template's answers"""
         try:
             self.welcome_message()
             
@@ -384,11 +469,17 @@ class ConstructionDeckPlanner:
             print("You will NOT get a summary of your inputs.")
             print("You WILL get actual building plans, material lists, and timelines.\n")
             
-            # Collect construction-focused data
-            self.collect_precise_measurements()
-            self.collect_soil_and_drainage()
-            self.collect_construction_parameters()
-            self.collect_photo_resources()
+            if resume:
+                self.resume_from_template(resume)
+                print(f"📂 Resuming from {resume}")
+                changed = self.update_responses(self.revise_responses() if changes is None else changes)
+                print(f"🔁 {len(changed)} answer(s) changed: {', '.join(sorted(changed)) or 'none'}")
+            else:
+                # Collect construction-focused data
+                self.collect_precise_measurements()
+                self.collect_soil_and_drainage()
+                self.collect_construction_parameters()
+                self.collect_photo_resources()
             
             # Generate construction-focused template
             print("\n🔧 GENERATING CONSTRUCTION SPECIFICATION REQUEST...")
@@ -406,10 +497,65 @@ class ConstructionDeckPlanner:
             print("Please try running the script again.")
             sys.exit(1)
 
+# Pipeline stages timed when metrics are enabled (--metrics)
+instrument(ConstructionDeckPlanner, {
+    'load_suppliers_database': 'supplier_loading',
+    'resume_from_template': 'resume',
+    'load_project_record': 'record_loading',
+    'calculate_structure': 'calculations',
+    'calculate_grading': 'grading',
+    'check_compliance': 'compliance',
+    'material_takeoff': 'material_takeoff',
+    'generate_construction_xml': 'xml_rendering',
+    'write_construction_xml': 'xml_rendering',
+    'save_template': 'file_write',
+})
+
 def main():
     """Entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate a construction specification request")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='TEMPLATE',
+                        help="Start from a previous template's answers (default: the latest one)")
+    parser.add_argument('--set', action='append', default=None, metavar='FIELD=VALUE',
+                        help="With --resume, change a field without prompting (repeatable)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Record stage timings to FILE (.prom for Prometheus text, else JSON lines)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="Profile the run with cProfile and tracemalloc into FILE.prof/.txt")
+    args = parser.parse_args()
+    if args.metrics:
+        enable_metrics(args.metrics)
+    
+    resume = args.resume
+    if resume == 'latest':
+        catalog = TemplateCatalog()
+        resume = catalog.latest()
+        if resume is None and catalog.import_directory():
+            resume = catalog.latest()
+        if resume is None:
+            print("❌ No previous template found to resume from.")
+            sys.exit(1)
+    
+    changes = None
+    if args.set:
+        changes = {}
+        for assignment in args.set:
+            key, _, value = assignment.partition('=')
+            if key not in TEMPLATE_ANSWER_KEYS:
+                parser.error(f"unknown field '{key}'")
+            try:
+                changes[key] = parse_answer(key, value)
+            except ValueError as e:
+                parser.error(str(e))
+    
     planner = ConstructionDeckPlanner()
-    planner.run()
+    if args.profile:
+        with profile_capture(args.profile):
+            planner.run(resume=resume, changes=changes)
+    else:
+        planner.run(resume=resume, changes=changes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
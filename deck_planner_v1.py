@@ -4,12 +4,17 @@ Deckorator - Interactive Deck Planning System
 Generates custom XML templates for LLM processing based on user requirements.
 """
 
+import io
 import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from supplier_index import get_supplier_index
+from template_engine import load_template
+from xml_writer import Markup, StreamingXMLWriter
+
 class DeckPlanner:
     def __init__(self):
         self.user_responses = {}
@@ -17,22 +22,9 @@ class DeckPlanner:
         self.load_suppliers_database()
         
     def load_suppliers_database(self):
-        """Load supplier database or create default"""
-        try:
-            with open('suppliers_database.json', 'r') as f:
-                self.suppliers_db = json.load(f)
-        except FileNotFoundError:
-            # Create basic database if file doesn't exist
-            self.suppliers_db = {
-                "22032": {
-                    "area": "Burke/Fairfax, Virginia",
-                    "suppliers": ["Home Depot Burke", "Lowe's Burke", "Superior Building Supply"]
-                },
-                "default": {
-                    "area": "Your local area",
-                    "suppliers": ["Home Depot", "Lowe's", "Local lumber yards"]
-                }
-            }
+        """Attach the shared supplier index (parsed once per process)"""
+        self.supplier_index = get_supplier_index('suppliers_database.json')
+        self.suppliers_db = self.supplier_index.database
     
     def welcome_message(self):
         """Display welcome and instructions"""
@@ -228,10 +220,7 @@ class DeckPlanner:
     
     def get_local_suppliers(self, zip_code):
         """Get suppliers for user's zip code"""
-        if zip_code in self.suppliers_db:
-            return self.suppliers_db[zip_code]
-        else:
-            return self.suppliers_db["default"]
+        return self.supplier_index.lookup(zip_code)
     
     def generate_xml_template(self):
         """Generate the final XML template for LLM submission"""
@@ -246,241 +235,52 @@ class DeckPlanner:
         
         return xml_content
     
-    def generate_basic_template(self):
-        """Generate basic template XML"""
-        local_suppliers = self.get_local_suppliers(self.user_responses['zip_code'])
-        
-        xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<deck_planning_request>
-  <project_overview>
-    <description>Custom deck planning request generated by Deckorator system</description>
-    <project_type>{self.user_responses.get('project_type', '')}</project_type>
-    <complexity_level>basic</complexity_level>
-    <generated_date>{datetime.now().strftime('%Y-%m-%d')}</generated_date>
-  </project_overview>
-
-  <user_requirements>
-    <project_basics>
-      <deck_size>{self.user_responses.get('deck_size', '')}</deck_size>
-      <budget_range>{self.user_responses.get('budget_range', '')}</budget_range>
-      <timeline>{self.user_responses.get('start_timeframe', '')} - {self.user_responses.get('completion_timeline', '')}</timeline>
-    </project_basics>
-    
-    <site_information>
-      <location>
-        <zip_code>{self.user_responses.get('zip_code', '')}</zip_code>
-        <area>{local_suppliers.get('area', 'Local area')}</area>
-      </location>
-      <attachment_type>{self.user_responses.get('attachment_type', '')}</attachment_type>
-      <ground_conditions>{self.user_responses.get('ground_conditions', '')}</ground_conditions>
-      <height_from_ground>{self.user_responses.get('height_from_ground', '')}</height_from_ground>
-    </site_information>
+    def template_values(self, local_area_default, coordination_default):
+        """Slot values shared by the basic and advanced templates"""
+        responses = self.user_responses
+        local_suppliers = self.get_local_suppliers(responses['zip_code'])
 
-    <materials_and_design>
-      <decking_material>{self.user_responses.get('decking_material', '')}</decking_material>
-      <railing_style>{self.user_responses.get('railing_style', '')}</railing_style>
-      <special_features>{self.user_responses.get('special_features', '')}</special_features>
-    </materials_and_design>
+        values = {field: responses.get(field, '') for field in (
+            'project_type', 'deck_size', 'budget_range', 'start_timeframe',
+            'completion_timeline', 'zip_code', 'attachment_type',
+            'ground_conditions', 'height_from_ground', 'decking_material',
+            'railing_style', 'special_features', 'primary_builder',
+            'construction_experience', 'helpers_available', 'helper_details',
+            'work_schedule')}
 
-    <work_approach>
-      <primary_builder>{self.user_responses.get('primary_builder', '')}</primary_builder>
-      <construction_experience>{self.user_responses.get('construction_experience', '')}</construction_experience>
-      <helpers_available>{self.user_responses.get('helpers_available', '')}</helpers_available>
-      <helper_details>{self.user_responses.get('helper_details', '')}</helper_details>
-      <work_schedule>{self.user_responses.get('work_schedule', '')}</work_schedule>
-    </work_approach>
-
-    <work_assignments>'''
-        
-        for phase, assignment in self.user_responses.get('work_assignments', {}).items():
-            xml_content += f'\n      <{phase.lower().replace(" & ", "_").replace(" ", "_")}>{assignment}</{phase.lower().replace(" & ", "_").replace(" ", "_")}>'
-        
-        xml_content += f'''
-    </work_assignments>
-  </user_requirements>
+        work_assignments = io.StringIO()
+        writer = StreamingXMLWriter(work_assignments, level=3)
+        for phase, assignment in responses.get('work_assignments', {}).items():
+            writer.element(phase.lower().replace(" & ", "_").replace(" ", "_"), assignment)
 
-  <local_resources>
-    <suppliers>'''
-        
+        suppliers = io.StringIO()
+        writer = StreamingXMLWriter(suppliers, level=3)
         for supplier in local_suppliers.get('suppliers', []):
-            xml_content += f'\n      <supplier>{supplier}</supplier>'
-        
-        xml_content += f'''
-    </suppliers>
-    <building_codes>
-      <jurisdiction>Check local building department for {self.user_responses.get('zip_code', 'your area')}</jurisdiction>
-      <permit_likely_required>{self.user_responses.get('height_from_ground', '') != 'Ground level (under 30 inches)'}</permit_likely_required>
-    </building_codes>
-  </local_resources>
+            writer.element('supplier', supplier)
 
-  <deliverables_requested>
-    <material_list>true</material_list>
-    <cost_estimate>true</cost_estimate>
-    <step_by_step_instructions>true</step_by_step_instructions>
-    <safety_guidelines>true</safety_guidelines>
-    <tool_requirements>true</tool_requirements>
-    <timeline_estimate>true</timeline_estimate>
-    <local_supplier_recommendations>true</local_supplier_recommendations>
-    <permit_guidance>true</permit_guidance>
-  </deliverables_requested>
-
-  <context_instructions>
-    <role>Act as an experienced, family-friendly deck contractor who explains things clearly for the user's experience level: {self.user_responses.get('construction_experience', '')}</role>
-    <safety_priority>Always prioritize safety recommendations appropriate for DIY builders with {self.user_responses.get('construction_experience', '')} experience</safety_priority>
-    <budget_conscious>Provide cost-effective solutions within the {self.user_responses.get('budget_range', '')} budget range</budget_conscious>
-    <local_focus>Reference suppliers and building codes for {local_suppliers.get('area', 'the local area')}</local_focus>
-    <family_coordination>Consider that helpers include: {self.user_responses.get('helpers_available', 'solo builder')}</family_coordination>
-    <response_format>Provide organized sections with clear headings, actionable steps, and safety callouts appropriate for the user's experience level</response_format>
-  </context_instructions>
-
-  <submission_instructions>
-    <photos_to_include>
-      <site_photos>Wide-angle shots of the planned deck area from multiple angles</site_photos>
-      <detail_photos>Close-ups of house attachment point, ground conditions, obstacles</detail_photos>
-      <reference_photos>Any inspiration photos or similar decks you like</reference_photos>
-    </photos_to_include>
-    
-    <sketches_to_include>
-      <hand_drawn_plans>Your rough sketch of desired deck layout and dimensions</hand_drawn_plans>
-      <measurements>Include any measurements you've taken or estimates of key dimensions</measurements>
-    </sketches_to_include>
+        values.update(
+            generated_date=datetime.now().strftime('%Y-%m-%d'),
+            area=local_suppliers.get('area', 'Local area'),
+            local_focus_area=local_suppliers.get('area', local_area_default),
+            jurisdiction_zip=responses.get('zip_code', 'your area'),
+            permit_likely_required=responses.get('height_from_ground', '') != 'Ground level (under 30 inches)',
+            coordination_helpers=responses.get('helpers_available', coordination_default),
+            work_assignments=Markup(work_assignments.getvalue()),
+            suppliers=Markup(suppliers.getvalue()),
+        )
+        return values
 
-    <additional_context>
-      <specific_questions>List any specific questions or concerns you have about the project</specific_questions>
-      <constraints>Mention any HOA requirements, neighbor considerations, or site limitations</constraints>
-    </additional_context>
-  </submission_instructions>
-</deck_planning_request>'''
-        
-        return xml_content
+    def generate_basic_template(self):
+        """Generate basic template XML"""
+        values = self.template_values('the local area', 'solo builder')
+        return load_template('deck_plan_basic').render(values)
     
     def generate_advanced_template(self):
         """Generate advanced template XML with more detailed requirements"""
-        # Similar to basic but with additional sections for professional coordination,
-        # detailed cost tracking, multi-phase planning, etc.
-        local_suppliers = self.get_local_suppliers(self.user_responses['zip_code'])
-        
-        xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<deck_planning_request>
-  <project_overview>
-    <description>Advanced deck planning request with professional coordination capabilities</description>
-    <project_type>{self.user_responses.get('project_type', '')}</project_type>
-    <complexity_level>advanced</complexity_level>
-    <generated_date>{datetime.now().strftime('%Y-%m-%d')}</generated_date>
-  </project_overview>
-
-  <user_requirements>
-    <project_basics>
-      <deck_size>{self.user_responses.get('deck_size', '')}</deck_size>
-      <budget_range>{self.user_responses.get('budget_range', '')}</budget_range>
-      <timeline>{self.user_responses.get('start_timeframe', '')} - {self.user_responses.get('completion_timeline', '')}</timeline>
-    </project_basics>
-    
-    <site_information>
-      <location>
-        <zip_code>{self.user_responses.get('zip_code', '')}</zip_code>
-        <area>{local_suppliers.get('area', 'Local area')}</area>
-      </location>
-      <attachment_type>{self.user_responses.get('attachment_type', '')}</attachment_type>
-      <ground_conditions>{self.user_responses.get('ground_conditions', '')}</ground_conditions>
-      <height_from_ground>{self.user_responses.get('height_from_ground', '')}</height_from_ground>
-    </site_information>
-
-    <materials_and_design>
-      <decking_material>{self.user_responses.get('decking_material', '')}</decking_material>
-      <railing_style>{self.user_responses.get('railing_style', '')}</railing_style>
-      <special_features>{self.user_responses.get('special_features', '')}</special_features>
-    </materials_and_design>
-
-    <work_approach>
-      <primary_builder>{self.user_responses.get('primary_builder', '')}</primary_builder>
-      <construction_experience>{self.user_responses.get('construction_experience', '')}</construction_experience>
-      <helpers_available>{self.user_responses.get('helpers_available', '')}</helpers_available>
-      <helper_details>{self.user_responses.get('helper_details', '')}</helper_details>
-      <work_schedule>{self.user_responses.get('work_schedule', '')}</work_schedule>
-    </work_approach>
-
-    <work_assignments>'''
-        
-        for phase, assignment in self.user_responses.get('work_assignments', {}).items():
-            xml_content += f'\n      <{phase.lower().replace(" & ", "_").replace(" ", "_")}>{assignment}</{phase.lower().replace(" & ", "_").replace(" ", "_")}>'
-        
-        xml_content += f'''
-    </work_assignments>
-  </user_requirements>
-
-  <local_resources>
-    <suppliers>'''
-        
-        for supplier in local_suppliers.get('suppliers', []):
-            xml_content += f'\n      <supplier>{supplier}</supplier>'
-        
-        xml_content += f'''
-    </suppliers>
-    <building_codes>
-      <jurisdiction>Check local building department for {self.user_responses.get('zip_code', 'your area')}</jurisdiction>
-      <permit_likely_required>{self.user_responses.get('height_from_ground', '') != 'Ground level (under 30 inches)'}</permit_likely_required>
-    </building_codes>
-  </local_resources>
-
-  <deliverables_requested>
-    <!-- Basic Planning -->
-    <material_list>true</material_list>
-    <cost_estimate>true</cost_estimate>
-    <step_by_step_instructions>true</step_by_step_instructions>
-    <safety_guidelines>true</safety_guidelines>
-    <tool_requirements>true</tool_requirements>
-    <timeline_estimate>true</timeline_estimate>
-    <local_supplier_recommendations>true</local_supplier_recommendations>
-    <permit_guidance>true</permit_guidance>
-    
-    <!-- Advanced Features -->
-    <detailed_technical_drawings>true</detailed_technical_drawings>
-    <foundation_engineering>true</foundation_engineering>
-    <framing_plans>true</framing_plans>
-    <comprehensive_cost_breakdown>true</comprehensive_cost_breakdown>
-    <professional_coordination_guidance>true</professional_coordination_guidance>
-    <project_timeline_with_milestones>true</project_timeline_with_milestones>
-    <quality_control_checkpoints>true</quality_control_checkpoints>
-    <contingency_planning>true</contingency_planning>
-    <roi_analysis>true</roi_analysis>
-  </deliverables_requested>
-
-  <context_instructions>
-    <role>Act as an experienced deck contractor with engineering knowledge, capable of coordinating with professionals and managing complex projects</role>
-    <experience_level>Adapt guidance for {self.user_responses.get('construction_experience', '')} experience level</experience_level>
-    <professional_coordination>Provide guidance for working with contractors, engineers, and inspectors as needed</professional_coordination>
-    <safety_priority>Comprehensive safety protocols for complex construction with multiple workers</safety_priority>
-    <budget_optimization>Detailed cost management within {self.user_responses.get('budget_range', '')} range with variance tracking</budget_optimization>
-    <local_focus>Expert knowledge of {local_suppliers.get('area', 'local area')} suppliers, codes, and best practices</local_focus>
-    <family_coordination>Advanced coordination strategies for: {self.user_responses.get('helpers_available', 'project team')}</family_coordination>
-    <response_format>Professional-grade documentation with detailed plans, specifications, and project management guidance</response_format>
-  </context_instructions>
-
-  <submission_instructions>
-    <photos_to_include>
-      <site_photos>Comprehensive site documentation from multiple angles and elevations</site_photos>
-      <detail_photos>Close-ups of structural attachment points, utilities, grade conditions</detail_photos>
-      <reference_photos>Design inspiration and similar projects for style guidance</reference_photos>
-      <existing_structure>Current conditions that will be modified or integrated</existing_structure>
-    </photos_to_include>
-    
-    <sketches_to_include>
-      <detailed_plans>Scaled drawings with dimensions and elevation views</detailed_plans>
-      <site_measurements>Precise measurements of key dimensions and constraints</site_measurements>
-      <design_details>Specific features, connections, and architectural elements desired</design_details>
-    </sketches_to_include>
-
-    <additional_context>
-      <specific_requirements>Detailed project requirements and performance specifications</specific_requirements>
-      <constraints_and_challenges>Site limitations, HOA requirements, neighbor considerations</constraints_and_challenges>
-      <professional_involvement>Which aspects require professional consultation or oversight</professional_involvement>
-      <long_term_considerations>Future modifications, maintenance planning, resale considerations</long_term_considerations>
-    </additional_context>
-  </submission_instructions>
-</deck_planning_request>'''
-        
-        return xml_content
+        # Same answers as basic, with additional sections for professional
+        # coordination, detailed cost tracking, multi-phase planning, etc.
+        values = self.template_values('local area', 'project team')
+        return load_template('deck_plan_advanced').render(values)
     
     def save_template(self, xml_content):
         """Save the generated template to file"""
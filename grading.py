@@ -0,0 +1,231 @@
+"""
+Grading and Drainage for Deckorator
+Cut/fill, runoff, gravel base and foundation setback checks for the ground
+under a deck, computed on a grid over the site with NumPy.
+
+Site coordinates match structural_calcs: x runs along the deck length and
+y away from the house, in feet from the house-side corner of the deck.
+The house foundation is the line y = -foundation_distance. Elevations are
+in inches.
+
+The existing ground is a plane through the planner's slope answer (the
+named side is slope_amount_inches higher across the deck length), or a
+least-squares plane through surveyed spot elevations with each grid cell
+corrected by the mean of the survey points that fall in it. Binning keeps
+the work linear in the number of points, so dense surveys stay fast.
+
+The design grade is a plane falling away from the house, at 2% or, when
+the deck is within 10 feet of the foundation, steep enough for the IRC
+R401.3 fall of 6 inches in the first 10 feet. It is set so cut and fill
+balance under the gravel pad (the deck plus 2 feet all round).
+"""
+
+GRID_RESOLUTION_FT = 0.5
+GRAVEL_MARGIN_FT = 2.0
+GRAVEL_DEPTH_IN = 6
+MIN_DRAINAGE_SLOPE = 0.02          # 2% away from the house under the deck
+FOUNDATION_ZONE_FT = 10            # IRC R401.3: fall 6 inches within 10 feet
+FOUNDATION_FALL_IN = 6
+LEVEL_SLOPE = 0.005                # below 0.5% the ground is treated as level
+CUBIC_FEET_PER_YARD = 27
+
+# slope_direction answer -> +1 if that side is at the far end of the length axis
+HIGH_SIDE = {'east': 1, 'north': 1, 'west': -1, 'south': -1}
+OPPOSITE = {'east': 'west', 'west': 'east', 'north': 'south', 'south': 'north'}
+
+
+def _numpy():
+    """NumPy, imported only when a site is graded"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("NumPy is required for grading calculations: pip install numpy") from None
+    return numpy
+
+
+class GradingResult:
+    """Earthwork and drainage figures for one site"""
+
+    __slots__ = (
+        'existing_slope_pct', 'runoff_direction', 'runoff_to_house_pct',
+        'design_slope_pct', 'cut_cubic_yards', 'fill_cubic_yards', 'gravel_cubic_yards',
+        'gravel_area_sqft', 'foundation_distance_ft', 'foundation_fall_in',
+        'design_foundation_fall_in', 'setback_ok', 'survey_points',
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @property
+    def net_cubic_yards(self):
+        """Positive when soil has to be hauled away"""
+        return self.cut_cubic_yards - self.fill_cubic_yards
+
+    def to_xml(self, indent='      '):
+        """<computed_grading> contents for the construction template"""
+        lines = [
+            f"<existing_slope_percent>{self.existing_slope_pct:g}</existing_slope_percent>",
+            f"<runoff_direction>{self.runoff_direction}</runoff_direction>",
+            f"<runoff_toward_house_percent>{self.runoff_to_house_pct:g}</runoff_toward_house_percent>",
+            f"<design_slope_percent>{self.design_slope_pct:g}</design_slope_percent>",
+            f"<cut_cubic_yards>{self.cut_cubic_yards:g}</cut_cubic_yards>",
+            f"<fill_cubic_yards>{self.fill_cubic_yards:g}</fill_cubic_yards>",
+            f"<gravel_base_cubic_yards depth_inches=\"{GRAVEL_DEPTH_IN}\" "
+            f"area_square_feet=\"{self.gravel_area_sqft:g}\">{self.gravel_cubic_yards:g}"
+            f"</gravel_base_cubic_yards>",
+        ]
+        if self.foundation_fall_in is not None:
+            lines += [
+                f"<foundation_grade_fall_inches>{self.foundation_fall_in:g}</foundation_grade_fall_inches>",
+                f"<required_foundation_fall_inches>{self.design_foundation_fall_in:g}"
+                f"</required_foundation_fall_inches>",
+                f"<foundation_setback_check>{'pass' if self.setback_ok else 'regrade'}"
+                f"</foundation_setback_check>",
+            ]
+        if self.survey_points:
+            lines.append(f"<survey_points>{self.survey_points}</survey_points>")
+        return ''.join(f"\n{indent}{line}" for line in lines)
+
+
+def site_grid(length, width, foundation_distance=None, resolution=GRID_RESOLUTION_FT,
+              margin=GRAVEL_MARGIN_FT):
+    """(x, y) cell-centre arrays covering the gravel pad and the first 10 feet out from the foundation"""
+    np = _numpy()
+    y_start, y_end = -margin, width + margin
+    if foundation_distance is not None:
+        y_start = min(y_start, -foundation_distance)
+        y_end = max(y_end, FOUNDATION_ZONE_FT - foundation_distance)
+    xs = np.arange(-margin + resolution / 2, length + margin, resolution)
+    ys = np.arange(y_start + resolution / 2, y_end, resolution)
+    return np.meshgrid(xs, ys)
+
+
+def fit_plane(points):
+    """(z0, dz/dx, dz/dy) least-squares plane through (x, y, z) rows"""
+    np = _numpy()
+    points = np.asarray(points, dtype=float)
+    design = np.column_stack((np.ones(len(points)), points[:, 0], points[:, 1]))
+    return np.linalg.lstsq(design, points[:, 2], rcond=None)[0]
+
+
+def ground_surface(x, y, length, slope_direction='level', slope_amount_inches=0,
+                   spot_elevations=None, resolution=GRID_RESOLUTION_FT):
+    """(elevations in inches on the grid, (dz/dx, dz/dy) of the underlying plane)"""
+    np = _numpy()
+    if spot_elevations is None or len(spot_elevations) < 3:
+        direction = HIGH_SIDE.get((slope_direction or 'level').lower(), 0)
+        gradient_x = direction * (slope_amount_inches or 0) / length
+        return gradient_x * (x - length / 2), (gradient_x, 0.0)
+
+    points = np.asarray(spot_elevations, dtype=float)
+    z0, gradient_x, gradient_y = fit_plane(points)
+    surface = z0 + gradient_x * x + gradient_y * y
+
+    # Mean residual of the survey points in each cell
+    columns = x.shape[1]
+    col = np.floor((points[:, 0] - x[0, 0]) / resolution + 0.5).astype(int)
+    row = np.floor((points[:, 1] - y[0, 0]) / resolution + 0.5).astype(int)
+    inside = (col >= 0) & (col < columns) & (row >= 0) & (row < x.shape[0])
+    cells = row[inside] * columns + col[inside]
+    residual = points[inside, 2] - (z0 + gradient_x * points[inside, 0] + gradient_y * points[inside, 1])
+    counts = np.bincount(cells, minlength=x.size)
+    sums = np.bincount(cells, weights=residual, minlength=x.size)
+    correction = np.divide(sums, counts, out=np.zeros(x.size), where=counts > 0)
+    return surface + correction.reshape(x.shape), (gradient_x, gradient_y)
+
+
+def runoff_direction(gradient_x, gradient_y, slope_direction=None):
+    """Where surface water runs, relative to the house"""
+    if max(abs(gradient_x), abs(gradient_y)) / 12 < LEVEL_SLOPE:
+        return "level - water will pond without grading"
+    if abs(gradient_y) >= abs(gradient_x):
+        return "toward the house" if gradient_y > 0 else "away from the house"
+    low_side = OPPOSITE.get((slope_direction or '').lower())
+    if low_side:
+        return f"along the house, toward the {low_side} side"
+    return "along the house, toward the " + ("start" if gradient_x > 0 else "far end") + " of the deck"
+
+
+def grade_site(length, width, slope_direction='level', slope_amount_inches=0,
+               foundation_distance=None, spot_elevations=None,
+               resolution=GRID_RESOLUTION_FT, gravel_depth_in=GRAVEL_DEPTH_IN):
+    """GradingResult for a deck footprint.
+
+    spot_elevations are optional (x ft, y ft, elevation in) survey rows in
+    site coordinates; without them the slope answer describes the ground.
+    """
+    np = _numpy()
+    x, y = site_grid(length, width, foundation_distance, resolution)
+    existing, (gradient_x, gradient_y) = ground_surface(
+        x, y, length, slope_direction, slope_amount_inches, spot_elevations, resolution)
+    cell_sqft = resolution * resolution
+
+    pad = ((x >= -GRAVEL_MARGIN_FT) & (x <= length + GRAVEL_MARGIN_FT)
+           & (y >= -GRAVEL_MARGIN_FT) & (y <= width + GRAVEL_MARGIN_FT))
+    design_slope = MIN_DRAINAGE_SLOPE
+    if foundation_distance is not None and foundation_distance < FOUNDATION_ZONE_FT:
+        design_slope = max(design_slope, FOUNDATION_FALL_IN / (FOUNDATION_ZONE_FT * 12))
+    # Design grade falls away from the house; offset so cut and fill balance
+    design_fall = -design_slope * 12 * y
+    offset = (existing[pad] - design_fall[pad]).mean()
+    difference = existing - (design_fall + offset)
+    cut = np.where(pad, np.clip(difference, 0, None), 0).sum() * cell_sqft / 12
+    fill = np.where(pad, np.clip(-difference, 0, None), 0).sum() * cell_sqft / 12
+
+    # Cells whose steepest descent points at the house
+    slope_y, slope_x = np.gradient(existing, resolution)
+    toward_house = (slope_y > 0) & (np.abs(slope_y) >= np.abs(slope_x))
+
+    foundation_fall = design_foundation_fall = None
+    setback_ok = True
+    if foundation_distance is not None:
+        columns = (x[0] >= 0) & (x[0] <= length)
+        at_wall = np.abs(y[:, 0] + foundation_distance).argmin()
+        at_zone = np.abs(y[:, 0] + foundation_distance - FOUNDATION_ZONE_FT).argmin()
+        # Fall between the grid rows nearest the wall and 10 feet out, per 10 feet
+        run = float(y[at_zone, 0] - y[at_wall, 0])
+        foundation_fall = float(existing[at_wall, columns].mean()
+                                - existing[at_zone, columns].mean()) * FOUNDATION_ZONE_FT / run
+        design_foundation_fall = design_slope * 12 * FOUNDATION_ZONE_FT
+        setback_ok = bool(foundation_fall >= FOUNDATION_FALL_IN - 0.05)
+
+    return GradingResult(
+        existing_slope_pct=round(float(np.hypot(gradient_x, gradient_y)) / 12 * 100, 2),
+        runoff_direction=runoff_direction(gradient_x, gradient_y, slope_direction),
+        runoff_to_house_pct=round(float(toward_house[pad].mean() * 100), 1),
+        design_slope_pct=round(design_slope * 100, 2),
+        cut_cubic_yards=round(float(cut) / CUBIC_FEET_PER_YARD, 2),
+        fill_cubic_yards=round(float(fill) / CUBIC_FEET_PER_YARD, 2),
+        gravel_cubic_yards=round(float(pad.sum()) * cell_sqft * gravel_depth_in / 12
+                                 / CUBIC_FEET_PER_YARD, 2),
+        gravel_area_sqft=round(float(pad.sum()) * cell_sqft, 1),
+        foundation_distance_ft=foundation_distance,
+        foundation_fall_in=None if foundation_fall is None else round(foundation_fall, 1),
+        design_foundation_fall_in=None if design_foundation_fall is None
+        else round(float(design_foundation_fall), 1),
+        setback_ok=setback_ok,
+        survey_points=0 if spot_elevations is None else len(spot_elevations),
+    )
+
+
+def load_spot_elevations(path):
+    """(x ft, y ft, elevation in) rows from a CSV survey with a header line"""
+    np = _numpy()
+    return np.loadtxt(path, delimiter=',', skiprows=1, usecols=(0, 1, 2), ndmin=2)
+
+
+def grading_for_responses(responses, spot_elevations=None):
+    """grade_site() for a planner's user_responses"""
+    from project_record import parse_measurement
+
+    return grade_site(
+        responses['exact_length'], responses['exact_width'],
+        slope_direction=responses.get('slope_direction', 'level'),
+        slope_amount_inches=responses.get('slope_amount_inches', 0),
+        foundation_distance=parse_measurement(responses.get('foundation_distance'),
+                                              'foundation_distance'),
+        spot_elevations=spot_elevations)
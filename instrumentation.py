@@ -0,0 +1,250 @@
+"""
+Instrumentation for Deckorator
+Stage timers, counters and histograms for the planner and submission
+pipelines, plus an opt-in profiler for one slow project.
+
+Modules declare their stages with instrument(), which only records them.
+Nothing is measured until enable() is called (or DECKORATOR_METRICS names
+an output file in the environment): enable() swaps timed wrappers in for
+the stage methods and disable() puts the originals back, so a run without
+metrics executes exactly the uninstrumented code. Stage times include
+nested stages, e.g. xml_rendering includes calculations and takeoff.
+
+Metrics are written as Prometheus text (a path ending in .prom, written
+when metrics are flushed and at exit) or as JSON lines, one line per stage
+call, written as they happen so pool worker processes can share a file.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+METRICS_ENV = 'DECKORATOR_METRICS'
+PREFIX = 'deckorator'
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+           0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_points = []      # (owner, attribute, stage) declared with instrument()
+_originals = {}   # (owner, attribute) -> original attribute while enabled
+_registry = None
+
+
+class Histogram:
+    """Cumulative-bucket histogram of stage durations"""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """[(upper bound, observations at or below it)], ending with +Inf"""
+        running = 0
+        result = []
+        for bound, count in zip(BUCKETS + (float('inf'),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+class MetricsRegistry:
+    """Stage histograms, error counts and named counters for one process"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.histograms = {}
+        self.errors = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._lines = None
+        if path and not path.endswith('.prom'):
+            self._lines = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def observe(self, stage, seconds, ok=True):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+            if not ok:
+                self.errors[stage] = self.errors.get(stage, 0) + 1
+            if self._lines is not None:
+                self._lines.write(json.dumps({'time': round(time.time(), 6), 'pid': os.getpid(),
+                                              'stage': stage, 'seconds': seconds, 'ok': ok}) + '\n')
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+            if self._lines is not None:
+                self._lines.write(json.dumps({'time': round(time.time(), 6), 'pid': os.getpid(),
+                                              'counter': name, 'amount': amount}) + '\n')
+
+    def snapshot(self):
+        """{stage: {count, seconds, mean_ms, errors}} plus counters"""
+        with self._lock:
+            stages = {stage: {'count': h.count, 'seconds': round(h.total, 6),
+                              'mean_ms': round(h.total / h.count * 1000, 3) if h.count else 0,
+                              'errors': self.errors.get(stage, 0)}
+                      for stage, h in self.histograms.items()}
+            return {'stages': stages, 'counters': dict(self.counters)}
+
+    def prometheus(self, extra_counters=None):
+        """Prometheus text exposition of every metric"""
+        lines = [f'# HELP {PREFIX}_stage_seconds Time spent in each pipeline stage',
+                 f'# TYPE {PREFIX}_stage_seconds histogram']
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                for bound, count in histogram.cumulative():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {count}')
+                lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{stage}"}} {histogram.total:.9f}')
+                lines.append(f'{PREFIX}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            lines.append(f'# TYPE {PREFIX}_stage_errors_total counter')
+            for stage in sorted(self.histograms):
+                lines.append(f'{PREFIX}_stage_errors_total{{stage="{stage}"}} {self.errors.get(stage, 0)}')
+            counters = dict(self.counters)
+        counters.update(extra_counters or {})
+        for name, value in sorted(counters.items()):
+            lines.append(f'# TYPE {PREFIX}_{name}_total counter')
+            lines.append(f'{PREFIX}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        if self._lines is not None:
+            self._lines.flush()
+        elif self.path:
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus())
+            os.replace(temporary, self.path)
+
+    def close(self):
+        self.flush()
+        if self._lines is not None:
+            self._lines.close()
+            self._lines = None
+
+
+def _timed(func, stage, registry):
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            registry.observe(stage, time.perf_counter() - start, ok=False)
+            raise
+        registry.observe(stage, time.perf_counter() - start)
+        return result
+    return timed
+
+
+def _wrap(owner, attribute, stage):
+    if (owner, attribute) in _originals:
+        return
+    original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+    _originals[(owner, attribute)] = original
+    setattr(owner, attribute, _timed(original, stage, _registry))
+
+
+def instrument(owner, stages):
+    """Declare stages: {attribute: stage name} on a class or module.
+
+    Methods and functions are only wrapped while instrumentation is enabled.
+    """
+    for attribute, stage in stages.items():
+        _points.append((owner, attribute, stage))
+        if _registry is not None:
+            _wrap(owner, attribute, stage)
+
+
+def enable(path=None):
+    """Start measuring every declared stage; returns the registry.
+
+    path is a .prom file for Prometheus text, any other file for JSON
+    lines, or None to keep metrics in memory (see registry()).
+    """
+    global _registry
+    if _registry is not None:
+        return _registry
+    _registry = MetricsRegistry(path)
+    for owner, attribute, stage in _points:
+        _wrap(owner, attribute, stage)
+    atexit.register(_registry.close)
+    return _registry
+
+
+def disable():
+    """Restore the uninstrumented stages and write out the metrics"""
+    global _registry
+    for (owner, attribute), original in _originals.items():
+        setattr(owner, attribute, original)
+    _originals.clear()
+    if _registry is not None:
+        atexit.unregister(_registry.close)
+        _registry.close()
+        _registry = None
+
+
+def registry():
+    """The active MetricsRegistry, or None while disabled"""
+    return _registry
+
+
+def count(name, amount=1):
+    """Add to a named counter (a no-op while disabled)"""
+    if _registry is not None:
+        _registry.count(name, amount)
+
+
+@contextmanager
+def profile_capture(path, top=25):
+    """Profile the enclosed block with cProfile and tracemalloc.
+
+    Writes <path>.prof (open with pstats or snakeviz) and <path>.txt with
+    the slowest functions by cumulative time and the top allocation sites.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    base = os.path.splitext(path)[0]
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+        profiler.dump_stats(base + '.prof')
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+            pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(top)
+            f.write("Top allocation sites:\n")
+            for statistic in snapshot.statistics('lineno')[:top]:
+                f.write(f"  {statistic}\n")
+        print(f"🔬 Profile saved to {base}.prof and {base}.txt")
+
+
+if os.environ.get(METRICS_ENV):
+    enable(os.environ[METRICS_ENV])
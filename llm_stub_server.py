@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+LLM Stub Server for Deckorator
+A local stand-in for the Anthropic Messages API, for trying async_submit.py
+without an API key or network access.
+
+Every POST is answered with a canned plan giving the size of the prompt
+and the number of photos attached. With --throttle-every N, every Nth request is
+refused with 429 and a Retry-After header, and a retry of that same body
+that arrives before the Retry-After has passed is counted as an early
+retry, so client backoff can be checked end to end.
+
+Endpoints:
+    POST <any path>    Messages API request body; returns a message
+    GET  /stats        requests, images, throttled and early retry counts
+
+Usage:
+    python3 llm_stub_server.py --port 8766 --throttle-every 5 --retry-after 1
+    python3 async_submit.py batch_templates/*.xml --api-url http://127.0.0.1:8766/v1/messages
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8766
+
+
+class StubStats:
+    """Counters shared by the request threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.images = 0
+        self.throttled = 0
+        self.early_retries = 0
+        self._blocked = {}  # request body digest -> monotonic time it may be retried
+
+    def arrive(self, digest):
+        """(request number, retried too early) for a new request"""
+        with self._lock:
+            self.requests += 1
+            early = time.monotonic() < self._blocked.pop(digest, 0.0)
+            if early:
+                self.early_retries += 1
+            return self.requests, early
+
+    def add_images(self, count):
+        with self._lock:
+            self.images += count
+
+    def throttle(self, digest, retry_after):
+        with self._lock:
+            self.throttled += 1
+            self._blocked[digest] = time.monotonic() + retry_after
+
+    def snapshot(self):
+        with self._lock:
+            return {'requests': self.requests, 'images': self.images,
+                    'throttled': self.throttled, 'early_retries': self.early_retries}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    server_version = 'DeckoratorStub/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, headers=None):
+        body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send(200, self.server.stats.snapshot())
+        else:
+            self._send(404, {'type': 'error', 'error': {'type': 'not_found_error',
+                                                       'message': f"no such endpoint {self.path}"}})
+
+    def do_POST(self):
+        stats = self.server.stats
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        digest = hashlib.sha256(body).hexdigest()
+        number, early = stats.arrive(digest)
+        if early:
+            print(f"⚠️  Request {number} arrived before its Retry-After had passed")
+        if self.server.throttle_every and number % self.server.throttle_every == 0:
+            stats.throttle(digest, self.server.retry_after)
+            self._send(429, {'type': 'error', 'error': {'type': 'rate_limit_error',
+                                                       'message': "stub rate limit"}},
+                       {'Retry-After': f"{self.server.retry_after:g}"})
+            return
+        try:
+            request = json.loads(body)
+            content = request['messages'][0]['content']
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._send(400, {'type': 'error', 'error': {'type': 'invalid_request_error',
+                                                       'message': f"bad request body: {e}"}})
+            return
+        text = ''.join(part.get('text', '') for part in content if part.get('type') == 'text')
+        images = sum(1 for part in content if part.get('type') == 'image')
+        stats.add_images(images)
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self._send(200, {
+            'id': f"msg_stub_{number}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': request.get('model', ''),
+            'content': [{'type': 'text', 'text': (
+                f"Stub construction plan for a {len(text):,}-character template, "
+                f"with {images} photo(s) reviewed.")}],
+            'stop_reason': 'end_turn',
+        })
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, throttle_every=0, retry_after=1.0, delay=0.0, verbose=False):
+        super().__init__(address, StubRequestHandler)
+        self.stats = StubStats()
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.delay = delay
+        self.verbose = verbose
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, throttle_every=0, retry_after=1.0, delay=0.0,
+          verbose=False, ready=None):
+    """Run the stub until interrupted; ready(server) is called once it is listening"""
+    server = StubServer((host, port), throttle_every, retry_after, delay, verbose)
+    if ready is not None:
+        ready(server)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Messages API")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('--throttle-every', type=int, default=0, metavar='N',
+                        help="Answer every Nth request with 429 (default: never)")
+    parser.add_argument('--retry-after', type=float, default=1.0,
+                        help="Retry-After seconds sent with a 429 (default: 1)")
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Seconds to wait before each answer (default: 0)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+
+    def ready(server):
+        host, port = server.server_address[:2]
+        print(f"🧪 Stub Messages API listening on http://{host}:{port}/v1/messages")
+
+    try:
+        serve(args.host, args.port, args.throttle_every, args.retry_after, args.delay,
+              args.verbose, ready)
+    except KeyboardInterrupt:
+        print("\n⏹️  Stub server stopped.")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,27 @@ Optionally submit generated templates directly to AI services
 import json
 import os
 import sys
-import base64
-from pathlib import Path
 
-try:
-    import requests
-except ImportError:
-    print("⚠️  Optional: Install 'requests' for direct LLM submission: pip install requests")
-    requests = None
+import instrumentation
+from photo_pipeline import StreamingMessageBody, select_photos
+from photo_scanner import DEFAULT_MAX_DEPTH, scan_photos
+from response_cache import ResponseCache
+from template_catalog import TemplateCatalog
+
+ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages'
+ANTHROPIC_VERSION = '2023-06-01'
+ANTHROPIC_MODEL = 'claude-3-sonnet-20240229'
+ANTHROPIC_MAX_TOKENS = 4000
+
+
+def _requests():
+    """The optional requests package, imported only for direct API submission"""
+    try:
+        import requests
+    except ImportError:
+        return None
+    return requests
+
 
 class LLMSubmissionHelper:
     def __init__(self):
@@ -23,6 +36,7 @@ class LLMSubmissionHelper:
             'openai': 'ChatGPT (OpenAI)',
             'manual': 'Manual Copy-Paste'
         }
+        self.response_cache = ResponseCache()
     
     def welcome(self):
         print("\n🤖 LLM SUBMISSION HELPER")
@@ -33,33 +47,30 @@ class LLMSubmissionHelper:
         print("• Submit directly via API (requires API keys)")
         print()
     
-    def load_template(self):
-        """Find and load the most recent template"""
-        xml_files = list(Path('.').glob('deck_plan_request_*.xml'))
+    def load_template(self, project_id=None, zip_code=None):
+        """Load the most recent template, optionally for one project or ZIP code"""
+        catalog = TemplateCatalog()
+        latest_template = catalog.latest(project_id, zip_code)
+        if latest_template is None and catalog.import_directory():
+            # Templates saved before the catalog existed
+            latest_template = catalog.latest(project_id, zip_code)
         
-        if not xml_files:
+        if latest_template is None:
             print("❌ No deck plan templates found!")
             print("   Run 'python deck_planner.py' first to generate a template.")
             return None
         
-        # Get the most recent template
-        latest_template = max(xml_files, key=os.path.getctime)
-        print(f"📁 Found template: {latest_template}")
+        print(f"📁 Found template: {os.path.relpath(latest_template)}")
         
         with open(latest_template, 'r', encoding='utf-8') as f:
             return f.read()
     
-    def get_photos(self):
+    def get_photos(self, root='.', max_depth=DEFAULT_MAX_DEPTH):
         """Get list of photo files"""
-        photo_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp']
-        photos = []
-        
         print("\n📸 PHOTO DETECTION")
         print("-" * 20)
         
-        for ext in photo_extensions:
-            photos.extend(Path('.').glob(f'*{ext}'))
-            photos.extend(Path('.').glob(f'*{ext.upper()}'))
+        photos = scan_photos(root, max_depth=max_depth)
         
         if photos:
             print(f"Found {len(photos)} photo files:")
@@ -69,7 +80,7 @@ class LLMSubmissionHelper:
                 print(f"  ... and {len(photos) - 10} more")
         else:
             print("No photo files found in current directory.")
-            print("💡 TIP: Place your site photos in the same folder as the script.")
+            print("💡 TIP: Place your site photos in the same folder as the script (or a subfolder).")
         
         return photos
     
@@ -109,72 +120,66 @@ Thank you for your detailed assistance with this deck project!"""
             f.write(formatted_text)
         return filename
     
+    def build_anthropic_body(self, template_content, photos, model=ANTHROPIC_MODEL, max_tokens=ANTHROPIC_MAX_TOKENS):
+        """Build a streaming Messages API request body for a template and its prepared photos"""
+        text = f"I need help creating detailed deck construction plans. Here's my project information:\n\n{template_content}"
+        return StreamingMessageBody(text, photos, model, max_tokens)
+    
     def submit_to_anthropic(self, template_content, photos, api_key):
         """Submit to Claude via Anthropic API"""
-        if not requests:
-            print("❌ 'requests' library not installed. Use manual submission instead.")
+        # Downscaled, de-duplicated, most informative photos (limit 5)
+        photos = select_photos(photos, limit=5)
+        cache_key = self.response_cache.key(template_content, [photo.source for photo in photos],
+                                            ANTHROPIC_MODEL, ANTHROPIC_MAX_TOKENS)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            instrumentation.count('response_cache_hits')
+            print("⚡ Identical template and photos were submitted before - using the cached response.")
+            return cached
+        
+        if _requests() is None:
+            print("❌ 'requests' library not installed (pip install requests). "
+                  "Use manual submission instead.")
             return False
         
         print("🔄 Submitting to Claude...")
         
-        # Prepare the message
-        message_content = [
-            {
-                "type": "text",
-                "text": f"I need help creating detailed deck construction plans. Here's my project information:\n\n{template_content}"
-            }
-        ]
-        
-        # Add photos if available
-        for photo in photos[:5]:  # Limit to 5 photos
-            try:
-                with open(photo, 'rb') as f:
-                    image_data = base64.b64encode(f.read()).decode('utf-8')
-                    message_content.append({
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": f"image/{photo.suffix[1:]}",
-                            "data": image_data
-                        }
-                    })
-            except Exception as e:
-                print(f"⚠️  Couldn't process {photo}: {e}")
+        # Prepare the message (photos are base64-encoded as the body streams out)
+        body = self.build_anthropic_body(template_content, photos)
         
         # API request
         try:
-            response = requests.post(
-                'https://api.anthropic.com/v1/messages',
-                headers={
-                    'Content-Type': 'application/json',
-                    'X-API-Key': api_key,
-                    'anthropic-version': '2023-06-01'
-                },
-                json={
-                    'model': 'claude-3-sonnet-20240229',
-                    'max_tokens': 4000,
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': message_content
-                        }
-                    ]
-                },
-                timeout=60
-            )
+            response = self.post_anthropic(body, api_key)
             
             if response.status_code == 200:
                 result = response.json()
-                return result['content'][0]['text']
+                text = result['content'][0]['text']
+                self.response_cache.put(cache_key, text)
+                return text
             else:
+                instrumentation.count('api_errors')
                 print(f"❌ API Error: {response.status_code}")
                 print(f"Response: {response.text}")
                 return False
                 
         except Exception as e:
+            instrumentation.count('api_errors')
             print(f"❌ Submission failed: {e}")
             return False
     
+    def post_anthropic(self, body, api_key):
+        """POST a request body to the Messages API (photos are encoded as it streams)"""
+        return _requests().post(
+            ANTHROPIC_API_URL,
+            headers={
+                'Content-Type': 'application/json',
+                'X-API-Key': api_key,
+                'anthropic-version': ANTHROPIC_VERSION
+            },
+            data=body,
+            timeout=60
+        )
+    
     def get_api_key(self, service):
         """Get API key from user or environment"""
         env_vars = {
@@ -284,10 +289,36 @@ Thank you for your detailed assistance with this deck project!"""
                     filename = self.save_submission_text(formatted_text)
                     print(f"📁 Submission text saved to: {filename}")
 
+# Pipeline stages timed when metrics are enabled (--metrics)
+instrumentation.instrument(LLMSubmissionHelper, {
+    'load_template': 'template_loading',
+    'get_photos': 'photo_scan',
+    'format_for_manual_submission': 'submission_formatting',
+    'save_submission_text': 'file_write',
+    'submit_to_anthropic': 'submission',
+    'post_anthropic': 'api_call',
+})
+instrumentation.instrument(sys.modules[__name__], {'select_photos': 'photo_preparation'})
+
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Submit a generated template to an AI assistant")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Record stage timings to FILE (.prom for Prometheus text, else JSON lines)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="Profile the run with cProfile and tracemalloc into FILE.prof/.txt")
+    args = parser.parse_args()
+    if args.metrics:
+        instrumentation.enable(args.metrics)
+    
     helper = LLMSubmissionHelper()
     try:
-        helper.run()
+        if args.profile:
+            with instrumentation.profile_capture(args.profile):
+                helper.run()
+        else:
+            helper.run()
     except KeyboardInterrupt:
         print("\n\n⏹️  Submission cancelled.")
         sys.exit(0)
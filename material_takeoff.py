@@ -0,0 +1,210 @@
+"""
+Material Takeoff for Deckorator
+Deterministic material quantities for a deck, as budget tracking rows.
+
+Quantities come from the deck dimensions, the joist and decking materials
+and the structural layout from structural_calcs: joists, rims, ledger,
+beam plies, posts, deck boards, hangers, ties, post hardware, fasteners and
+concrete. Lumber is ordered as cut_list packs the pieces into stock boards
+(one row per lumber size and stock length), so the order and the cutting
+plan always agree. Fasteners and concrete carry the 10% waste factor.
+
+Rows use the budget_tracking_template.csv columns. Unit costs are rough
+national averages for a first estimate; suppliers fill in real prices.
+"""
+
+import csv
+import math
+
+from climate import design_frost_depth
+from structural_calcs import DEFAULT_FROST_DEPTH_IN, JOIST_SIZES, calculate_structure
+
+BUDGET_COLUMNS = (
+    'Category', 'Subcategory', 'Item_Description', 'Supplier', 'Estimated_Cost',
+    'Actual_Cost', 'Quantity', 'Unit_Cost', 'Date_Ordered', 'Date_Delivered', 'Status',
+    'Notes', 'Receipt_Location', 'Warranty_Info',
+)
+
+STOCK_LENGTHS_FT = (8, 10, 12, 16)
+WASTE_FACTOR = 0.10
+DECK_BOARD_COVERAGE_IN = 5.5 + 3 / 16   # 5.5 in board plus a 3/16 in gap
+SCREWS_PER_JOIST_CROSSING = 2
+SCREWS_PER_BOX = 350                    # 5 lb box of 2.5 in deck screws
+LEDGER_FASTENER_SPACING_IN = 16         # two fasteners per 16 in, staggered
+DEFAULT_JOIST_SPACING_IN = 16           # used for estimates when engineering is required
+
+# Rough unit costs (USD) per linear foot of lumber and per hardware item
+LUMBER_COST_PER_FT = {
+    '2x6': 0.70,
+    '2x8': 0.65,
+    '2x10': 0.78,
+    '2x12': 1.05,
+    '6x6': 2.90,
+}
+DECKING_COST_PER_FT = (
+    ('composite', 2.60),
+    ('2x6', 0.70),
+    ('5/4', 0.56),
+)
+DEFAULT_DECKING_COST_PER_FT = 0.56
+HARDWARE_COST = {
+    'joist_hanger': 2.15,
+    'hurricane_tie': 0.85,
+    'post_base': 22.50,
+    'post_cap': 18.00,
+    'ledger_fastener': 3.25,
+    'screw_box': 45.00,
+    'concrete_bag': 4.50,
+}
+
+
+def with_waste(quantity):
+    """Quantity plus the waste factor, rounded up to whole units"""
+    return math.ceil(quantity * (1 + WASTE_FACTOR) - 1e-9)
+
+
+def decking_cost_per_ft(material):
+    """Rough cost per linear foot of a decking material"""
+    material = (material or '').lower()
+    for keyword, cost in DECKING_COST_PER_FT:
+        if keyword in material:
+            return cost
+    return DEFAULT_DECKING_COST_PER_FT
+
+
+def _row(subcategory, description, quantity, unit_cost, notes=''):
+    return {
+        'Category': 'Materials',
+        'Subcategory': subcategory,
+        'Item_Description': description,
+        'Supplier': '',
+        'Estimated_Cost': f"{quantity * unit_cost:.2f}",
+        'Actual_Cost': '',
+        'Quantity': quantity,
+        'Unit_Cost': f"{unit_cost:.2f}",
+        'Date_Ordered': '',
+        'Date_Delivered': '',
+        'Status': 'Pending',
+        'Notes': notes,
+        'Receipt_Location': '',
+        'Warranty_Info': '',
+    }
+
+
+def board_counts(plan):
+    """{stock length: boards} from a cut_list CutPlan or its to_dict()"""
+    return plan.board_counts() if hasattr(plan, 'board_counts') else plan['boards']
+
+
+def spliced_count(plan):
+    """Pieces of a CutPlan (or its to_dict()) too long for any stock board"""
+    return plan.spliced if hasattr(plan, 'board_counts') else plan.get('spliced', 0)
+
+
+def material_takeoff(length, width, deck_height_inches, joist_material='', decking_material='',
+                     attachment_method='ledger', intended_use='', soil_type='', structure=None,
+                     frost_depth_in=DEFAULT_FROST_DEPTH_IN, cut_plans=None, cut_time_limit=0):
+    """Budget rows (dicts keyed by BUDGET_COLUMNS) for one deck.
+
+    Lumber comes from cut_plans ({lumber size: CutPlan or plan dict} from
+    cut_list.optimize_deck/optimize_many); without them the deck's pieces
+    are packed here, spending cut_time_limit seconds per size improving
+    the quick best-fit packing.
+    """
+    if structure is None:
+        structure = calculate_structure(length, width, joist_material, decking_material,
+                                        attachment_method, intended_use, soil_type, frost_depth_in)
+    if cut_plans is None:
+        from cut_list import deck_pieces, optimize_deck  # cut_list imports this module's constants
+
+        cut_plans = optimize_deck(deck_pieces(length, width, deck_height_inches, structure,
+                                              attachment_method, decking_material), cut_time_limit)
+    attached = 'ledger' in (attachment_method or '').lower()
+    joist_size = structure.joist_size or JOIST_SIZES[-1]
+    spacing = structure.joist_spacing_in or DEFAULT_JOIST_SPACING_IN
+    joists_per_span = math.ceil(length * 12 / spacing) + 1
+    joist_count = joists_per_span * structure.joist_span_count
+    plies, beam_lumber = structure.beam_size.split('-')
+    engineering = " (estimate - layout needs engineering review)" if structure.requires_engineering else ""
+    post_ft = max(deck_height_inches / 12, 1)
+    board_rows = math.ceil(width * 12 / DECK_BOARD_COVERAGE_IN)
+
+    # What each framing size is cut into, for the row notes
+    uses = {joist_size: [f"{joist_count} joists x {structure.joist_span_ft:.2f} ft at {spacing} in "
+                         f"on center", "rim board" if attached else "2 rim boards"]}
+    if attached:
+        uses[joist_size].append("ledger board (flash above it)")
+    uses.setdefault(beam_lumber, []).append(
+        f"{structure.beam_rows * int(plies)} beam plies for {structure.beam_rows} row(s) of {structure.beam_size}")
+    uses.setdefault('6x6', []).append(f"{structure.footer_count} posts x {post_ft:.2f} ft, cut to height "
+                                      f"after footers cure")
+
+    rows = []
+    for size, plan in cut_plans.items():
+        spliced = spliced_count(plan)
+        splice = (f"; {spliced} piece(s) longer than the longest board are spliced - "
+                  f"land each splice on a support or have it engineered") if spliced else ""
+        counts = sorted(board_counts(plan).items())
+        for stock, boards in counts:
+            special = "; special order length" if stock > STOCK_LENGTHS_FT[-1] else ""
+            if stock == counts[-1][0]:
+                special += splice  # the parts come from the longest boards
+            if size.startswith('decking'):
+                rows.append(_row('Decking', f"{decking_material or 'Pressure Treated'} Deck Boards, {stock} ft",
+                                 boards, decking_cost_per_ft(decking_material) * stock,
+                                 f"{board_rows} courses of {length:.2f} ft; stagger splices over "
+                                 f"joists{special}"))
+            else:
+                rows.append(_row('Lumber', f"Pressure Treated {size}, {stock} ft", boards,
+                                 LUMBER_COST_PER_FT.get(size, LUMBER_COST_PER_FT['2x10']) * stock,
+                                 "For " + '; '.join(uses.get(size, ())) + engineering + special))
+
+    if attached:
+        rows.append(_row('Hardware', f"Joist Hangers {joist_size}", joists_per_span,
+                         HARDWARE_COST['joist_hanger'], "One per joist at the ledger"))
+    beam_crossings = joists_per_span * structure.beam_rows
+    rows.append(_row('Hardware', 'Hurricane Ties', beam_crossings,
+                     HARDWARE_COST['hurricane_tie'], "Joist-to-beam connection"))
+    rows.append(_row('Hardware', 'Post Bases 6x6', structure.footer_count,
+                     HARDWARE_COST['post_base'], "Standoff base on each footer"))
+    rows.append(_row('Hardware', 'Post-to-Beam Caps 6x6', structure.footer_count,
+                     HARDWARE_COST['post_cap'], f"For {structure.beam_size} beams"))
+    if attached:
+        fasteners = 2 * math.ceil(length * 12 / LEDGER_FASTENER_SPACING_IN)
+        rows.append(_row('Hardware', 'Ledger Lag Screws 1/2 in', with_waste(fasteners),
+                         HARDWARE_COST['ledger_fastener'], "Two per 16 in, staggered"))
+    screws = board_rows * joists_per_span * SCREWS_PER_JOIST_CROSSING
+    rows.append(_row('Hardware', 'Deck Screws 2.5 inch (5 lb box)',
+                     math.ceil(with_waste(screws) / SCREWS_PER_BOX), HARDWARE_COST['screw_box'],
+                     f"{screws} screws, two per joist crossing"))
+
+    rows.append(_row('Concrete', 'Concrete Mix 80lb bags', with_waste(structure.concrete_bags),
+                     HARDWARE_COST['concrete_bag'],
+                     f"{structure.footer_count} footers, {structure.footer_diameter_in} in x "
+                     f"{structure.footer_depth_in:g} in deep"))
+    return rows
+
+
+def takeoff_for_responses(responses, structure=None, cut_plans=None):
+    """material_takeoff() for a planner's user_responses"""
+    return material_takeoff(
+        responses['exact_length'], responses['exact_width'], responses['deck_height_inches'],
+        joist_material=responses.get('joist_material', ''),
+        decking_material=responses.get('decking_material', ''),
+        attachment_method=responses.get('attachment_method', ''),
+        intended_use=responses.get('intended_use', ''),
+        soil_type=responses.get('soil_type', ''),
+        structure=structure,
+        frost_depth_in=design_frost_depth(responses.get('zip_code')),
+        cut_plans=cut_plans)
+
+
+def takeoff_total(rows):
+    return sum(float(row['Estimated_Cost']) for row in rows)
+
+
+def write_budget_csv(rows, stream):
+    """Write rows with the budget_tracking_template.csv header"""
+    writer = csv.DictWriter(stream, fieldnames=BUDGET_COLUMNS, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
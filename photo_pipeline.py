@@ -0,0 +1,198 @@
+"""
+Photo Pipeline for Deckorator
+Prepare site photos for API submission without loading them all into memory.
+
+Each photo is downscaled to a target long edge and re-encoded as JPEG under
+a byte budget, and the prepared copy is cached by file hash so later runs
+skip the work. Near-duplicate shots are dropped and the most informative
+images are chosen instead of the first few found. The request body is
+streamed, base64-encoding one block of each image at a time.
+
+Downscaling, near-duplicate detection and scoring need Pillow
+(pip install Pillow). Without it, photos are sent as-is, exact duplicates
+are still dropped and larger files are preferred.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from response_cache import file_hash
+
+DEFAULT_CACHE_DIR = os.path.join('.deckorator_cache', 'photos')
+DEFAULT_LONG_EDGE = 1568       # largest size the API uses without downscaling
+DEFAULT_MAX_BYTES = 1024 * 1024
+NEAR_DUPLICATE_BITS = 6        # dHash Hamming distance treated as the same shot
+BASE64_BLOCK = 3 * 64 * 1024   # multiple of 3 so blocks encode independently
+
+MEDIA_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+
+class PreparedPhoto:
+    """A photo ready to attach: where its bytes are and how useful it is"""
+
+    __slots__ = ('source', 'path', 'media_type', 'size', 'dhash', 'score')
+
+    def __init__(self, source, path, media_type, size, dhash=None, score=0.0):
+        self.source = source
+        self.path = path
+        self.media_type = media_type
+        self.size = size
+        self.dhash = dhash
+        self.score = score
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'source'}
+
+
+def _pillow():
+    """Pillow's Image module, imported on first use; None if it isn't installed"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def _difference_hash(image):
+    """64-bit dHash: compares neighbouring pixels of a 9x8 grayscale thumbnail"""
+    pixels = list(image.convert('L').resize((9, 8)).getdata())
+    bits = 0
+    for row in range(8):
+        for column in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return bits
+
+
+def _information_score(image):
+    """Histogram entropy plus edge strength: busy, sharp shots score higher"""
+    from PIL import ImageFilter, ImageStat
+
+    gray = image.convert('L')
+    gray.thumbnail((256, 256))
+    edges = ImageStat.Stat(gray.filter(ImageFilter.FIND_EDGES)).mean[0]
+    return gray.entropy() + edges / 16.0
+
+
+def prepare_photo(path, long_edge=DEFAULT_LONG_EDGE, max_bytes=DEFAULT_MAX_BYTES,
+                  cache_dir=DEFAULT_CACHE_DIR):
+    """Downscale and re-encode a photo, reusing the cached result when possible"""
+    path = Path(path)
+    size = path.stat().st_size
+    Image = _pillow()
+    if Image is None:
+        media_type = MEDIA_TYPES.get(path.suffix.lower())
+        if media_type is None:
+            raise ValueError(f"{path.suffix} photos need Pillow to convert: pip install Pillow")
+        return PreparedPhoto(path, path, media_type, size, score=float(size))
+
+    key = f"{file_hash(path)}_{long_edge}_{max_bytes}"
+    cache_dir = Path(cache_dir)
+    prepared_path = cache_dir / f"{key}.jpg"
+    metadata_path = cache_dir / f"{key}.json"
+    try:
+        metadata = json.loads(metadata_path.read_text())
+        if prepared_path.exists():
+            return PreparedPhoto(path, prepared_path, 'image/jpeg', **metadata)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    from PIL import ImageOps
+
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+    image.thumbnail((long_edge, long_edge))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Encode to a private file and rename it into place, so another process
+    # or submission thread preparing the same photo never reads a partial JPEG
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    temporary = prepared_path.with_suffix(suffix)
+    try:
+        for quality in (85, 75, 65, 55, 45):
+            image.save(temporary, 'JPEG', quality=quality, optimize=True)
+            if temporary.stat().st_size <= max_bytes:
+                break
+        metadata = {
+            'size': temporary.stat().st_size,
+            'dhash': _difference_hash(image),
+            'score': _information_score(image),
+        }
+        os.replace(temporary, prepared_path)
+        temporary = metadata_path.with_suffix(suffix)
+        temporary.write_text(json.dumps(metadata))
+        os.replace(temporary, metadata_path)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+    return PreparedPhoto(path, prepared_path, 'image/jpeg', **metadata)
+
+
+def select_photos(paths, limit=5, **prepare_options):
+    """Prepare photos, drop duplicates and return the `limit` most informative"""
+    candidates = []
+    seen_hashes = set()
+    for path in paths:
+        try:
+            content_hash = file_hash(path)
+            if content_hash in seen_hashes:
+                continue
+            seen_hashes.add(content_hash)
+            candidates.append(prepare_photo(path, **prepare_options))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Couldn't process {path}: {e}")
+
+    selected = []
+    for photo in sorted(candidates, key=lambda candidate: candidate.score, reverse=True):
+        if photo.dhash is not None and any(
+                kept.dhash is not None and bin(photo.dhash ^ kept.dhash).count('1') <= NEAR_DUPLICATE_BITS
+                for kept in selected):
+            continue
+        selected.append(photo)
+        if len(selected) == limit:
+            break
+    return selected
+
+
+class StreamingMessageBody:
+    """Messages API JSON body that base64-encodes images while it is sent.
+
+    Iterating yields bytes; len() is the exact Content-Length, computed from
+    file sizes. It can be iterated again, so a failed request can be retried.
+    """
+
+    def __init__(self, text, photos, model, max_tokens):
+        self.photos = list(photos)
+        text_part = json.dumps({'type': 'text', 'text': text})
+        self._head = ('{"model": %s, "max_tokens": %d, "messages": [{"role": "user", "content": [%s'
+                      % (json.dumps(model), max_tokens, text_part)).encode('utf-8')
+        self._image_heads = [
+            (', {"type": "image", "source": {"type": "base64", "media_type": %s, "data": "'
+             % json.dumps(photo.media_type)).encode('utf-8')
+            for photo in self.photos]
+        self._image_tail = b'"}}'
+        self._tail = b']}]}'
+        self._length = len(self._head) + len(self._tail) + sum(
+            len(head) + len(self._image_tail) + 4 * ((os.path.getsize(photo.path) + 2) // 3)
+            for head, photo in zip(self._image_heads, self.photos))
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        import base64
+
+        yield self._head
+        for head, photo in zip(self._image_heads, self.photos):
+            yield head
+            with open(photo.path, 'rb') as f:
+                for block in iter(lambda: f.read(BASE64_BLOCK), b''):
+                    yield base64.b64encode(block)
+            yield self._image_tail
+        yield self._tail
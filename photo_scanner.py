@@ -0,0 +1,152 @@
+"""
+Photo Scanner for Deckorator
+Find site photos in a job folder in a single pass.
+
+The folder tree is walked once with os.scandir, matching extensions case-
+insensitively, down to a depth limit. Files reached twice (hard links,
+symlinks, case-insensitive filesystems) are counted once by inode.
+
+Photos are hashed on demand, not while scanning: hash() (or file_hash,
+which the photo pipeline uses) reads a photo only when it is needed. A
+manifest of each photo's size, mtime and hash is kept between runs, so a
+hash is never recomputed for a photo that hasn't changed. The manifest is
+shared by every folder scanned; a scan updates its own folder's entries
+and keeps the rest.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from response_cache import file_hash, known_file_hash, remember_file_hash
+
+PHOTO_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
+SKIP_DIRECTORIES = frozenset({'__pycache__', 'node_modules', 'llm_responses', 'venv'})
+DEFAULT_MANIFEST = os.path.join('.deckorator_cache', 'photo_manifest.json')
+DEFAULT_MAX_DEPTH = 3
+MANIFEST_VERSION = 1
+
+
+class PhotoScanner:
+    """Walk a folder for photos, reusing the manifest from earlier scans"""
+
+    def __init__(self, root='.', max_depth=DEFAULT_MAX_DEPTH, max_photos=None,
+                 manifest_path=DEFAULT_MANIFEST, hash_files=False):
+        """hash_files hashes every new or changed photo during the scan instead of on demand"""
+        self.root = Path(root)
+        self.max_depth = max_depth
+        self.max_photos = max_photos
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.hash_files = hash_files
+        self.hashed = 0
+        self.reused = 0
+        self._entries = {}   # absolute path -> manifest entry, for every folder
+        self._dirty = False
+
+    def _load_manifest(self):
+        if self.manifest_path is None:
+            return {}
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('photos', {})
+
+    def _save_manifest(self, entries):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps({'version': MANIFEST_VERSION, 'photos': entries}),
+                             encoding='utf-8')
+        os.replace(temporary, self.manifest_path)
+
+    def _walk(self, directory, depth, seen):
+        """Yield (path, stat) for photos under directory, one per inode"""
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if depth < self.max_depth and not entry.name.startswith('.') \
+                            and entry.name not in SKIP_DIRECTORIES:
+                        subdirectories.append(entry.path)
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in PHOTO_EXTENSIONS:
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            identity = (stat.st_dev, stat.st_ino)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            yield entry.path, stat
+        for subdirectory in subdirectories:
+            yield from self._walk(subdirectory, depth + 1, seen)
+
+    def scan(self):
+        """Photo paths under root, in folder order; updates the manifest"""
+        previous = self._load_manifest()
+        self._entries = dict(previous)
+        seen = set()
+        photos = []
+        for path, stat in self._walk(self.root, 0, set()):
+            key = os.path.abspath(path)
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': None}
+            known = previous.get(key)
+            if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns \
+                    and known.get('hash'):
+                entry['hash'] = known['hash']
+                remember_file_hash(path, stat.st_size, stat.st_mtime_ns, known['hash'])
+                self.reused += 1
+            else:
+                # Hashed earlier in this process (e.g. by the photo pipeline), or now if eager
+                entry['hash'] = known_file_hash(path, stat.st_size, stat.st_mtime_ns)
+                if entry['hash'] is None and self.hash_files:
+                    entry['hash'] = file_hash(path)
+                    self.hashed += 1
+            self._entries[key] = entry
+            seen.add(key)
+            photos.append(Path(path))
+            if self.max_photos is not None and len(photos) == self.max_photos:
+                break
+
+        # Drop entries for photos deleted from this folder; other folders' stay
+        root = os.path.join(os.path.abspath(self.root), '')
+        for key in [key for key in self._entries if key.startswith(root) and key not in seen]:
+            if not os.path.exists(key):
+                del self._entries[key]
+        self._dirty = self._entries != previous
+        self.save()
+        return photos
+
+    def hash(self, path):
+        """SHA-256 of a photo, from the manifest if it hasn't changed; recorded for save()"""
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self._entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns \
+                and entry.get('hash'):
+            remember_file_hash(path, stat.st_size, stat.st_mtime_ns, entry['hash'])
+            return entry['hash']
+        digest = file_hash(path)
+        self.hashed += 1
+        self._entries[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        self._dirty = True
+        return digest
+
+    def save(self):
+        """Write the manifest if scan() or hash() changed it"""
+        if self.manifest_path is not None and self._dirty:
+            self._save_manifest(self._entries)
+            self._dirty = False
+
+
+def scan_photos(root='.', **options):
+    """Convenience wrapper: PhotoScanner(root, **options).scan()"""
+    return PhotoScanner(root, **options).scan()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Planner Service for Deckorator
+A resident local HTTP/JSON service that generates construction templates.
+
+Running deck_planner.py once per request pays for interpreter startup,
+supplier database parsing and template compilation every time. The service
+keeps warm planners instead, and remembers recently rendered templates in
+an LRU cache keyed by the project fields.
+
+Requests are batched: a dispatcher thread takes every project waiting in
+the queue (up to --max-batch) and renders them together, in this process
+or on a pool of worker processes that each hold their own warm planner.
+While the renderers are busy new requests queue up and go out as the next
+batch, so an idle service answers at once and a busy one amortizes the
+hand-off.
+
+Endpoints:
+    POST /templates    a project record, or {"projects": [record, ...]}
+                       (add ?format=xml to get a single template as XML)
+    POST /submission   {"template": xml} or {"project": record}, plus
+                       optional "photos": [names]; returns the text for
+                       manual submission to an AI assistant
+    GET  /health       status, uptime and queue depth
+    GET  /metrics      request, cache, batch and latency counters
+                       (?format=prometheus for Prometheus text, including
+                       stage timings when run with --stage-metrics)
+
+Errors come back as {"error": message}: 400 for a bad request, 503 with
+Retry-After when the renderers don't answer in time, 500 for anything else.
+
+Usage:
+    python3 planner_service.py --port 8765 --workers 0
+"""
+
+import argparse
+import json
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+from deck_planner import ConstructionDeckPlanner
+from template_engine import load_template
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_CACHE_SIZE = 4096
+MAX_BODY_BYTES = 4 * 1024 * 1024
+RENDER_TIMEOUT = 30            # seconds a request waits for its templates
+RETRY_AFTER_SECONDS = 5        # suggested back-off when renders time out
+LATENCY_WINDOW = 2048          # recent requests kept for latency percentiles
+
+# One warm planner per rendering process
+_worker_planner = None
+
+
+def _init_worker():
+    global _worker_planner
+    _worker_planner = ConstructionDeckPlanner()
+    load_template('construction_spec')
+
+
+def _render_batch(records):
+    """[(ok, template XML or error message)] for a list of project records"""
+    results = []
+    for record in records:
+        try:
+            _worker_planner.load_project_record(record)
+            results.append((True, _worker_planner.generate_construction_xml()))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+
+class ServiceMetrics:
+    """Thread-safe counters and recent latencies for /metrics"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.counters = {
+            'requests': 0, 'errors': 0, 'templates': 0, 'render_errors': 0,
+            'cache_hits': 0, 'cache_misses': 0, 'batches': 0, 'batched_projects': 0,
+        }
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, seconds):
+        with self._lock:
+            self.counters['requests'] += 1
+            self._latencies.append(seconds)
+
+    def prometheus(self):
+        """Service counters, plus stage timings if instrumentation is enabled"""
+        with self._lock:
+            counters = {f'service_{name}': value for name, value in self.counters.items()}
+        registry = instrumentation.registry() or instrumentation.MetricsRegistry()
+        return registry.prometheus(counters)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = sorted(self._latencies)
+        result = {'uptime_seconds': round(time.time() - self.started, 1)}
+        result.update(counters)
+        result['mean_batch_size'] = (round(counters['batched_projects'] / counters['batches'], 2)
+                                     if counters['batches'] else 0)
+        for label, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            value = latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] if latencies else 0
+            result[f'latency_{label}_ms'] = round(value * 1000, 3)
+        return result
+
+
+class RenderBatcher:
+    """Queue of projects to render, dispatched in batches to warm planners.
+
+    workers=0 renders in the dispatcher thread with one planner in this
+    process, which is fastest on a single core; workers=N uses a process
+    pool and keeps at most N batches in flight.
+    """
+
+    def __init__(self, workers=0, max_batch=DEFAULT_MAX_BATCH, cache_size=DEFAULT_CACHE_SIZE,
+                 metrics=None):
+        self.workers = workers
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.metrics = metrics or ServiceMetrics()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue = queue.Queue()
+        if workers:
+            from multiprocessing import Pool
+
+            self._pool = Pool(workers, initializer=_init_worker)
+            self._slots = threading.Semaphore(workers)
+        else:
+            self._pool = None
+            _init_worker()
+        self._thread = threading.Thread(target=self._dispatch, name='render-dispatcher', daemon=True)
+        self._thread.start()
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _cache_key(self, record):
+        # The template carries the generation date, so cached entries expire daily
+        return f"{date.today()}|{json.dumps(record, sort_keys=True, default=str)}"
+
+    def render(self, records, timeout=RENDER_TIMEOUT):
+        """[(ok, template XML or error message)] for records, in order.
+
+        Raises concurrent.futures.TimeoutError if the renderers don't
+        finish within timeout seconds; the work still completes and fills
+        the cache.
+        """
+        results = [None] * len(records)
+        waiting = []
+        with self._cache_lock:
+            for index, record in enumerate(records):
+                key = self._cache_key(record)
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[index] = (True, cached)
+                else:
+                    waiting.append((index, key, record))
+        self.metrics.count('cache_hits', len(records) - len(waiting))
+        self.metrics.count('cache_misses', len(waiting))
+
+        futures = []
+        for index, key, record in waiting:
+            future = Future()
+            self._queue.put((key, record, future))
+            futures.append((index, future))
+        for index, future in futures:
+            results[index] = future.result(timeout)
+        self.metrics.count('templates', sum(1 for ok, _ in results if ok))
+        self.metrics.count('render_errors', sum(1 for ok, _ in results if not ok))
+        return results
+
+    def _dispatch(self):
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                return
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # finish this batch, then stop
+                    break
+                batch.append(item)
+            self.metrics.count('batches')
+            self.metrics.count('batched_projects', len(batch))
+
+            records = [record for _, record, _ in batch]
+            if self._pool is None:
+                self._complete(batch, _render_batch(records))
+            else:
+                self._slots.acquire()
+                self._pool.apply_async(
+                    _render_batch, (records,),
+                    callback=lambda results, batch=batch: self._complete(batch, results),
+                    error_callback=lambda error, batch=batch: self._complete(
+                        batch, [(False, str(error))] * len(batch)))
+
+    def _complete(self, batch, results):
+        if self._pool is not None:
+            self._slots.release()
+        with self._cache_lock:
+            for (key, _, _), (ok, xml) in zip(batch, results):
+                if ok:
+                    self._cache[key] = xml
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+
+
+class PlannerRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so clients skip the TCP handshake per request
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    server_version = 'DeckoratorPlanner/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        super().log_message(format, *args)  # shown even when not verbose
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        if not isinstance(body, (str, bytes)):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"request body over {MAX_BODY_BYTES} bytes")
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        path = url.path
+        if path == '/health':
+            self._send(200, {
+                'status': 'ok',
+                'uptime_seconds': round(time.time() - self.server.metrics.started, 1),
+                'workers': self.server.batcher.workers,
+                'queue_depth': self.server.batcher.queue_depth(),
+            })
+        elif path == '/metrics' and parse_qs(url.query).get('format') == ['prometheus']:
+            self._send(200, self.server.metrics.prometheus(), 'text/plain; version=0.0.4')
+        elif path == '/metrics':
+            self._send(200, self.server.metrics.snapshot())
+        else:
+            self.server.metrics.count('errors')
+            self._send(404, {'error': f"no such endpoint {path}"})
+        self.server.metrics.observe(time.perf_counter() - start)
+
+    def do_POST(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        headers = None
+        try:
+            payload = self._read_json()
+            if url.path == '/templates':
+                status, body, content_type = self._templates(payload, parse_qs(url.query))
+            elif url.path == '/submission':
+                status, body, content_type = self._submission(payload)
+            else:
+                status, body, content_type = 404, {'error': f"no such endpoint {url.path}"}, 'application/json'
+        except ValueError as e:  # includes malformed JSON
+            status, body, content_type = 400, {'error': str(e)}, 'application/json'
+        except FutureTimeout:
+            status, content_type = 503, 'application/json'
+            body = {'error': f"templates not rendered within {RENDER_TIMEOUT} s; retry later"}
+            headers = {'Retry-After': str(RETRY_AFTER_SECONDS)}
+        except Exception as e:
+            self.log_error("%s failed: %r", url.path, e)
+            status, body, content_type = 500, {'error': f"internal error: {e}"}, 'application/json'
+        if status >= 400:
+            self.server.metrics.count('errors')
+        self._send(status, body, content_type, headers)
+        self.server.metrics.observe(time.perf_counter() - start)
+
+    def _templates(self, payload, query):
+        many = isinstance(payload, dict) and 'projects' in payload
+        records = payload['projects'] if many else [payload]
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValueError("expected a project object or {\"projects\": [objects]}")
+        results = self.server.batcher.render(records)
+
+        if not many:
+            ok, text = results[0]
+            if not ok:
+                return 400, {'error': text}, 'application/json'
+            if query.get('format') == ['xml']:
+                return 200, text, 'application/xml'
+            return 200, {'project_id': records[0].get('project_id'), 'template': text}, 'application/json'
+
+        templates = []
+        for record, (ok, text) in zip(records, results):
+            entry = {'project_id': record.get('project_id'), 'status': 'ok' if ok else 'error'}
+            entry['template' if ok else 'error'] = text
+            templates.append(entry)
+        return 200, {'templates': templates}, 'application/json'
+
+    def _submission(self, payload):
+        if not isinstance(payload, dict):
+            raise ValueError("expected a {\"template\": ...} or {\"project\": ...} object")
+        photos = payload.get('photos') or []
+        if not isinstance(photos, list) or not all(isinstance(photo, str) for photo in photos):
+            raise ValueError("\"photos\" must be a list of file names")
+        template = payload.get('template')
+        if template is None:
+            project = payload.get('project')
+            if not isinstance(project, dict):
+                raise ValueError("expected \"template\" or \"project\"")
+            ok, template = self.server.batcher.render([project])[0]
+            if not ok:
+                return 400, {'error': template}, 'application/json'
+        elif not isinstance(template, str):
+            raise ValueError("\"template\" must be the template XML as a string")
+        text = self.server.helper.format_for_manual_submission(template, photos)
+        return 200, {'text': text}, 'application/json'
+
+
+class PlannerServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, batcher, verbose=False):
+        from llm_submit import LLMSubmissionHelper
+
+        super().__init__(address, PlannerRequestHandler)
+        self.batcher = batcher
+        self.metrics = batcher.metrics
+        self.helper = LLMSubmissionHelper()
+        self.verbose = verbose
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=0, max_batch=DEFAULT_MAX_BATCH,
+          cache_size=DEFAULT_CACHE_SIZE, verbose=False, ready=None):
+    """Run the service until interrupted; ready(server) is called once it is listening"""
+    batcher = RenderBatcher(workers, max_batch, cache_size)
+    server = PlannerServer((host, port), batcher, verbose)
+    if ready is not None:
+        ready(server)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve template generation over local HTTP/JSON")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help="Rendering processes (default: 0 = render in the service process)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"Most projects rendered per batch (default: {DEFAULT_MAX_BATCH})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Rendered templates kept in memory (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument('--stage-metrics', action='store_true',
+                        help="Time pipeline stages for /metrics (stages rendered in the service process)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+    if args.stage_metrics:
+        instrumentation.enable()
+
+    def ready(server):
+        host, port = server.server_address[:2]
+        print(f"🏗️  Planner service listening on http://{host}:{port} "
+              f"({args.workers or 'in-process'} worker(s))")
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)  # job supervisors stop services with SIGTERM
+    try:
+        serve(args.host, args.port, args.workers, args.max_batch, args.cache_size, args.verbose, ready)
+    except KeyboardInterrupt:
+        print("\n⏹️  Planner service stopped.")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Price Book for Deckorator
+Supplier price sheets indexed for lookup, and bulk re-pricing of open bids.
+
+Price sheets are CSV or JSON files of supplier, SKU, description, ZIP code
+and unit cost (budget_tracking_template.csv's Supplier, Item_Description
+and Unit_Cost columns work too). Prices are indexed by (supplier, item,
+ZIP), where the item is the SKU or the normalized description, with the
+same ZIP fallback as the supplier index: exact ZIP, then the 3-digit
+prefix, then a price with no ZIP. The cheapest supplier per item and ZIP is
+kept for rows that don't name a supplier, and worked out again whenever one
+of that item's prices changes or is dropped from its sheet. Prices are kept
+per sheet, so a price two sheets both list stays until neither does.
+
+OpenBids holds the material lists of many projects as flat columns. When a
+sheet changes, reprice() looks each distinct (item, ZIP, supplier) up
+once, then prices every line and totals every project in one vectorized
+pass, and reports the deltas.
+
+Vectorized re-pricing uses NumPy (pip install numpy); without it the same
+pass runs in plain Python.
+
+Usage:
+    python3 price_book.py sheets/*.csv --bids batch_templates --report reprice.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from array import array
+
+ANY_SUPPLIER = ''
+ANY_ZIP = ''
+
+# Accepted column names in price sheets, first match wins
+SUPPLIER_FIELDS = ('supplier', 'Supplier', 'vendor')
+SKU_FIELDS = ('sku', 'SKU', 'item_number')
+DESCRIPTION_FIELDS = ('description', 'Item_Description', 'item')
+ZIP_FIELDS = ('zip_code', 'zip', 'ZIP')
+COST_FIELDS = ('unit_cost', 'Unit_Cost', 'price')
+
+_SPACES = re.compile(r'\s+')
+
+
+def _numpy():
+    """NumPy for the vectorized pass, imported on first re-price; None without it"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def item_key(text):
+    """Normalized SKU or description used to match price sheet items"""
+    return _SPACES.sub(' ', str(text or '')).strip().lower()
+
+
+def _field(record, names, default=''):
+    for name in names:
+        value = record.get(name)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+class PriceBook:
+    """Indexed unit prices by (supplier, item, ZIP)"""
+
+    def __init__(self):
+        self._sources = {}  # (supplier key, item key, zip or prefix) -> {sheet path or None: (unit cost, supplier)}
+        self._prices = {}   # same keys -> price from the most recently loaded source
+        self._offers = {}   # (item key, zip or prefix) -> {supplier key: (unit cost, supplier)}
+        self._best = {}     # (item key, zip or prefix) -> cheapest of _offers
+        self._sheets = {}   # path -> (mtime, supplier, zip_code) for reload_changed()
+        self._sheet_entries = {}   # path -> _prices keys its last load indexed
+
+    def __len__(self):
+        return len(self._prices)
+
+    def add(self, supplier, item, unit_cost, zip_code=ANY_ZIP, sku=None, source=None):
+        """Index one price under its description and (if given) SKU; returns the index keys.
+
+        source is the sheet the price came from. When several sheets price
+        the same key the latest one loaded wins, and dropping it brings back
+        the price from the others.
+        """
+        unit_cost = float(unit_cost)
+        supplier = str(supplier).strip()
+        zip_code = str(zip_code or ANY_ZIP).strip()
+        places = [zip_code]
+        if len(zip_code) >= 3:
+            places.append(zip_code[:3] + '*')
+        supplier_key = item_key(supplier)
+        entries = []
+        for key in {item_key(item), item_key(sku)} - {''}:
+            for place in places:
+                entry = (supplier_key, key, place)
+                sources = self._sources.setdefault(entry, {})
+                sources.pop(source, None)
+                sources[source] = (unit_cost, supplier)
+                self._set(entry, (unit_cost, supplier))
+                entries.append(entry)
+        return entries
+
+    def remove(self, entry, source=None):
+        """Drop the price source gave one (supplier key, item key, place), e.g. an item taken off a sheet"""
+        sources = self._sources.get(entry)
+        if not sources or sources.pop(source, None) is None:
+            return
+        if sources:
+            self._set(entry, next(reversed(sources.values())))
+            return
+        supplier_key, key, place = entry
+        del self._sources[entry]
+        del self._prices[entry]
+        offers = self._offers[(key, place)]
+        del offers[supplier_key]
+        if offers:
+            self._best[(key, place)] = min(offers.values())
+        else:
+            del self._offers[(key, place)]
+            del self._best[(key, place)]
+
+    def _set(self, entry, price):
+        """Make entry's price the one looked up, keeping the cheapest offer current"""
+        supplier_key, key, place = entry
+        self._prices[entry] = price
+        offers = self._offers.setdefault((key, place), {})
+        previous = offers.get(supplier_key)
+        offers[supplier_key] = price
+        best = self._best.get((key, place))
+        if best is None or price[0] < best[0]:
+            self._best[(key, place)] = price
+        elif previous is not None and item_key(best[1]) == supplier_key:
+            # The cheapest supplier raised its price
+            self._best[(key, place)] = min(offers.values())
+
+    def price(self, item, zip_code=ANY_ZIP, supplier=ANY_SUPPLIER):
+        """(unit cost, supplier) for an item at a ZIP, or None if no sheet prices it.
+
+        With no supplier, the cheapest supplier's price is returned.
+        """
+        key = item_key(item)
+        zip_code = str(zip_code or '')
+        places = (zip_code, zip_code[:3] + '*', ANY_ZIP) if zip_code else (ANY_ZIP,)
+        supplier_key = item_key(supplier)
+        for place in places:
+            found = (self._prices.get((supplier_key, key, place)) if supplier_key
+                     else self._best.get((key, place)))
+            if found is not None:
+                return found
+        return None
+
+    def load_sheet(self, path, supplier=None, zip_code=None):
+        """Add every price in a CSV or JSON sheet; returns the number of items.
+
+        supplier and zip_code fill in rows that don't carry their own. JSON
+        sheets are a list of items or {"supplier", "zip_code", "items": [...]}.
+        """
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if path.lower().endswith('.json'):
+                data = json.load(f)
+                if isinstance(data, dict):
+                    supplier = data.get('supplier', supplier)
+                    zip_code = data.get('zip_code', zip_code)
+                    data = data.get('items', [])
+                records = data
+            else:
+                records = list(csv.DictReader(f))
+
+        path = os.path.abspath(path)
+        count = 0
+        entries = set()
+        for record in records:
+            cost = _field(record, COST_FIELDS)
+            description = _field(record, DESCRIPTION_FIELDS)
+            sku = _field(record, SKU_FIELDS, None)
+            try:
+                cost = float(str(cost).replace('$', '').replace(',', ''))
+            except ValueError:
+                continue  # summary and section rows
+            if not (description or sku):
+                continue
+            entries.update(self.add(_field(record, SUPPLIER_FIELDS, supplier or ''), description or sku,
+                                    cost, _field(record, ZIP_FIELDS, zip_code or ANY_ZIP), sku, path))
+            count += 1
+        # Items dropped from the sheet since it was last loaded
+        for entry in self._sheet_entries.get(path, set()) - entries:
+            self.remove(entry, path)
+        self._sheet_entries[path] = entries
+        self._sheets[path] = (os.path.getmtime(path), supplier, zip_code)
+        return count
+
+    def reload_changed(self):
+        """Re-read sheets modified since they were loaded; returns their paths.
+
+        Prices a sheet no longer lists, or a deleted sheet listed, are dropped.
+        """
+        changed = []
+        for path, (mtime, supplier, zip_code) in list(self._sheets.items()):
+            try:
+                if os.path.getmtime(path) != mtime:
+                    self.load_sheet(path, supplier, zip_code)
+                    changed.append(path)
+            except FileNotFoundError:
+                del self._sheets[path]
+                for entry in self._sheet_entries.pop(path, ()):
+                    self.remove(entry, path)
+                changed.append(path)
+        return changed
+
+
+class OpenBids:
+    """Material lists of many projects as flat, dictionary-encoded columns"""
+
+    def __init__(self):
+        self.project_ids = []
+        self.descriptions = []   # item code -> description as written
+        self.suppliers = [ANY_SUPPLIER]
+        self.zip_codes = []
+        self._codes = {'item': {}, 'supplier': {ANY_SUPPLIER: 0}, 'zip': {}}
+        self.project = array('i')
+        self.item = array('i')
+        self.supplier = array('i')
+        self.zip = array('i')
+        self.quantity = array('d')
+        self.unit_cost = array('d')
+
+    def __len__(self):
+        return len(self.project)
+
+    def _code(self, kind, value, table):
+        codes = self._codes[kind]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def add_project(self, project_id, zip_code, rows):
+        """Add budget rows (dicts with Item_Description, Supplier, Quantity, Unit_Cost)"""
+        project = len(self.project_ids)
+        self.project_ids.append(str(project_id))
+        zip_index = self._code('zip', str(zip_code or ''), self.zip_codes)
+        for row in rows:
+            try:
+                quantity = float(row['Quantity'])
+                unit_cost = float(row['Unit_Cost'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.project.append(project)
+            self.item.append(self._code('item', row['Item_Description'], self.descriptions))
+            self.supplier.append(self._code('supplier', row.get('Supplier') or ANY_SUPPLIER,
+                                            self.suppliers))
+            self.zip.append(zip_index)
+            self.quantity.append(quantity)
+            self.unit_cost.append(unit_cost)
+
+    @classmethod
+    def from_batch(cls, directory, manifest_name='batch_manifest.jsonl'):
+        """Bids from a batch_planner --takeoff run: its manifest and budget CSVs"""
+        from batch_planner import budget_filename
+
+        bids = cls()
+        with open(os.path.join(directory, manifest_name), 'r', encoding='utf-8') as manifest:
+            for line in manifest:
+                entry = json.loads(line)
+                if entry.get('status') != 'ok':
+                    continue
+                path = os.path.join(directory, budget_filename(entry['project_id']))
+                try:
+                    with open(path, 'r', encoding='utf-8', newline='') as f:
+                        bids.add_project(entry['project_id'], entry.get('zip_code', ''),
+                                         csv.DictReader(f))
+                except FileNotFoundError:
+                    continue
+        return bids
+
+    def _new_unit_costs(self, price_book):
+        """New unit cost for every line, looking each distinct combination up once"""
+        np = _numpy()
+        n_zip = max(len(self.zip_codes), 1)
+        n_supplier = len(self.suppliers)
+        if np is not None:
+            item = np.asarray(self.item, dtype=np.int64)
+            combined = (item * n_zip + np.asarray(self.zip)) * n_supplier + np.asarray(self.supplier)
+            unique, inverse = np.unique(combined, return_inverse=True)
+        else:
+            combined = [(item * n_zip + zip_index) * n_supplier + supplier
+                        for item, zip_index, supplier in zip(self.item, self.zip, self.supplier)]
+            unique = sorted(set(combined))
+            position = {key: index for index, key in enumerate(unique)}
+            inverse = [position[key] for key in combined]
+
+        prices = []
+        for key in unique:
+            key = int(key)
+            supplier = key % n_supplier
+            item, zip_index = divmod(key // n_supplier, n_zip)
+            found = price_book.price(self.descriptions[item],
+                                     self.zip_codes[zip_index] if self.zip_codes else '',
+                                     self.suppliers[supplier])
+            prices.append(found[0] if found else float('nan'))
+
+        if np is not None:
+            new = np.asarray(prices)[inverse]
+            old = np.asarray(self.unit_cost)
+            return np.where(np.isnan(new), old, new)
+        return [old if price != price else price
+                for old, price in zip(self.unit_cost, (prices[index] for index in inverse))]
+
+    def reprice(self, price_book, apply=True):
+        """Re-price every line; returns a RepriceReport of per-project changes"""
+        np = _numpy()
+        start = time.perf_counter()
+        new_unit = self._new_unit_costs(price_book)
+        count = len(self.project_ids)
+        if np is not None:
+            project = np.asarray(self.project)
+            quantity = np.asarray(self.quantity)
+            old_totals = np.bincount(project, quantity * np.asarray(self.unit_cost), count)
+            new_totals = np.bincount(project, quantity * new_unit, count)
+            changed_lines = int(np.count_nonzero(new_unit != np.asarray(self.unit_cost)))
+        else:
+            old_totals = [0.0] * count
+            new_totals = [0.0] * count
+            changed_lines = 0
+            for project, quantity, old, new in zip(self.project, self.quantity, self.unit_cost, new_unit):
+                old_totals[project] += quantity * old
+                new_totals[project] += quantity * new
+                changed_lines += old != new
+        if apply:
+            self.unit_cost = array('d', new_unit)
+        return RepriceReport(self.project_ids, old_totals, new_totals, changed_lines,
+                             time.perf_counter() - start)
+
+
+class RepriceReport:
+    """Per-project totals before and after re-pricing"""
+
+    def __init__(self, project_ids, old_totals, new_totals, changed_lines, seconds):
+        self.project_ids = project_ids
+        self.old_totals = old_totals
+        self.new_totals = new_totals
+        self.changed_lines = changed_lines
+        self.seconds = seconds
+
+    def changes(self, threshold=0.005):
+        """(project_id, old total, new total, delta) for projects that moved, largest first"""
+        rows = [(project_id, float(old), float(new), float(new - old))
+                for project_id, old, new in zip(self.project_ids, self.old_totals, self.new_totals)
+                if abs(new - old) >= threshold]
+        return sorted(rows, key=lambda row: -abs(row[3]))
+
+    def summary(self):
+        old = float(sum(self.old_totals))
+        new = float(sum(self.new_totals))
+        return {
+            'projects': len(self.project_ids),
+            'projects_changed': len(self.changes()),
+            'lines_changed': self.changed_lines,
+            'old_total': round(old, 2),
+            'new_total': round(new, 2),
+            'delta': round(new - old, 2),
+            'seconds': self.seconds,
+        }
+
+    def write_csv(self, stream):
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(['project_id', 'old_total', 'new_total', 'delta', 'delta_percent'])
+        for project_id, old, new, delta in self.changes():
+            percent = f"{100 * delta / old:.1f}" if old else ''
+            writer.writerow([project_id, f"{old:.2f}", f"{new:.2f}", f"{delta:.2f}", percent])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-price open bids from supplier price sheets")
+    parser.add_argument('sheets', nargs='+', help="Price sheets (.csv or .json)")
+    parser.add_argument('--bids', required=True,
+                        help="batch_planner output directory run with --takeoff")
+    parser.add_argument('--report', help="Write per-project deltas to this CSV")
+    args = parser.parse_args()
+
+    book = PriceBook()
+    for sheet in args.sheets:
+        print(f"📄 {sheet}: {book.load_sheet(sheet)} prices")
+    bids = OpenBids.from_batch(args.bids)
+    report = bids.reprice(book)
+    summary = report.summary()
+    print(f"💲 Re-priced {len(bids):,} lines across {summary['projects']:,} projects "
+          f"in {summary['seconds'] * 1000:.0f} ms")
+    print(f"   {summary['projects_changed']:,} projects changed, total "
+          f"${summary['old_total']:,.2f} -> ${summary['new_total']:,.2f} ({summary['delta']:+,.2f})")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8', newline='') as f:
+            report.write_csv(f)
+        print(f"📁 Deltas saved to {args.report}")
+    elif not summary['projects']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
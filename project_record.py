@@ -0,0 +1,254 @@
+"""
+Project Record for Deckorator
+Compact, typed representation of one deck project.
+
+ConstructionDeckPlanner.user_responses is a free-form dict of strings,
+floats and bools; holding 100k of them for re-estimation is mostly dict
+overhead, and measurements such as ledger_height and foundation_distance
+stay as text. ProjectRecord parses and validates a project once, stores it
+in __slots__ with repeated text interned, and converts to and from the JSON
+record, user_responses and XML template forms.
+"""
+
+import json
+import os
+import re
+import sys
+
+TEMPLATE_PREFIX = 'construction_specs_request_'
+_TIMESTAMP_NAME = re.compile(r'\d{8}_\d{6}')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def parse_measurement(value, key='measurement'):
+    """First number in a free-text measurement ("34", "34 in", "about 3 ft"), or None if blank.
+
+    Raises ValueError for text with no number in it ("abc").
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text:
+        return None
+    match = _NUMBER.search(text)
+    if match is None:
+        raise ValueError(f"'{key}' must be a measurement such as \"34 in\", got {text!r}")
+    return float(match.group())
+
+
+def format_measurement(value):
+    """Template text for an optional measurement: '' when unknown, 34.0 -> '34'"""
+    return '' if value is None else f"{value:g}"
+
+
+def _flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('yes', 'y', 'true', '1')
+    return bool(value)
+
+
+def _text(value, default=''):
+    # Interning makes the few distinct soil types, materials and ZIP codes
+    # shared across every record instead of one string per project
+    return sys.intern(default if value is None else str(value))
+
+
+class MalformedRecord(dict):
+    """Empty stand-in for an input line that isn't a project object.
+
+    Record readers yield one in the line's place, so it is reported like
+    any other invalid project; from_dict() raises ValueError with the reason.
+    """
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+
+class ProjectRecord:
+    """One project's answers, parsed and validated once"""
+
+    __slots__ = (
+        'project_id', 'exact_length', 'exact_width', 'deck_height_inches',
+        'attachment_method', 'ledger_height', 'house_construction',
+        'slope_direction', 'slope_amount_inches', 'soil_type', 'drainage_issues',
+        'foundation_distance', 'intended_use', 'joist_material', 'decking_material',
+        'zip_code', 'start_date', 'has_excavator', 'concrete_subcontract',
+        'photo_album_url', 'photo_album_description',
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @property
+    def total_area(self):
+        return self.exact_length * self.exact_width
+
+    @property
+    def is_ledger(self):
+        return 'ledger' in self.attachment_method
+
+    @property
+    def slope_percentage(self):
+        if self.slope_direction.lower() == 'level':
+            return 0.0
+        return (self.slope_amount_inches / (self.exact_length * 12)) * 100
+
+    @classmethod
+    def from_dict(cls, record):
+        """Parse a JSON/CSV project record or a user_responses dict.
+
+        A missing or blank attachment_method means 'ledger', the usual
+        attached deck. Raises ValueError for missing, non-numeric or
+        non-positive dimensions, a ledger_height or foundation_distance
+        with no number in it, or a start_date that isn't a date.
+        """
+        from construction_schedule import requested_start
+
+        if isinstance(record, MalformedRecord):
+            raise ValueError(record.error)
+
+        def number(key, default=None):
+            value = record.get(key, default)
+            if value is None or value == '':
+                raise ValueError(f"'{key}' is required")
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{key}' must be a number, got {value!r}")
+
+        length = number('exact_length')
+        width = number('exact_width')
+        if length <= 0 or width <= 0:
+            raise ValueError(f"deck dimensions must be positive, got {length:g} x {width:g}")
+        height = number('deck_height_inches')
+        if height < 0:
+            raise ValueError(f"'deck_height_inches' can't be negative, got {height:g}")
+
+        attachment = _text(record.get('attachment_method') or None, 'ledger').lower()
+        slope_direction = _text(record.get('slope_direction'), 'level')
+        ledger = 'ledger' in attachment
+        album_url = str(record.get('photo_album_url') or '').strip()
+        if album_url and not album_url.startswith('http'):
+            album_url = 'https://' + album_url
+        project_id = record.get('project_id')
+        start_date = _text(record.get('start_date'))
+        requested_start(start_date)
+
+        return cls(
+            project_id=None if project_id in (None, '') else str(project_id),
+            exact_length=length,
+            exact_width=width,
+            deck_height_inches=height,
+            attachment_method=attachment,
+            ledger_height=parse_measurement(record.get('ledger_height'), 'ledger_height') if ledger else None,
+            house_construction=_text(record.get('house_construction')) if ledger else None,
+            slope_direction=slope_direction,
+            slope_amount_inches=0.0 if slope_direction.lower() == 'level'
+            else number('slope_amount_inches', 0),
+            soil_type=_text(record.get('soil_type'), 'unknown'),
+            drainage_issues=_text(record.get('drainage_issues'), 'none'),
+            foundation_distance=parse_measurement(record.get('foundation_distance'),
+                                                  'foundation_distance'),
+            intended_use=_text(record.get('intended_use'), 'general'),
+            joist_material=_text(record.get('joist_material')),
+            decking_material=_text(record.get('decking_material')),
+            zip_code=_text(record.get('zip_code')),
+            start_date=start_date,
+            has_excavator=_flag(record.get('has_excavator', False)),
+            concrete_subcontract=_flag(record.get('concrete_subcontract', False)),
+            photo_album_url=album_url,
+            photo_album_description=_text(record.get('photo_album_description'))
+            if album_url else "Individual photos will be uploaded",
+        )
+
+    @classmethod
+    def from_json(cls, line):
+        return cls.from_dict(json.loads(line))
+
+    @classmethod
+    def from_template(cls, source):
+        """Parse a generated construction_specs_request_*.xml.
+
+        The template doesn't carry the project ID, so for a file path it
+        comes from the template catalog, or else from the file name.
+        """
+        from session_store import parse_template_responses
+
+        responses = parse_template_responses(source)
+        if isinstance(source, (str, os.PathLike)) and not responses.get('project_id'):
+            from template_catalog import TemplateCatalog
+
+            entry = TemplateCatalog().entry(source)
+            name = os.path.basename(os.fspath(source))
+            if entry and entry['project_id']:
+                responses['project_id'] = entry['project_id']
+            elif name.startswith(TEMPLATE_PREFIX) and name.endswith('.xml') \
+                    and not _TIMESTAMP_NAME.fullmatch(name[len(TEMPLATE_PREFIX):-len('.xml')]):
+                # Batch templates are named by project; interactive ones by time saved
+                responses['project_id'] = name[len(TEMPLATE_PREFIX):-len('.xml')]
+        return cls.from_dict(responses)
+
+    def to_dict(self):
+        """JSON-ready record; from_dict(to_dict()) round-trips"""
+        return {name: getattr(self, name) for name in self.__slots__
+                if getattr(self, name) is not None}
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    def to_responses(self):
+        """user_responses dict in the form the construction template expects"""
+        responses = {}
+        if self.project_id is not None:
+            responses['project_id'] = self.project_id
+        responses.update(
+            exact_length=self.exact_length,
+            exact_width=self.exact_width,
+            total_area=self.total_area,
+            deck_height_inches=self.deck_height_inches,
+            attachment_method=self.attachment_method,
+        )
+        if self.is_ledger:
+            responses['ledger_height'] = format_measurement(self.ledger_height)
+            responses['house_construction'] = self.house_construction
+        responses['slope_direction'] = self.slope_direction
+        if self.slope_direction.lower() != 'level':
+            responses['slope_amount_inches'] = self.slope_amount_inches
+            responses['slope_percentage'] = self.slope_percentage
+        responses.update(
+            soil_type=self.soil_type,
+            drainage_issues=self.drainage_issues,
+            foundation_distance=format_measurement(self.foundation_distance),
+            intended_use=self.intended_use,
+            joist_material=self.joist_material,
+            decking_material=self.decking_material,
+            zip_code=self.zip_code,
+            start_date=self.start_date,
+            has_excavator=self.has_excavator,
+            concrete_subcontract=self.concrete_subcontract,
+            photo_album_url=self.photo_album_url,
+            photo_album_description=self.photo_album_description,
+        )
+        return responses
+
+    def to_xml(self, planner=None):
+        """Construction specification template for this project"""
+        if planner is None:
+            from deck_planner import ConstructionDeckPlanner
+
+            planner = ConstructionDeckPlanner()
+        planner.user_responses = self.to_responses()
+        return planner.generate_construction_xml()
+
+    def __eq__(self, other):
+        if not isinstance(other, ProjectRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"ProjectRecord({self.project_id!r}, {self.exact_length:g}x{self.exact_width:g} ft, "
+                f"zip={self.zip_code!r})")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Project Store for Deckorator
+Columnar, memory-mapped storage of project fields for portfolio analytics.
+
+Each column is a flat binary file of fixed-width values in one directory.
+Text columns (ZIP code, materials, soil, attachment) are dictionary-encoded
+as 32-bit codes, so a filter such as "ZIP 22032 decks over 30 inches" is a
+comparison over two memory-mapped arrays, with no template files read and
+no per-row objects built. Records are appended in bulk; the dictionaries
+and project IDs live in small sidecar files.
+
+Filters use NumPy when it is installed (pip install numpy) and fall back
+to scanning memoryviews of the mapped files.
+
+Usage:
+    python3 project_store.py ingest STORE projects.jsonl templates/*.xml
+    python3 project_store.py query STORE zip_code=22032 deck_height_inches__gt=30
+"""
+
+import argparse
+import json
+import mmap
+import operator
+import os
+import sys
+from array import array
+from pathlib import Path
+
+from project_record import ProjectRecord
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMERIC_COLUMNS = ('exact_length', 'exact_width', 'total_area', 'deck_height_inches',
+                   'slope_percentage')
+CODED_COLUMNS = ('zip_code', 'joist_material', 'decking_material', 'soil_type',
+                 'attachment_method')
+TYPECODES = dict.fromkeys(NUMERIC_COLUMNS, 'd')
+TYPECODES.update(dict.fromkeys(CODED_COLUMNS, 'I'))
+
+OPERATORS = {
+    'eq': operator.eq, 'ne': operator.ne,
+    'gt': operator.gt, 'ge': operator.ge,
+    'lt': operator.lt, 'le': operator.le,
+}
+
+
+class ProjectStore:
+    """Append-only columnar store of project fields"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            self.dictionaries = json.loads((self.directory / 'dictionaries.json').read_text())
+        except FileNotFoundError:
+            self.dictionaries = {name: [] for name in CODED_COLUMNS}
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in self.dictionaries.items()}
+        self._maps = {}
+        self._views = {}
+
+    def _column_path(self, name):
+        return self.directory / f"{name}.col"
+
+    def __len__(self):
+        try:
+            return self._column_path(NUMERIC_COLUMNS[0]).stat().st_size // array('d').itemsize
+        except FileNotFoundError:
+            return 0
+
+    def _encode(self, name, value):
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.dictionaries[name])
+            self.dictionaries[name].append(value)
+        return code
+
+    def append(self, records):
+        """Add ProjectRecords (or record dicts); returns the number added"""
+        columns = {name: array(typecode) for name, typecode in TYPECODES.items()}
+        project_ids = []
+        for record in records:
+            if not isinstance(record, ProjectRecord):
+                record = ProjectRecord.from_dict(record)
+            for name in NUMERIC_COLUMNS:
+                columns[name].append(getattr(record, name))
+            for name in CODED_COLUMNS:
+                columns[name].append(self._encode(name, getattr(record, name)))
+            project_ids.append(record.project_id or '')
+        if not project_ids:
+            return 0
+
+        self.close()  # mapped views would not see the new rows
+        for name, values in columns.items():
+            with open(self._column_path(name), 'ab') as f:
+                values.tofile(f)
+        with open(self.directory / 'project_ids.txt', 'a', encoding='utf-8') as f:
+            f.writelines(project_id + '\n' for project_id in project_ids)
+        temporary = self.directory / f"dictionaries.{os.getpid()}.tmp"
+        temporary.write_text(json.dumps(self.dictionaries))
+        os.replace(temporary, self.directory / 'dictionaries.json')
+        return len(project_ids)
+
+    def column(self, name):
+        """Zero-copy view of a column: a read-only NumPy memmap, or a memoryview"""
+        view = self._views.get(name)
+        if view is None:
+            typecode = TYPECODES[name]
+            path = self._column_path(name)
+            if len(self) == 0:
+                view = np.zeros(0, dtype=typecode) if np is not None else memoryview(array(typecode))
+            elif np is not None:
+                view = np.memmap(path, dtype=typecode, mode='r')
+            else:
+                with open(path, 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                raw = memoryview(mapped)
+                view = raw.cast(typecode)
+                self._maps[name] = (mapped, raw)
+            self._views[name] = view
+        return view
+
+    def code(self, name, value):
+        """Dictionary code of a text value, or None if no project has it"""
+        return self._codes[name].get(str(value))
+
+    def decode(self, name, code):
+        return self.dictionaries[name][code]
+
+    def _condition(self, key, value):
+        """(column name, comparison, operand in column encoding) for one filter"""
+        name, _, op = key.partition('__')
+        op = op or 'eq'
+        if name not in TYPECODES or op not in OPERATORS:
+            raise ValueError(f"Unknown filter '{key}'")
+        if name in CODED_COLUMNS:
+            if op not in ('eq', 'ne'):
+                raise ValueError(f"'{name}' only supports equality filters")
+            code = self.code(name, value)
+            # A value no project has gets the next unused code, which matches nothing
+            return name, op, len(self.dictionaries[name]) if code is None else code
+        return name, op, float(value)
+
+    def select(self, **filters):
+        """Row numbers of projects matching every filter.
+
+        Filters are column=value or column__op=value with op one of
+        eq, ne, gt, ge, lt, le, e.g. select(zip_code='22032',
+        deck_height_inches__gt=30). Text columns support eq and ne.
+        """
+        conditions = [self._condition(key, value) for key, value in filters.items()]
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for name, op, operand in conditions:
+                mask &= OPERATORS[op](self.column(name), operand)
+            return np.flatnonzero(mask)
+
+        rows = range(len(self))
+        for name, op, operand in conditions:
+            column = self.column(name)
+            compare = OPERATORS[op]
+            rows = [row for row in rows if compare(column[row], operand)]
+        return list(rows)
+
+    def project_ids(self, rows=None):
+        with open(self.directory / 'project_ids.txt', 'r', encoding='utf-8') as f:
+            project_ids = f.read().splitlines()
+        return project_ids if rows is None else [project_ids[row] for row in rows]
+
+    def rows(self, rows, columns=None):
+        """Decoded field dicts for the given row numbers"""
+        columns = columns or NUMERIC_COLUMNS + CODED_COLUMNS
+        views = {name: self.column(name) for name in columns}
+        result = []
+        for row in rows:
+            values = {}
+            for name, view in views.items():
+                value = view[row]
+                values[name] = self.decode(name, int(value)) if name in CODED_COLUMNS else float(value)
+            result.append(values)
+        return result
+
+    def close(self):
+        for name, (mapped, raw) in self._maps.items():
+            # Views must be released before the mapping can be closed
+            self._views[name].release()
+            raw.release()
+            mapped.close()
+        self._maps.clear()
+        self._views.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_records(paths, skipped=None):
+    """ProjectRecords from JSONL/CSV record files and XML templates.
+
+    Invalid records and unreadable templates are skipped with a warning;
+    skipped, if given, is a list that gets one error message per skip.
+    """
+    from batch_planner import read_project_records
+
+    def skip(name, error):
+        print(f"⚠️  Skipping project {name}: {error}")
+        if skipped is not None:
+            skipped.append(str(error))
+
+    for path in paths:
+        if path.lower().endswith('.xml'):
+            try:
+                yield ProjectRecord.from_template(path)
+            except (OSError, SyntaxError, ValueError) as e:  # XML ParseError is a SyntaxError
+                skip(path, e)
+        else:
+            for record in read_project_records(path):
+                try:
+                    yield ProjectRecord.from_dict(record)
+                except ValueError as e:
+                    skip(record.get('project_id', '?'), e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar store of project fields")
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest = commands.add_parser('ingest', help="Append projects from records or templates")
+    ingest.add_argument('store')
+    ingest.add_argument('sources', nargs='+', help=".jsonl/.csv records or .xml templates")
+    query = commands.add_parser('query', help="List projects matching filters")
+    query.add_argument('store')
+    query.add_argument('filters', nargs='*', metavar='COLUMN[__OP]=VALUE')
+    args = parser.parse_args()
+
+    with ProjectStore(args.store) as store:
+        if args.command == 'ingest':
+            skipped = []
+            added = store.append(read_records(args.sources, skipped))
+            print(f"✅ Added {added} projects ({len(store)} total) to {args.store}")
+            if skipped:
+                print(f"❌ {len(skipped)} invalid project(s) skipped")
+                sys.exit(1)
+            return
+        filters = dict(condition.split('=', 1) for condition in args.filters)
+        try:
+            rows = store.select(**filters)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        project_ids = store.project_ids(rows)
+        for project_id, values in zip(project_ids, store.rows(rows)):
+            print(f"{project_id}\t{values['zip_code']}\t{values['exact_length']:g}x"
+                  f"{values['exact_width']:g} ft\t{values['deck_height_inches']:g} in")
+        print(f"📊 {len(project_ids)} of {len(store)} projects match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Response Cache for Deckorator
+Content-addressed on-disk cache of LLM responses.
+
+A response is keyed by a SHA-256 of the normalized template, the hashes of
+the attached photos, the model and max_tokens, so re-running the planner
+with the same answers and photos returns the saved response instead of
+paying for a new API call. Entries expire after a TTL and the cache is
+kept under a size limit by evicting the least recently used entries.
+"""
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = os.path.join('.deckorator_cache', 'responses')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+# generated_date changes every day without changing the request
+_VOLATILE_ELEMENTS = re.compile(r'<generated_date>[^<]*</generated_date>')
+_WHITESPACE = re.compile(r'\s+')
+
+_file_hashes = {}
+
+
+def normalize_template(template_content):
+    """Template text with volatile fields removed and whitespace collapsed"""
+    return _WHITESPACE.sub(' ', _VOLATILE_ELEMENTS.sub('', template_content)).strip()
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, memoized by path, size and mtime"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _file_hashes.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+        digest = _file_hashes[memo_key] = sha.hexdigest()
+    return digest
+
+
+def known_file_hash(path, size, mtime_ns):
+    """Digest file_hash already computed for this size and mtime, or None"""
+    return _file_hashes.get((os.path.abspath(path), size, mtime_ns))
+
+
+def remember_file_hash(path, size, mtime_ns, digest):
+    """Seed file_hash with a digest already known for this size and mtime"""
+    _file_hashes[(os.path.abspath(path), size, mtime_ns)] = digest
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of response texts with a TTL"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = None
+
+    def key(self, template_content, photos, model, max_tokens):
+        sha = hashlib.sha256()
+        for part in [normalize_template(template_content), model, str(max_tokens)]:
+            sha.update(part.encode('utf-8'))
+            sha.update(b'\0')
+        for photo in photos:
+            sha.update(file_hash(photo).encode('ascii'))
+        return sha.hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def get(self, key):
+        """Cached response text, or None on a miss"""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        now = time.time()
+        if now - stat.st_mtime > self.ttl_seconds:
+            self._remove(path, stat.st_size)
+            self.misses += 1
+            return None
+        text = path.read_text(encoding='utf-8')
+        # atime tracks recency for LRU eviction; mtime stays the creation time for the TTL
+        os.utime(path, (now, stat.st_mtime))
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = text.encode('utf-8')
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+        self._total_bytes = self.total_bytes() + len(data)
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for entry in self.directory.glob('*/*.txt'):
+            try:
+                yield entry, entry.stat()
+            except FileNotFoundError:
+                pass
+
+    def _remove(self, path, size):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        if self._total_bytes is not None:
+            self._total_bytes -= size
+
+    def total_bytes(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(stat.st_size for _, stat in self._entries())
+        return self._total_bytes
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        now = time.time()
+        entries = []
+        for path, stat in self._entries():
+            if now - stat.st_mtime > self.ttl_seconds:
+                self._remove(path, stat.st_size)
+                self.evictions += 1
+            else:
+                entries.append((stat.st_atime, stat.st_size, path))
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path, size)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'bytes': self.total_bytes(),
+        }
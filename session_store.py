@@ -0,0 +1,193 @@
+"""
+Session Store for Deckorator
+Resume planning sessions and keep their version history as deltas.
+
+A previous construction_specs_request_*.xml can be read back into
+user_responses with a streaming parse that stops as soon as the answers
+have been seen. Each saved version of a project's answers is appended to a
+per-project JSONL log as a delta (fields set and unset) rather than a full
+copy, with a full snapshot every SNAPSHOT_INTERVAL versions so replay stays
+short.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+DEFAULT_SESSION_DIR = os.path.join('.deckorator_cache', 'sessions')
+SNAPSHOT_INTERVAL = 50
+
+
+def _number(text):
+    return float(text)
+
+
+def _optional(text):
+    return None if text == 'N/A' else text
+
+
+# Template element -> (user_responses key, converter). Derived fields such as
+# total area and slope percentage are recomputed rather than parsed back.
+TEMPLATE_FIELDS = {
+    'length_feet': ('exact_length', _number),
+    'width_feet': ('exact_width', _number),
+    'height_above_ground_inches': ('deck_height_inches', _number),
+    'slope_direction': ('slope_direction', str),
+    'slope_amount_inches': ('slope_amount_inches', _number),
+    'soil_type': ('soil_type', str),
+    'drainage_issues': ('drainage_issues', str),
+    'distance_from_foundation_feet': ('foundation_distance', str),
+    'method': ('attachment_method', str),
+    'ledger_height_inches': ('ledger_height', _optional),
+    'house_construction': ('house_construction', _optional),
+    'intended_load': ('intended_use', str),
+    'joist_material': ('joist_material', str),
+    'decking_material': ('decking_material', str),
+    'album_url': ('photo_album_url', str),
+    'album_description': ('photo_album_description', str),
+    'jurisdiction': ('zip_code', lambda text: text.replace('Building department for ', '', 1)),
+    'start_date': ('start_date', str),
+    'equipment_rental_needed': ('has_excavator', lambda text: text == 'True'),
+    'subcontracted_work': ('concrete_subcontract', lambda text: text == 'Concrete pours'),
+}
+# Everything after this element is fixed template text
+_LAST_ANSWER_SECTION = 'construction_timeline'
+
+NUMERIC_FIELDS = frozenset({'exact_length', 'exact_width', 'deck_height_inches', 'slope_amount_inches'})
+FLAG_FIELDS = frozenset({'has_excavator', 'concrete_subcontract'})
+
+
+def parse_answer(key, text):
+    """Convert a typed answer to the type user_responses stores for key"""
+    text = text.strip()
+    if key in NUMERIC_FIELDS:
+        try:
+            return float(text)
+        except ValueError:
+            raise ValueError(f"'{key}' must be a number, got {text!r}")
+    if key in FLAG_FIELDS:
+        return text.lower() in ('yes', 'y', 'true', '1')
+    return text
+
+
+def parse_template_responses(source):
+    """Read user_responses back out of a generated construction template"""
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return parse_template_responses(f)
+
+    from xml.etree import ElementTree
+
+    responses = {}
+    for _, element in ElementTree.iterparse(source, events=('end',)):
+        field = TEMPLATE_FIELDS.get(element.tag)
+        if field is not None:
+            key, convert = field
+            value = convert(element.text or '')
+            if value is not None:
+                responses[key] = value
+        elif element.tag == _LAST_ANSWER_SECTION:
+            break
+        element.clear()
+
+    if 'exact_length' in responses and 'exact_width' in responses:
+        responses['total_area'] = responses['exact_length'] * responses['exact_width']
+    if responses.get('slope_direction', 'level').lower() == 'level':
+        responses.pop('slope_amount_inches', None)
+    elif 'slope_amount_inches' in responses:
+        responses['slope_percentage'] = \
+            (responses['slope_amount_inches'] / (responses['exact_length'] * 12)) * 100
+    return responses
+
+
+def diff_responses(old, new):
+    """Delta that turns old into new: {'set': {...}, 'unset': [...]}"""
+    delta = {}
+    changed = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    if changed:
+        delta['set'] = changed
+    if removed:
+        delta['unset'] = removed
+    return delta
+
+
+def apply_delta(responses, delta):
+    """Apply a diff_responses() delta in place and return responses"""
+    responses.update(delta.get('set', {}))
+    for key in delta.get('unset', ()):
+        responses.pop(key, None)
+    return responses
+
+
+class SessionStore:
+    """Per-project version history of user_responses, stored as deltas"""
+
+    def __init__(self, directory=DEFAULT_SESSION_DIR):
+        self.directory = Path(directory)
+        self._latest = {}  # session id -> (version, responses) of the last entry
+
+    def _path(self, session_id):
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(session_id))
+        return self.directory / f"{safe_id}.jsonl"
+
+    def _entries(self, session_id):
+        try:
+            with open(self._path(session_id), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def load(self, session_id, version=None):
+        """(version, responses) at the given or latest version; (0, {}) if none"""
+        if version is None and session_id in self._latest:
+            current_version, responses = self._latest[session_id]
+            return current_version, dict(responses)
+        current_version, responses = 0, {}
+        for entry in self._entries(session_id):
+            if version is not None and entry['version'] > version:
+                break
+            if 'snapshot' in entry:
+                responses = dict(entry['snapshot'])
+            else:
+                apply_delta(responses, entry)
+            current_version = entry['version']
+        if version is None:
+            self._latest[session_id] = (current_version, dict(responses))
+        return current_version, responses
+
+    def save(self, session_id, responses):
+        """Append responses as a new version; returns its number.
+
+        Nothing is written when the responses equal the latest version.
+        """
+        current_version, previous = self.load(session_id)
+        delta = diff_responses(previous, responses)
+        if current_version and not delta:
+            return current_version
+        version = current_version + 1
+        entry = {'version': version, 'timestamp': time.time()}
+        if current_version == 0 or version % SNAPSHOT_INTERVAL == 0:
+            entry['snapshot'] = responses
+        else:
+            entry.update(delta)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._path(session_id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self._latest[session_id] = (version, dict(responses))
+        return version
+
+    def versions(self, session_id):
+        """(version, timestamp, changed keys) for each saved version"""
+        history = []
+        for entry in self._entries(session_id):
+            if 'snapshot' in entry:
+                keys = sorted(entry['snapshot'])
+            else:
+                keys = sorted(entry.get('set', {})) + sorted(entry.get('unset', []))
+            history.append((entry['version'], entry['timestamp'], keys))
+        return history
@@ -40,11 +40,36 @@ echo "📁 Created project directory: $PROJECT_DIR"
 echo "📥 Downloading deck planner..."
 curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/deck_planner.py" -o deck_planner.py
 
+echo "📥 Downloading template engine..."
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/template_engine.py" -o template_engine.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/xml_writer.py" -o xml_writer.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/structural_calcs.py" -o structural_calcs.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/template_catalog.py" -o template_catalog.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/session_store.py" -o session_store.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/project_record.py" -o project_record.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/material_takeoff.py" -o material_takeoff.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/cut_list.py" -o cut_list.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/instrumentation.py" -o instrumentation.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/construction_schedule.py" -o construction_schedule.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/construction_phase_checklist.md" -o construction_phase_checklist.md
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/climate.py" -o climate.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/location_config.json" -o location_config.json
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/seasonal_planning_guide.md" -o seasonal_planning_guide.md
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/grading.py" -o grading.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/compliance.py" -o compliance.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/compliance_rules.json" -o compliance_rules.json
+mkdir -p templates
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/templates/construction_spec.xml" -o templates/construction_spec.xml
+
 echo "📥 Downloading LLM submission helper..."
 curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/llm_submit.py" -o llm_submit.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/response_cache.py" -o response_cache.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/photo_pipeline.py" -o photo_pipeline.py
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/photo_scanner.py" -o photo_scanner.py
 
 echo "📥 Downloading supplier database..."
 curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/suppliers_database.json" -o suppliers_database.json
+curl -s -L "https://raw.githubusercontent.com/pem725/deckorator/main/supplier_index.py" -o supplier_index.py
 
 # Make scripts executable
 chmod +x deck_planner.py llm_submit.py
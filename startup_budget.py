@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup Budget for Deckorator
+Check that the command-line entry points still start fast.
+
+Job runners shell out to the planner once per project, so import time is
+paid thousands of times. Each entry point is imported in a fresh
+interpreter with `python -X importtime`; the check fails if its cumulative
+import time (median of several runs) goes over budget, or if a heavy module
+that only some code paths need is imported at startup.
+
+Usage:
+    python3 startup_budget.py              # exit status 1 on a regression
+    python3 startup_budget.py --scale 2    # slower machine, double the budgets
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Cumulative import time budget (ms) per entry point
+STARTUP_BUDGET_MS = {
+    'deck_planner': 80,
+    'llm_submit': 60,
+    'batch_planner': 80,
+}
+
+# Modules that must only load on the code paths that use them
+LAZY_MODULES = (
+    'requests',
+    'xml.etree.ElementTree',
+    'xml.sax.saxutils',
+    'base64',
+    'numpy',
+    'PIL',
+    'sqlite3',
+    'structural_calcs',
+    'material_takeoff',
+    'cut_list',
+    'climate',
+    'compliance',
+    'construction_schedule',
+)
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_profile(module):
+    """(cumulative import time in ms, names of all modules imported) for one cold start"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=REPO_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    total_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        imported.add(name.strip())
+        if name.strip() == module and not name.startswith('  '):
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+
+def check(modules=None, runs=5, scale=1.0):
+    """Problems found for each entry point, as {module: [message, ...]}"""
+    problems = {}
+    for module in modules or STARTUP_BUDGET_MS:
+        profiles = [import_profile(module) for _ in range(runs)]
+        median_ms = statistics.median(ms for ms, _ in profiles)
+        budget_ms = STARTUP_BUDGET_MS[module] * scale
+        found = []
+        if median_ms > budget_ms:
+            found.append(f"imports in {median_ms:.0f} ms, budget is {budget_ms:.0f} ms")
+        eager = [name for name in LAZY_MODULES if name in profiles[0][1]]
+        if eager:
+            found.append(f"imports {', '.join(eager)} at startup")
+        print(f"{'❌' if found else '✅'} {module}: {median_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+        problems[module] = found
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry point startup time")
+    parser.add_argument('modules', nargs='*',
+                        help=f"Entry points to check (default: {', '.join(STARTUP_BUDGET_MS)})")
+    parser.add_argument('--runs', type=int, default=5, help="Cold starts per entry point (default: 5)")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Multiply every budget, for slower machines (default: 1)")
+    args = parser.parse_args()
+    unknown = [module for module in args.modules if module not in STARTUP_BUDGET_MS]
+    if unknown:
+        parser.error(f"no startup budget for {', '.join(unknown)}")
+
+    problems = check(args.modules, args.runs, args.scale)
+    failed = False
+    for module, found in problems.items():
+        for message in found:
+            print(f"   {module} {message}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Structural Calculations for Deckorator
+Joist spacing, beam sizing and footer layout computed from the project
+dimensions, returned as numbers for the XML layer to format.
+
+calculate_structure() handles one project in plain Python (no third-party
+packages). calculate_batch() computes the same results for whole arrays of
+projects at once with NumPy, for nightly re-estimation of stored projects.
+
+The span tables are simplified from IRC 2018 Tables R507.5/R507.6 for
+No. 2 Southern pine at 40 psf live + 10 psf dead load. They are a starting
+point for the AI and the estimator, not a substitute for local code review.
+"""
+
+import math
+import re
+from bisect import bisect_left
+
+# Joist sizes and maximum joist span (feet) at 12/16/24 inches on center
+JOIST_SIZES = ('2x6', '2x8', '2x10', '2x12')
+JOIST_SPACINGS = (12, 16, 24)
+JOIST_SPANS = (
+    (9.92, 9.0, 7.58),     # 2x6
+    (13.08, 11.83, 9.92),  # 2x8
+    (16.17, 14.0, 11.42),  # 2x10
+    (18.0, 16.5, 13.5),    # 2x12
+)
+
+# Maximum joist spacing (inches) the decking boards can bridge
+DECKING_MAX_SPACING = (
+    ('5/4', 16),
+    ('2x6', 24),
+    ('composite', 16),
+)
+DEFAULT_DECKING_MAX_SPACING = 16
+
+# Beam sizes (cheapest first) and maximum post spacing (feet) by joist span
+BEAM_SIZES = ('2-2x8', '2-2x10', '2-2x12', '3-2x10', '3-2x12')
+BEAM_JOIST_SPANS = (6, 8, 10, 12, 14, 16, 18)
+BEAM_POST_SPACING = (
+    (8.33, 7.17, 6.42, 5.83, 5.42, 5.08, 4.75),      # 2-2x8
+    (10.17, 8.83, 7.83, 7.17, 6.67, 6.17, 5.83),     # 2-2x10
+    (11.83, 10.25, 9.17, 8.33, 7.75, 7.25, 6.83),    # 2-2x12
+    (12.75, 11.0, 9.83, 9.0, 8.33, 7.75, 7.33),      # 3-2x10
+    (14.75, 12.75, 11.42, 10.42, 9.67, 9.0, 8.5),    # 3-2x12
+)
+TARGET_POST_SPACING_FT = 8.0
+
+# Presumptive soil bearing capacity (psf), IRC Table R401.4.1
+SOIL_BEARING_PSF = (
+    ('clay', 1500),
+    ('sand', 2000),
+    ('loam', 2000),
+    ('gravel', 3000),
+    ('rock', 3000),
+)
+DEFAULT_SOIL_BEARING_PSF = 1500
+
+DESIGN_LOAD_PSF = 50             # 40 psf live + 10 psf dead
+FOOTER_DIAMETERS_IN = (12, 16, 18, 20, 24)
+MIN_FOOTER_DEPTH_IN = 12
+DEFAULT_FROST_DEPTH_IN = 24      # Fairfax County: 18-24 inches
+CONCRETE_BAG_YIELD_CUFT = 0.6    # one 80 lb bag
+
+
+def joist_size_code(material):
+    """Index into JOIST_SIZES for a material description, or -1 if unknown"""
+    match = re.search(r'2\s*x\s*(6|8|10|12)\b', material or '', re.IGNORECASE)
+    return JOIST_SIZES.index(f"2x{match.group(1)}") if match else -1
+
+
+def _lookup_by_keyword(table, text, default):
+    text = (text or '').lower()
+    for keyword, value in table:
+        if keyword in text:
+            return value
+    return default
+
+
+def decking_max_spacing(material):
+    """Widest joist spacing (inches) a decking material allows"""
+    return _lookup_by_keyword(DECKING_MAX_SPACING, material, DEFAULT_DECKING_MAX_SPACING)
+
+
+def soil_bearing(soil_type):
+    """Presumptive bearing capacity (psf) for a soil description"""
+    return _lookup_by_keyword(SOIL_BEARING_PSF, soil_type, DEFAULT_SOIL_BEARING_PSF)
+
+
+def is_heavy_load(intended_use):
+    """Loads beyond the 40 psf tables (hot tubs) always need an engineer"""
+    return 'hot tub' in (intended_use or '').lower()
+
+
+class StructuralResult:
+    """Numeric structural results for one project"""
+
+    __slots__ = (
+        'joist_size', 'joist_spacing_in', 'joist_span_ft', 'joist_span_count',
+        'beam_rows', 'beam_size', 'post_spacing_ft', 'posts_per_row',
+        'footer_count', 'footer_diameter_in', 'footer_depth_in',
+        'concrete_cuft_per_hole', 'concrete_cuft_total', 'concrete_bags',
+        'footer_positions', 'requires_engineering',
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def calculate_structure(length, width, joist_material='', decking_material='',
+                        attachment_method='ledger', intended_use='', soil_type='',
+                        frost_depth_in=DEFAULT_FROST_DEPTH_IN):
+    """Structural layout for one deck.
+
+    Joists span the width (ledger or beam to beam); beams run the length.
+    Footer positions are (x, y) in feet from the house-side corner.
+    """
+    size = joist_size_code(joist_material)
+    spans = JOIST_SPANS[size if size >= 0 else len(JOIST_SIZES) - 1]
+    max_spacing = decking_max_spacing(decking_material)
+    attached = 'ledger' in (attachment_method or '').lower()
+
+    # Joists: split the width into equal spans the joist size can cover
+    span_count = max(math.ceil(width / spans[0]), 1)
+    joist_span = width / span_count
+    spacing = 0
+    for candidate, allowed_span in zip(JOIST_SPACINGS, spans):
+        if candidate <= max_spacing and allowed_span >= joist_span:
+            spacing = candidate
+    beam_rows = span_count + (0 if attached else 1)
+
+    # Beams: cheapest beam that reaches the target post spacing
+    bucket = min(bisect_left(BEAM_JOIST_SPANS, joist_span), len(BEAM_JOIST_SPANS) - 1)
+    beam = len(BEAM_SIZES) - 1
+    for index, row in enumerate(BEAM_POST_SPACING):
+        if row[bucket] >= TARGET_POST_SPACING_FT:
+            beam = index
+            break
+    allowable = BEAM_POST_SPACING[beam][bucket]
+    posts = math.ceil(length / allowable) + 1
+    post_spacing = length / (posts - 1)
+
+    # Footers: size each hole for its tributary load on this soil. Edge
+    # beams carry half a joist span; interior beams carry a full one.
+    tributary_width = joist_span if span_count > 1 else joist_span / 2
+    load = post_spacing * tributary_width * DESIGN_LOAD_PSF
+    diameter_needed = math.sqrt(4 * (load / soil_bearing(soil_type)) / math.pi) * 12
+    diameter_index = bisect_left(FOOTER_DIAMETERS_IN, diameter_needed)
+    diameter = FOOTER_DIAMETERS_IN[min(diameter_index, len(FOOTER_DIAMETERS_IN) - 1)]
+    depth = max(frost_depth_in, MIN_FOOTER_DEPTH_IN)
+    per_hole = math.pi * (diameter / 2) ** 2 * depth / 1728
+    footer_count = beam_rows * posts
+
+    first_row = 1 if attached else 0
+    rows_y = [width * row / span_count for row in range(first_row, span_count + 1)]
+    positions = [(post * post_spacing, y) for y in rows_y for post in range(posts)]
+
+    return StructuralResult(
+        joist_size=JOIST_SIZES[size] if size >= 0 else '',
+        joist_spacing_in=spacing,
+        joist_span_ft=joist_span,
+        joist_span_count=span_count,
+        beam_rows=beam_rows,
+        beam_size=BEAM_SIZES[beam],
+        post_spacing_ft=post_spacing,
+        posts_per_row=posts,
+        footer_count=footer_count,
+        footer_diameter_in=diameter,
+        footer_depth_in=depth,
+        concrete_cuft_per_hole=per_hole,
+        concrete_cuft_total=per_hole * footer_count,
+        concrete_bags=math.ceil(per_hole * footer_count / CONCRETE_BAG_YIELD_CUFT),
+        footer_positions=positions,
+        requires_engineering=(
+            size < 0 or spacing == 0 or is_heavy_load(intended_use)
+            or joist_span > BEAM_JOIST_SPANS[-1]
+            or diameter_index >= len(FOOTER_DIAMETERS_IN)),
+    )
+
+
+def _numpy():
+    """NumPy, imported only when a batch calculation needs it"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("NumPy is required for batch calculations: pip install numpy") from None
+    return numpy
+
+
+def batch_inputs(projects):
+    """Encode project response dicts as the arrays calculate_batch() takes.
+
+    Frost depth is the project's frost_depth_in, or the design frost line
+    for its ZIP code.
+    """
+    from climate import design_frost_depth
+
+    np = _numpy()
+    projects = list(projects)
+    return {
+        'length': np.array([float(p['exact_length']) for p in projects]),
+        'width': np.array([float(p['exact_width']) for p in projects]),
+        'joist_size': np.array([joist_size_code(p.get('joist_material')) for p in projects], dtype=np.int8),
+        'decking_max_spacing': np.array([decking_max_spacing(p.get('decking_material')) for p in projects]),
+        'attached': np.array(['ledger' in (p.get('attachment_method') or '').lower() for p in projects]),
+        'bearing_psf': np.array([soil_bearing(p.get('soil_type')) for p in projects], dtype=float),
+        'heavy_load': np.array([is_heavy_load(p.get('intended_use')) for p in projects]),
+        'frost_depth_in': np.array([float(p.get('frost_depth_in') or design_frost_depth(p.get('zip_code')))
+                                    for p in projects]),
+    }
+
+
+def calculate_batch(length, width, joist_size, decking_max_spacing, attached,
+                    bearing_psf, heavy_load, frost_depth_in):
+    """Vectorized calculate_structure() over arrays of projects.
+
+    Returns a dict of equal-length arrays with the StructuralResult fields
+    (beam_size as an index into BEAM_SIZES, no per-footer positions).
+    """
+    np = _numpy()
+    length = np.asarray(length, dtype=float)
+    width = np.asarray(width, dtype=float)
+    joist_size = np.asarray(joist_size)
+    attached = np.asarray(attached, dtype=bool)
+    rows = np.arange(len(length))
+
+    spans = np.asarray(JOIST_SPANS)[np.where(joist_size >= 0, joist_size, len(JOIST_SIZES) - 1)]
+    span_count = np.maximum(np.ceil(width / spans[:, 0]), 1)
+    joist_span = width / span_count
+    spacings = np.asarray(JOIST_SPACINGS)
+    allowed = (spans >= joist_span[:, None]) & (spacings <= np.asarray(decking_max_spacing)[:, None])
+    spacing = np.where(allowed, spacings, 0).max(axis=1)
+    beam_rows = span_count + ~attached
+
+    bucket = np.minimum(np.searchsorted(BEAM_JOIST_SPANS, joist_span), len(BEAM_JOIST_SPANS) - 1)
+    beam_spacing = np.asarray(BEAM_POST_SPACING)[:, bucket].T
+    reaches_target = beam_spacing >= TARGET_POST_SPACING_FT
+    beam = np.where(reaches_target.any(axis=1), reaches_target.argmax(axis=1), len(BEAM_SIZES) - 1)
+    posts = np.ceil(length / beam_spacing[rows, beam]) + 1
+    post_spacing = length / (posts - 1)
+
+    tributary_width = np.where(span_count > 1, joist_span, joist_span / 2)
+    load = post_spacing * tributary_width * DESIGN_LOAD_PSF
+    diameter_needed = np.sqrt(4 * (load / np.asarray(bearing_psf)) / np.pi) * 12
+    diameter_index = np.searchsorted(FOOTER_DIAMETERS_IN, diameter_needed)
+    diameter = np.asarray(FOOTER_DIAMETERS_IN)[np.minimum(diameter_index, len(FOOTER_DIAMETERS_IN) - 1)]
+    depth = np.maximum(np.asarray(frost_depth_in, dtype=float), MIN_FOOTER_DEPTH_IN)
+    per_hole = np.pi * (diameter / 2) ** 2 * depth / 1728
+    footer_count = beam_rows * posts
+
+    return {
+        'joist_spacing_in': spacing,
+        'joist_span_ft': joist_span,
+        'joist_span_count': span_count.astype(np.int32),
+        'beam_rows': beam_rows.astype(np.int32),
+        'beam_size': beam.astype(np.int8),
+        'post_spacing_ft': post_spacing,
+        'posts_per_row': posts.astype(np.int32),
+        'footer_count': footer_count.astype(np.int32),
+        'footer_diameter_in': diameter,
+        'footer_depth_in': depth,
+        'concrete_cuft_per_hole': per_hole,
+        'concrete_cuft_total': per_hole * footer_count,
+        'concrete_bags': np.ceil(per_hole * footer_count / CONCRETE_BAG_YIELD_CUFT).astype(np.int32),
+        'requires_engineering': (
+            (joist_size < 0) | (spacing == 0) | np.asarray(heavy_load, dtype=bool)
+            | (joist_span > BEAM_JOIST_SPANS[-1])
+            | (diameter_index >= len(FOOTER_DIAMETERS_IN))),
+    }
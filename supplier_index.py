@@ -0,0 +1,163 @@
+"""
+Supplier Index for Deckorator
+Shared, indexed supplier lookups over suppliers_database.json and the
+material_suppliers_<zip>.json location files.
+
+The database is parsed once per process and shared by every planner. It is
+reloaded automatically when a source file's mtime changes. Lookups fall back
+from an exact ZIP match to the closest ZIP with the same 3-digit prefix, and
+then to the "default" entry.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left, bisect_right
+from glob import glob
+
+DEFAULT_SUPPLIERS = {
+    "22032": {
+        "area": "Burke/Fairfax, Virginia",
+        "suppliers": ["Home Depot Burke", "Lowe's Burke", "Superior Building Supply"]
+    },
+    "default": {
+        "area": "Your local area",
+        "suppliers": ["Home Depot", "Lowe's", "Local lumber yards"]
+    }
+}
+
+_shared_indexes = {}
+
+
+class SupplierIndex:
+    """In-memory supplier index with exact, prefix and radius lookups"""
+
+    def __init__(self, path='suppliers_database.json', check_interval=1.0):
+        self.path = os.path.abspath(path)  # reloads still find it after a chdir
+        self.locations_pattern = os.path.join(os.path.dirname(path), 'material_suppliers_*.json')
+        self.check_interval = check_interval
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.max_lookup_seconds = 0.0
+        self.matches = {'exact': 0, 'prefix': 0, 'default': 0}
+        self._load()
+
+    def _source_mtimes(self):
+        mtimes = {}
+        for source in [self.path] + sorted(glob(self.locations_pattern)):
+            try:
+                mtimes[source] = os.stat(source).st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def _load(self):
+        self._mtimes = self._source_mtimes()
+        self._next_check = time.monotonic() + self.check_interval
+
+        try:
+            with open(self.path, 'r') as f:
+                self.database = json.load(f)
+        except FileNotFoundError:
+            self.database = DEFAULT_SUPPLIERS
+        self.default = self.database.get('default', DEFAULT_SUPPLIERS['default'])
+
+        # 3-digit prefix -> sorted numeric ZIPs, for closest-ZIP fallback
+        self._by_prefix = {}
+        for zip_code in self.database:
+            if len(zip_code) == 5 and zip_code.isdigit():
+                self._by_prefix.setdefault(zip_code[:3], []).append(int(zip_code))
+        for zips in self._by_prefix.values():
+            zips.sort()
+
+        # ZIP -> (sorted distances, locations) from material_suppliers_<zip>.json
+        self._locations = {}
+        for source in self._mtimes:
+            if source == self.path:
+                continue
+            with open(source, 'r') as f:
+                data = json.load(f)
+            locations = sorted(self._flatten_locations(data.get('suppliers', {})),
+                               key=lambda location: location['distance_miles'])
+            self._locations[str(data.get('zip_code', ''))] = (
+                [location['distance_miles'] for location in locations], locations)
+
+    @staticmethod
+    def _flatten_locations(categories):
+        """Yield one record per physical supplier location with a distance"""
+        for category, suppliers in categories.items():
+            for supplier in suppliers:
+                for location in supplier.get('locations', [supplier]):
+                    if 'distance_miles' not in location:
+                        continue
+                    record = {'name': supplier['name'], 'category': category}
+                    record.update((key, value) for key, value in location.items() if key != 'locations')
+                    yield record
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        if self._source_mtimes() != self._mtimes:
+            self._load()
+
+    def _match(self, zip_code):
+        entry = self.database.get(zip_code)
+        if entry is not None and zip_code != 'default':
+            return entry, 'exact'
+        zips = self._by_prefix.get(zip_code[:3]) if zip_code[:5].isdigit() else None
+        if zips:
+            target = int(zip_code[:5])
+            position = bisect_left(zips, target)
+            candidates = zips[max(position - 1, 0):position + 1]
+            closest = min(candidates, key=lambda candidate: abs(candidate - target))
+            return self.database[f"{closest:05d}"], 'prefix'
+        return self.default, 'default'
+
+    def lookup(self, zip_code):
+        """Supplier entry for a ZIP code: exact, then same 3-digit prefix, then default"""
+        return self.lookup_with_match(zip_code)[0]
+
+    def lookup_with_match(self, zip_code):
+        """Like lookup(), but also returns how it matched: exact, prefix or default"""
+        start = time.perf_counter()
+        self._maybe_reload()
+        entry, match = self._match(str(zip_code).strip())
+        elapsed = time.perf_counter() - start
+        self.lookups += 1
+        self.lookup_seconds += elapsed
+        if elapsed > self.max_lookup_seconds:
+            self.max_lookup_seconds = elapsed
+        self.matches[match] += 1
+        return entry, match
+
+    def nearest_locations(self, zip_code, radius_miles=None, limit=None):
+        """Supplier locations for a ZIP, nearest first, optionally within a radius"""
+        self._maybe_reload()
+        distances, locations = self._locations.get(str(zip_code).strip(), ([], []))
+        end = len(locations) if radius_miles is None else bisect_right(distances, radius_miles)
+        if limit is not None:
+            end = min(end, limit)
+        return locations[:end]
+
+    def stats(self):
+        """Lookup counts and latency in microseconds"""
+        return {
+            'lookups': self.lookups,
+            'matches': dict(self.matches),
+            'avg_lookup_us': self.lookup_seconds / self.lookups * 1e6 if self.lookups else 0.0,
+            'max_lookup_us': self.max_lookup_seconds * 1e6,
+            'zip_codes': len(self.database),
+            'location_zip_codes': len(self._locations),
+        }
+
+
+def get_supplier_index(path='suppliers_database.json'):
+    """The process-wide SupplierIndex for a database file"""
+    key = os.path.abspath(path)
+    index = _shared_indexes.get(key)
+    if index is None:
+        index = SupplierIndex(key)
+        _shared_indexes[key] = index
+    return index
@@ -0,0 +1,175 @@
+"""
+Template Catalog for Deckorator
+SQLite index of generated templates.
+
+Every saved template is recorded with its project ID, ZIP code, template
+version, timestamp, path and checksum, so "latest", "by project" and "by
+ZIP" lookups are indexed queries instead of globbing and stat-ing every XML
+file in the folder. Templates written before the catalog existed are picked
+up by import_directory().
+"""
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+
+DEFAULT_CATALOG = os.path.join('.deckorator_cache', 'template_catalog.sqlite3')
+TEMPLATE_PATTERNS = ('construction_specs_request_*.xml', 'deck_plan_request_*.xml')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    project_id TEXT,
+    zip_code TEXT,
+    version TEXT,
+    created_at REAL NOT NULL,
+    checksum TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS templates_by_time ON templates (created_at);
+CREATE INDEX IF NOT EXISTS templates_by_project ON templates (project_id, created_at);
+CREATE INDEX IF NOT EXISTS templates_by_zip ON templates (zip_code, created_at);
+"""
+
+_COLUMNS = ('path', 'project_id', 'zip_code', 'version', 'created_at', 'checksum')
+
+# Fields recoverable from a template's text when importing untracked files
+_VERSION = re.compile(r'<template_version>([^<]*)</template_version>')
+_ZIP = re.compile(r'<zip_code>([^<]*)</zip_code>|Building department for ([^<]*)</jurisdiction>')
+
+
+def checksum(content):
+    """SHA-256 of template text"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ChecksumWriter:
+    """Text stream wrapper that hashes everything written through it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._sha = hashlib.sha256()
+
+    def write(self, text):
+        self._sha.update(text.encode('utf-8'))
+        return self.stream.write(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def hexdigest(self):
+        return self._sha.hexdigest()
+
+
+class TemplateCatalog:
+    """Indexed record of generated template files"""
+
+    def __init__(self, path=DEFAULT_CATALOG):
+        self.path = Path(path)
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            import sqlite3
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), timeout=30)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record(self, path, content_checksum, project_id=None, zip_code=None, version=None,
+               created_at=None):
+        """Add or replace the entry for one template file"""
+        self.record_many([{'path': path, 'checksum': content_checksum, 'project_id': project_id,
+                           'zip_code': zip_code, 'version': version, 'created_at': created_at}])
+
+    def record_many(self, entries):
+        """Add or replace entries (dicts with _COLUMNS keys) in one transaction"""
+        now = time.time()
+        rows = [(os.path.abspath(entry['path']), entry.get('project_id'), entry.get('zip_code'),
+                 entry.get('version'), entry.get('created_at') or now, entry['checksum'])
+                for entry in entries]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO templates ({', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+
+    def find(self, project_id=None, zip_code=None, limit=None):
+        """Catalog entries, newest first, optionally for one project or ZIP"""
+        conditions = []
+        parameters = []
+        if project_id is not None:
+            conditions.append('project_id = ?')
+            parameters.append(str(project_id))
+        if zip_code is not None:
+            conditions.append('zip_code = ?')
+            parameters.append(str(zip_code))
+        query = f"SELECT {', '.join(_COLUMNS)} FROM templates"
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY created_at DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            parameters.append(int(limit))
+        return [dict(row) for row in self.connection.execute(query, parameters)]
+
+    def entry(self, path):
+        """Catalog entry for a template file, or None"""
+        row = self.connection.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM templates WHERE path = ?",
+            (os.path.abspath(path),)).fetchone()
+        return dict(row) if row else None
+
+    def latest(self, project_id=None, zip_code=None):
+        """Path of the newest template that still exists on disk, or None.
+
+        Entries whose file has been deleted are dropped as they are found.
+        """
+        while True:
+            entries = self.find(project_id, zip_code, limit=1)
+            if not entries:
+                return None
+            if os.path.exists(entries[0]['path']):
+                return entries[0]['path']
+            self.remove(entries[0]['path'])
+
+    def remove(self, path):
+        with self.connection:
+            self.connection.execute('DELETE FROM templates WHERE path = ?', (os.path.abspath(path),))
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM templates').fetchone()[0]
+
+    def import_directory(self, directory='.', patterns=TEMPLATE_PATTERNS):
+        """Record template files in directory that are not in the catalog yet"""
+        known = {row[0] for row in self.connection.execute('SELECT path FROM templates')}
+        entries = []
+        for pattern in patterns:
+            for path in Path(directory).glob(pattern):
+                path = os.path.abspath(path)
+                if path in known:
+                    continue
+                content = Path(path).read_text(encoding='utf-8')
+                version = _VERSION.search(content)
+                zip_match = _ZIP.search(content)
+                entries.append({
+                    'path': path,
+                    'checksum': checksum(content),
+                    'version': version.group(1) if version else None,
+                    'zip_code': (zip_match.group(1) or zip_match.group(2)) if zip_match else None,
+                    'created_at': os.path.getmtime(path),
+                })
+        if entries:
+            self.record_many(entries)
+        return len(entries)
@@ -0,0 +1,79 @@
+"""
+Template Engine for Deckorator
+Compiled, cached XML templates used by the planners.
+
+Templates live in the templates/ directory and use str.format-style slots
+such as {exact_length} or {slope_percentage:.2f}. Each file is parsed once
+per process into static chunks and slots, and the pieces are compiled into
+a single tuple expression, so rendering only formats the slot values.
+
+Slot values in XML templates are escaped as character data; pass
+xml_writer.Markup for values that are already XML fragments.
+"""
+
+from pathlib import Path
+from string import Formatter
+
+from xml_writer import xml_text
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+
+_template_cache = {}
+
+
+class CompiledTemplate:
+    """A template pre-split into static chunks and value slots"""
+
+    def __init__(self, text, name='<string>', escape=False):
+        self.name = name
+        self.escape = escape
+        self.chunks = []
+        self.slots = []
+        namespace = {'_text': xml_text}
+        pieces = []
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if literal:
+                self.chunks.append(literal)
+                namespace[f'_chunk{len(self.chunks)}'] = literal
+                pieces.append(f'_chunk{len(self.chunks)}')
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(f"{name}: slot {{{field}}} must be a plain name")
+            if conversion not in (None, 's', 'r'):
+                raise ValueError(f"{name}: unsupported conversion !{conversion} in {{{field}}}")
+            self.slots.append((field, spec or '', conversion))
+            value = f'values[{field!r}]'
+            if conversion == 'r':
+                value = f'repr({value})'
+            if escape:
+                pieces.append(f'_text({value}, {spec!r})')
+            else:
+                pieces.append(f'format({value}, {spec!r})' if spec else f'str({value})')
+        self.field_names = frozenset(field for field, _, _ in self.slots)
+
+        source = "def pieces(values):\n    return (" + (', '.join(pieces) or "''") + ",)\n"
+        exec(compile(source, f'<template {name}>', 'exec'), namespace)
+        self._pieces = namespace['pieces']
+
+    def render(self, values):
+        """Render the template with a mapping of slot values"""
+        return ''.join(self._pieces(values))
+
+    def render_to(self, stream, values):
+        """Write the rendered template to a text stream piece by piece"""
+        stream.writelines(self._pieces(values))
+
+
+def load_template(name):
+    """Load and compile templates/<name>.xml, once per process"""
+    template = _template_cache.get(name)
+    if template is None:
+        path = TEMPLATE_DIR / f"{name}.xml"
+        text = path.read_text(encoding='utf-8')
+        # The file's final newline is not part of the template
+        if text.endswith('\n'):
+            text = text[:-1]
+        template = CompiledTemplate(text, name, escape=True)
+        _template_cache[name] = template
+    return template
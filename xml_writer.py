@@ -0,0 +1,96 @@
+"""
+XML Writer for Deckorator
+Escaping, streaming output and well-formedness checks for generated XML.
+
+User answers such as drainage_issues or photo_album_description can contain
+'&' or '<'. Everything that ends up in a template goes through xml_text(),
+unless it is already-built markup wrapped in Markup.
+"""
+
+from xml.parsers import expat
+
+
+class Markup(str):
+    """A string that is already valid XML and must not be escaped again"""
+    __slots__ = ()
+
+
+def xml_text(value, spec=''):
+    """Format a value for use as XML character data"""
+    if isinstance(value, Markup):
+        return value
+    text = format(value, spec)
+    if '&' in text or '<' in text or '>' in text:
+        # Same as xml.sax.saxutils.escape, which would pull in urllib at import
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return text
+
+
+class StreamingXMLWriter:
+    """Incremental XML writer on top of xml.sax.saxutils.XMLGenerator.
+
+    Elements are written to the output stream as they are produced, so a
+    document can go straight to a file handle or socket without being built
+    in memory first. Nested elements are indented by `indent` per level.
+    """
+
+    def __init__(self, stream, indent='  ', level=0, encoding='utf-8'):
+        from xml.sax.saxutils import XMLGenerator
+
+        self.stream = stream
+        self.indent = indent
+        self.level = level
+        self._generator = XMLGenerator(stream, encoding, short_empty_elements=True)
+        self._open = []
+
+    def declaration(self):
+        self._generator.startDocument()
+
+    def _newline(self):
+        if self.indent is not None:
+            self._generator.ignorableWhitespace('\n' + self.indent * self.level)
+
+    def start(self, tag, attrs=None):
+        self._newline()
+        self._generator.startElement(tag, attrs or {})
+        self._open.append(tag)
+        self.level += 1
+
+    def end(self):
+        tag = self._open.pop()
+        self.level -= 1
+        self._newline()
+        self._generator.endElement(tag)
+
+    def element(self, tag, text='', attrs=None):
+        """Write a complete element with escaped text content"""
+        self._newline()
+        self._generator.startElement(tag, attrs or {})
+        if text != '':
+            self._generator.characters(str(text))
+        self._generator.endElement(tag)
+
+    def comment(self, text):
+        self._newline()
+        self._generator.ignorableWhitespace(f'<!-- {text} -->')
+
+    def close(self):
+        while self._open:
+            self.end()
+
+
+def check_well_formed(source):
+    """Return None if source is well-formed XML, otherwise the parse error.
+
+    source may be a string, bytes, or a binary file object. Uses expat
+    directly, which only checks syntax and builds no tree.
+    """
+    parser = expat.ParserCreate()
+    try:
+        if isinstance(source, (str, bytes)):
+            parser.Parse(source, True)
+        else:
+            parser.ParseFile(source)
+    except expat.ExpatError as e:
+        return f"line {e.lineno}, column {e.offset}: {expat.ErrorString(e.code)}"
+    return None